@@ -0,0 +1,351 @@
+"""Benchmarks the ROM build and save combine paths of rom_combiner.py.
+
+Compares the original read/concatenate approach with the copy_range path
+(reflink / copy_file_range / sendfile / buffered fallback). With --startup,
+measures cold-start time of the command line and the GUI instead.
+
+With --suite, runs the headless hot-path suite instead: builds, save splits and
+save combines on synthetic ROMs and saves of realistic sizes, recording
+throughput, peak RSS, read/write syscall counts and per-phase timings. --json
+stores the results, and --compare checks them against an earlier run (exiting
+with status 1 if a case got slower than --threshold percent). The suite never
+imports tkinter, so it runs on a headless Linux box.
+
+Usage: python benchmark.py [--runs N] [--dir DIR] [--startup]
+       python benchmark.py --suite [--runs N] [--dir DIR] [--fsync POLICY] [--json OUT] [--compare BASELINE]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import rom_combiner
+
+SUITE_VERSION = 1
+SUITE_GAME_SIZES = (rom_combiner.ROM_SIZE_1MB, rom_combiner.ROM_SIZE_2MB, rom_combiner.ROM_SIZE_1MB, rom_combiner.ROM_SIZE_2MB)
+SUITE_SAVE_SIZES = (rom_combiner.CHUNK_SIZE_BYTES, rom_combiner.CHUNK_SIZE_BYTES, 8 * 1024, rom_combiner.CHUNK_SIZE_BYTES)
+DEFAULT_THRESHOLD = 10.0
+
+
+def make_synthetic_file(path, size):
+    """Writes a file of random bytes."""
+    with open(path, "wb") as f_out:
+        f_out.write(os.urandom(size))
+    return path
+
+def make_synthetic_rom(path, size, title, cgb=True):
+    """Writes a ROM of random bytes with a valid header (title, ROM size code and both checksums)."""
+    rom = bytearray(os.urandom(size))
+    rom[rom_combiner.HEADER_TITLE:rom_combiner.HEADER_CGB_FLAG] = title.encode("ascii")[:15].ljust(15, b"\x00")
+    rom[rom_combiner.HEADER_CGB_FLAG] = 0x80 if cgb else 0x00
+    rom[rom_combiner.HEADER_CART_TYPE] = 0x1B  # MBC5+RAM+BATTERY
+    rom[rom_combiner.HEADER_ROM_SIZE] = (size // rom_combiner.ROM_SIZE_32KB).bit_length() - 1
+    rom[rom_combiner.HEADER_RAM_SIZE] = 0x03
+    rom_combiner.check_rom_checksums(rom, fix=True)
+    with open(path, "wb") as f_out:
+        f_out.write(rom)
+    return path
+
+def legacy_build_rom(menu_filepath, game_paths, slots, output_filepath):
+    """The original create_rom approach: read everything into an 8MB bytearray, then write it."""
+    final_rom_data = bytearray(rom_combiner.TOTAL_ROM_SIZE_8MB)
+    with open(menu_filepath, "rb") as menu_in:
+        menu_data = menu_in.read()
+        final_rom_data[:len(menu_data)] = menu_data
+    for i, game_filepath in enumerate(game_paths):
+        slot = slots[i]
+        with open(game_filepath, "rb") as game_in:
+            game_data = game_in.read()
+            final_rom_data[slot["start"]:slot["start"] + len(game_data)] = game_data
+    with open(output_filepath, "wb") as f_out:
+        f_out.write(final_rom_data)
+
+def legacy_combine_saves(save_paths, output_filepath):
+    """The original combine_files approach: read each save, pad with new bytes, write chunk by chunk."""
+    with open(output_filepath, "wb") as f_out:
+        for filepath in save_paths:
+            file_size = os.path.getsize(filepath)
+            with open(filepath, "rb") as f_in:
+                data = f_in.read()
+            if file_size < rom_combiner.CHUNK_SIZE_BYTES:
+                data += b'\x00' * (rom_combiner.CHUNK_SIZE_BYTES - file_size)
+            f_out.write(data)
+
+def time_it(func, runs):
+    """Runs func several times and returns the median time in seconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def report(name, seconds, size):
+    print(f"{name:<32} {seconds * 1000:9.2f} ms  {size / seconds / 1024 / 1024:9.1f} MB/s")
+
+def time_command(command, runs):
+    """Runs a command in a fresh interpreter several times. Returns the median wall time, or None if it failed."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=script_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return statistics.median(timings)
+
+def benchmark_startup(runs):
+    """Measures cold start of the command line and of the GUI up to its first drawn frame."""
+    python = sys.executable
+    cases = [
+        ("Interpreter only", [python, "-c", "pass"]),
+        ("CLI: rom_combiner.py --help", [python, "rom_combiner.py", "--help"]),
+        ("GUI: first frame drawn", [python, "-c", "import rom_combiner_gui; app = rom_combiner_gui.MultiFunctionTool(); app.update(); app.destroy()"]),
+    ]
+    print(f"Startup ({runs} runs each, median)")
+    for name, command in cases:
+        seconds = time_command(command, runs)
+        if seconds is None:
+            print(f"{name:<32} skipped (failed to run; the GUI needs tkinter and a display)")
+        else:
+            print(f"{name:<32} {seconds * 1000:9.2f} ms")
+
+    check = subprocess.run([python, "-c", "import sys, rom_combiner; print('tkinter' in sys.modules)"],
+                           cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    print(f"CLI imports tkinter: {check.stdout.strip() or 'unknown'}")
+
+def read_proc_io():
+    """Returns this process's I/O counters from /proc/self/io, or None where it is not available."""
+    try:
+        with open("/proc/self/io") as f_in:
+            return {key: int(value) for key, value in (line.split(":") for line in f_in)}
+    except OSError:
+        return None
+
+def read_rss_kb():
+    """Returns (current RSS, peak RSS) in KB from /proc/self/status, or (None, None) where it is not available."""
+    values = {}
+    try:
+        with open("/proc/self/status") as f_in:
+            for line in f_in:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":")
+                    values[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return values.get("VmRSS"), values.get("VmHWM")
+
+def reset_peak_rss():
+    """Resets the kernel's peak RSS counter so each case reports its own peak. Returns False if it cannot."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f_out:
+            f_out.write("5")
+        return True
+    except OSError:
+        return False
+
+class PhaseTimer:
+    """A progress callback that records how long each region of an operation took.
+
+    The core functions call progress(done, total) after each region they write, so the gaps
+    between calls are the per-phase timings; names needs one entry per call. Whatever runs
+    after the last call (fsync, rename, read-back) is recorded as "finish".
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.marks = []
+
+    def start(self):
+        self.marks = [time.perf_counter()]
+
+    def __call__(self, done, total):
+        self.marks.append(time.perf_counter())
+
+    def phases(self):
+        end = time.perf_counter()
+        gaps = [b - a for a, b in zip(self.marks, self.marks[1:])]
+        timings = dict(zip(self.names, gaps))
+        timings["finish"] = end - self.marks[-1]
+        return timings
+
+def run_case(name, func, phase_names, size, runs):
+    """Runs one suite case several times and returns its medians, peak RSS and syscall counts per run."""
+    timer = PhaseTimer(phase_names)
+    func(timer)  # Warm-up, so every timed run sees the same page cache state
+    rss_before, _ = read_rss_kb()
+    peak_reset = reset_peak_rss()
+    io_before = read_proc_io()
+    timings = []
+    phases = []
+    for _ in range(runs):
+        timer.start()
+        start = time.perf_counter()
+        func(timer)
+        timings.append(time.perf_counter() - start)
+        phases.append(timer.phases())
+    io_after = read_proc_io()
+    _, peak_rss = read_rss_kb()
+
+    seconds = statistics.median(timings)
+    result = {
+        "bytes": size,
+        "seconds": seconds,
+        "min_seconds": min(timings),
+        "mb_per_s": size / seconds / 1024 / 1024,
+        "rss_before_kb": rss_before,
+        "peak_rss_kb": peak_rss if peak_reset else None,
+        "syscalls": None,
+        "phases": {phase: statistics.median(run[phase] for run in phases) for phase in phases[0]},
+    }
+    if io_before and io_after:
+        delta = {key: (io_after[key] - io_before[key]) / runs for key in ("syscr", "syscw", "rchar", "wchar")}
+        result["syscalls"] = {"read": delta["syscr"], "write": delta["syscw"],
+                              "read_bytes": delta["rchar"], "write_bytes": delta["wchar"]}
+    return result
+
+def suite_cases(work_dir, fsync):
+    """Generates the synthetic inputs and returns the suite cases as (name, func, phase names, bytes)."""
+    profile = rom_combiner.DEFAULT_PROFILE
+    sync = rom_combiner.OutputSync(fsync)
+    menu = make_synthetic_rom(os.path.join(work_dir, "menu.gbc"), rom_combiner.ROM_SIZE_32KB, "MENU")
+    games = [make_synthetic_rom(os.path.join(work_dir, f"game{i+1}.gbc"), size, f"GAME{i+1}")
+             for i, size in enumerate(SUITE_GAME_SIZES)]
+    save = make_synthetic_file(os.path.join(work_dir, "full.sav"), profile.save_size)
+    banks = [make_synthetic_file(os.path.join(work_dir, f"bank{i+1}.sav"), size) for i, size in enumerate(SUITE_SAVE_SIZES)]
+    output = os.path.join(work_dir, "out.gbc")
+    split_paths = [os.path.join(work_dir, f"split{i+1}.sav") for i in range(profile.sram_bank_count)]
+    buffer = bytearray(profile.save_size)
+
+    slots_4 = profile.slots(4)
+    slots_3 = profile.slots(3)
+    games_3 = [games[1], games[3], games[1]]  # The 3-game layout only has 2MB slots
+    bank_names = [f"bank{i+1}" for i in range(profile.sram_bank_count)]
+    # write_rom_image reports each region, then once more after the tail fill and truncate
+    build_4_names = ["menu"] + [slot["name"] for slot in slots_4] + ["write tail"]
+    build_3_names = ["menu"] + [slot["name"] for slot in slots_3] + ["write tail"]
+
+    def build(rom_count, game_paths, verify=False, checksums=None):
+        return lambda progress: rom_combiner.build_rom(menu, game_paths, rom_count, output, progress=progress, profile=profile,
+                                                       checksums=checksums, verify=verify, sync=sync)
+
+    return [
+        ("build-4", build(4, games), build_4_names, profile.rom_size),
+        ("build-3", build(3, games_3), build_3_names, profile.rom_size),
+        ("build-4-checksums", build(4, games, checksums="verify"), build_4_names, profile.rom_size),
+        ("build-4-verify", build(4, games, verify=True), build_4_names, profile.rom_size),
+        ("split", lambda progress: rom_combiner.split_save(save, split_paths, 4, buffer, progress=progress, profile=profile, sync=sync),
+         bank_names, profile.save_size),
+        ("combine", lambda progress: rom_combiner.combine_saves(banks, output, 4, progress=progress, profile=profile, sync=sync),
+         bank_names, profile.save_size),
+    ]
+
+def compare_results(results, baseline, threshold):
+    """Prints the change in throughput of every case against a baseline run. Returns the names of the cases that regressed."""
+    regressed = []
+    print(f"Compared with {baseline.get('created', 'baseline')} (threshold {threshold:g}%)")
+    for name, case in results["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if old is None:
+            print(f"{name:<32} new case")
+            continue
+        change = (case["mb_per_s"] / old["mb_per_s"] - 1) * 100
+        flag = ""
+        if change < -threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {old['mb_per_s']:9.1f} -> {case['mb_per_s']:9.1f} MB/s  {change:+6.1f}%{flag}")
+    return regressed
+
+def benchmark_suite(runs, directory, fsync, json_path=None, compare_path=None, threshold=DEFAULT_THRESHOLD):
+    """Runs the hot-path suite and prints, stores and compares its results. Returns the process exit code."""
+    baseline = None
+    if compare_path:
+        with open(compare_path, "r", encoding="utf-8") as f_in:
+            baseline = json.load(f_in)
+
+    work_dir = tempfile.mkdtemp(prefix="rom_combiner_bench_", dir=directory)
+    try:
+        results = {
+            "version": SUITE_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": rom_combiner._load_numpy() is not None,
+            "dir": work_dir,
+            "runs": runs,
+            "fsync": fsync,
+            "cases": {},
+        }
+        print(f"Suite in {work_dir} ({runs} runs each, median, fsync {fsync})")
+        for name, func, phase_names, size in suite_cases(work_dir, fsync):
+            case = run_case(name, func, phase_names, size, runs)
+            results["cases"][name] = case
+            report(name, case["seconds"], size)
+            details = []
+            if case["peak_rss_kb"] is not None:
+                details.append(f"peak RSS {case['peak_rss_kb'] / 1024:.1f}MB (+{(case['peak_rss_kb'] - case['rss_before_kb']) / 1024:.1f}MB)")
+            if case["syscalls"] is not None:
+                details.append(f"{case['syscalls']['read']:.0f} read / {case['syscalls']['write']:.0f} write syscalls per run")
+            if details:
+                print(f"{'':<32} {', '.join(details)}")
+            print(f"{'':<32} " + ", ".join(f"{phase} {seconds * 1000:.2f}ms" for phase, seconds in case["phases"].items()))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f_out:
+            json.dump(results, f_out, indent=2)
+        print(f"Results written to {json_path}")
+    if baseline is not None:
+        return 1 if compare_results(results, baseline, threshold) else 0
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ROM combine and save combine paths.")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per case (the median is reported).")
+    parser.add_argument("--dir", default=None, help="Folder to benchmark in (default: a temp folder). Use it to test a specific filesystem.")
+    parser.add_argument("--startup", action="store_true", help="Measure cold-start time of the CLI and GUI instead.")
+    parser.add_argument("--suite", action="store_true", help="Run the headless hot-path suite (throughput, peak RSS, syscalls, phases) instead.")
+    parser.add_argument("--fsync", choices=rom_combiner.FSYNC_POLICIES, default="none", help="fsync policy for suite outputs (default: none, to time the copy paths rather than the disk).")
+    parser.add_argument("--json", default=None, help="Write the suite results to this JSON file.")
+    parser.add_argument("--compare", default=None, help="Compare the suite results with an earlier --json file; exits with status 1 on a regression.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help=f"Throughput drop in percent that counts as a regression (default: {DEFAULT_THRESHOLD:g}).")
+    args = parser.parse_args()
+
+    if args.startup:
+        benchmark_startup(args.runs)
+        return
+    if args.suite:
+        return benchmark_suite(args.runs, args.dir, args.fsync, args.json, args.compare, args.threshold)
+
+    work_dir = tempfile.mkdtemp(prefix="rom_combiner_bench_", dir=args.dir)
+    try:
+        menu = make_synthetic_file(os.path.join(work_dir, "menu.gbc"), rom_combiner.ROM_SIZE_32KB)
+        games = [make_synthetic_file(os.path.join(work_dir, f"game{i+1}.gbc"), slot["max_size"])
+                 for i, slot in enumerate(rom_combiner.GAME_SLOTS_4)]
+        saves = [make_synthetic_file(os.path.join(work_dir, f"save{i+1}.sav"), rom_combiner.CHUNK_SIZE_BYTES - (i * 1024))
+                 for i in range(4)]
+        output = os.path.join(work_dir, "out.bin")
+        rom_size = rom_combiner.TOTAL_ROM_SIZE_8MB
+        save_size = 4 * rom_combiner.CHUNK_SIZE_BYTES
+
+        print(f"Benchmarking in {work_dir} ({args.runs} runs each, median)")
+        report("ROM build: read/concatenate", time_it(lambda: legacy_build_rom(menu, games, rom_combiner.GAME_SLOTS_4, output), args.runs), rom_size)
+        no_sync = rom_combiner.OutputSync("none")  # The read/concatenate versions do not fsync either
+        report("ROM build: copy_range", time_it(lambda: rom_combiner.write_rom_image(menu, games, rom_combiner.GAME_SLOTS_4, output, sync=no_sync), args.runs), rom_size)
+        report("Save combine: read/concatenate", time_it(lambda: legacy_combine_saves(saves, output), args.runs), save_size)
+        report("Save combine: copy_range", time_it(lambda: rom_combiner.combine_saves(saves, output, 4, sync=no_sync), args.runs), save_size)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Regenerates rom_combiner_menus.py from the menu ROMs in the 'menus' folder.
+
+The built-in menus are embedded as zlib-compressed, base85-encoded strings so the
+executable does not need to unpack or look for them on disk. Run this after
+changing any file in 'menus':
+
+    python embed_menus.py
+"""
+import base64
+import os
+import zlib
+
+import rom_combiner
+
+LINE_LENGTH = 76
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    lines = [
+        '"""Built-in menu ROMs, generated by embed_menus.py from the \'menus\' folder. Do not edit."""',
+        "",
+        "MENUS = {",
+    ]
+    for menu_filename in sorted(set(rom_combiner.MENU_FILES.values())):
+        with open(os.path.join(script_dir, "menus", menu_filename), "rb") as f_in:
+            encoded = base64.b85encode(zlib.compress(f_in.read(), 9)).decode("ascii")
+        lines.append(f"    {menu_filename!r}: (")
+        for start in range(0, len(encoded), LINE_LENGTH):
+            lines.append(f"        {encoded[start:start + LINE_LENGTH]!r}")
+        lines.append("    ),")
+    lines.append("}")
+
+    output_filepath = os.path.join(script_dir, "rom_combiner_menus.py")
+    with open(output_filepath, "w", encoding="utf-8", newline="\n") as f_out:
+        f_out.write("\n".join(lines) + "\n")
+    print(f"Wrote {output_filepath}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,24 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+import argparse
+import base64
+import glob
+import hashlib
+import json
+import mmap
 import os
+import queue
+import struct
 import sys
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 # --- Game ROM Combiner Constants ---
 ROM_SIZE_32KB = 32 * 1024
@@ -31,500 +48,2797 @@ MENU_FILES = {
     ("Gameboy Colour", 4): "Daz 4in1.gbc",
 }
 
+ROM_EXTENSIONS = (".gb", ".gbc")
+
+# --- Cartridge Header Constants ---
+HEADER_START = 0x100
+HEADER_END = 0x150
+HEADER_TITLE = 0x134
+HEADER_CGB_FLAG = 0x143
+HEADER_CART_TYPE = 0x147
+HEADER_ROM_SIZE = 0x148
+HEADER_RAM_SIZE = 0x149
+HEADER_CHECKSUM = 0x14D
+HEADER_GLOBAL_CHECKSUM = 0x14E
+CGB_ONLY = 0xC0
+ROM_INDEX_VERSION = 1
+CHECKSUM_MODES = ("verify", "fix")
+ADLER_SUM_BLOCK = 256  # Largest block whose byte sum always fits below the Adler-32 modulus
+
 # --- Save Splitter/Combiner Constants ---
 CHUNK_SIZE_KB = 32
 CHUNK_SIZE_BYTES = CHUNK_SIZE_KB * 1024
+SAVE_FILE_SIZE = 4 * CHUNK_SIZE_BYTES
+DEFAULT_SPLIT_TEMPLATE = "{dir}/split/{stem}_save{n}.sav"  # A subfolder, so scanning the input folder again skips the banks
 
-class MultiFunctionTool(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Game Boy Multi-Function Tool")
-        
-        # --- Rom Combiner Variables ---
-        self.rom_combiner_menu_file_path = None
-        self.rom_combiner_game_file_paths = []
-        self.rom_combiner_rom_mode = tk.StringVar(value="4")
-        self.rom_combiner_device_mode = tk.StringVar(value="Gameboy Colour")
-        self.rom_combiner_menu_mode = tk.StringVar(value="Automatic")
-        
-        # --- Save Splitter/Combiner Variables ---
-        self.savesplit_file_paths = []
-        self.savesplit_name_entries = []
-        self.savesplit_mode = tk.StringVar(value="4") # "4" or "3"
-
-        self.setup_ui()
-
-    def setup_ui(self):
-        self.notebook = ttk.Notebook(self)
-        self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
-
-        # Create frames for each tab
-        rom_combiner_frame = tk.Frame(self.notebook)
-        save_splitter_frame = tk.Frame(self.notebook)
-
-        self.notebook.add(rom_combiner_frame, text="ROM Combiner")
-        self.notebook.add(save_splitter_frame, text="Save Splitter/Combiner")
-
-        self.setup_rom_combiner_ui(rom_combiner_frame)
-        self.setup_save_splitter_ui(save_splitter_frame)
-        
-    # -------------------------------------------------------------------------
-    #                            ROM COMBINER GUI
-    # -------------------------------------------------------------------------
-
-    def setup_rom_combiner_ui(self, parent_frame):
-        frame = tk.Frame(parent_frame, padx=20, pady=20)
-        frame.pack()
-
-        # Rom Type Section
-        tk.Label(frame, text="1. Select ROM Type", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
-        rom_mode_frame = tk.Frame(frame)
-        rom_mode_frame.pack()
-        tk.Radiobutton(rom_mode_frame, text="4-Game ROM", variable=self.rom_combiner_rom_mode, value="4", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
-        tk.Radiobutton(rom_mode_frame, text="3-Game ROM", variable=self.rom_combiner_rom_mode, value="3", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
-        
-        # Device Type Section
-        tk.Label(frame, text="-"*60).pack(pady=10)
-        tk.Label(frame, text="2. Select Device Type", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
-        device_mode_frame = tk.Frame(frame)
-        device_mode_frame.pack()
-        tk.Radiobutton(device_mode_frame, text="Gameboy", variable=self.rom_combiner_device_mode, value="Gameboy", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
-        tk.Radiobutton(device_mode_frame, text="Gameboy Colour", variable=self.rom_combiner_device_mode, value="Gameboy Colour", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
-
-        # Menu File Section
-        tk.Label(frame, text="-"*60).pack(pady=10)
-        tk.Label(frame, text="3. Select Menu File", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
-        menu_mode_frame = tk.Frame(frame)
-        menu_mode_frame.pack()
-        tk.Radiobutton(menu_mode_frame, text="Automatic", variable=self.rom_combiner_menu_mode, value="Automatic", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
-        tk.Radiobutton(menu_mode_frame, text="Custom", variable=self.rom_combiner_menu_mode, value="Custom", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
-
-        self.rom_combiner_menu_path_label = tk.Label(frame, text="No menu file selected.", bg="white", width=50, anchor="w")
-        self.rom_combiner_menu_path_label.pack(pady=5)
-        self.rom_combiner_select_menu_button = tk.Button(frame, text="Select Custom Menu File", command=self.select_custom_menu_file, width=40, state="disabled")
-        self.rom_combiner_select_menu_button.pack(pady=5)
-        
-        # Game Files Section
-        tk.Label(frame, text="-"*60).pack(pady=10)
-        tk.Label(frame, text="4. Manage Game ROMs", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
-        
-        button_frame = tk.Frame(frame)
-        button_frame.pack(pady=5)
-        add_game_button = tk.Button(button_frame, text="Add Game", command=self.add_game_file)
-        add_game_button.pack(side=tk.LEFT, padx=5)
-        remove_game_button = tk.Button(button_frame, text="Remove Selected", command=self.remove_game_file)
-        remove_game_button.pack(side=tk.LEFT, padx=5)
-        
-        tk.Label(frame, text="Selected Games (in order of combination):").pack(pady=(5, 0))
-        self.rom_combiner_listbox = tk.Listbox(frame, selectmode=tk.SINGLE, width=60, height=4)
-        self.rom_combiner_listbox.pack(pady=5)
-
-        order_frame = tk.Frame(frame)
-        order_frame.pack(pady=5)
-        move_up_button = tk.Button(order_frame, text="Move Up", command=self.move_up)
-        move_up_button.pack(side=tk.LEFT, padx=5)
-        move_down_button = tk.Button(order_frame, text="Move Down", command=self.move_down)
-        move_down_button.pack(side=tk.LEFT, padx=5)
-
-        # Create ROM Button
-        tk.Label(frame, text="-"*60).pack(pady=10)
-        create_rom_button = tk.Button(frame, text="Create Multi-Game ROM", command=self.create_rom, width=40, height=2)
-        create_rom_button.pack(pady=10)
-        self.rom_combiner_update_ui()
-
-    def rom_combiner_update_ui(self):
-        """Updates the ROM Combiner UI based on radio button selections."""
-        self.rom_combiner_update_listbox()
-        if self.rom_combiner_menu_mode.get() == "Custom":
-            self.rom_combiner_select_menu_button.config(state="normal")
-            self.rom_combiner_menu_path_label.config(text=os.path.basename(self.rom_combiner_menu_file_path) if self.rom_combiner_menu_file_path else "No custom menu file selected.")
+# --- Save Archive Constants ---
+SAVE_BLOCK_SIZE = 4096
+FULL_MANIFEST_INTERVAL = 32  # Every Nth backup of a save records all its blocks, capping delta chains
+
+# --- File I/O Constants ---
+COPY_BUFFER_SIZE = 256 * 1024
+FICLONE = 0x40049409  # Linux ioctls for sharing file blocks (reflink) on btrfs/XFS
+FICLONERANGE = 0x4020940D
+REFLINK_ALIGNMENT = 4096
+
+# --- Output Constants ---
+FSYNC_POLICIES = ("file", "batch", "none")
+FSYNC_JOBS = 8  # Threads issuing the fsyncs of a batch together
+
+# --- Verification Constants ---
+VERIFY_MANIFEST_SUFFIX = ".manifest.json"
+VERIFY_MANIFEST_VERSION = 1
+
+# --- Extract Constants ---
+DEFAULT_EXTRACT_TEMPLATE = "{dir}/{stem}/{slot}_{name}{ext}"
+
+# --- Watch Constants ---
+WATCH_DEBOUNCE = 0.5  # Seconds without new events before a burst of changes is acted on
+WATCH_POLL_INTERVAL = 1.0
+WATCH_STATE_SUFFIX = ".watch-state.json"
+WATCH_STATE_VERSION = 1
+IN_ATTRIB = 0x004  # Linux inotify event masks
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+# --- Build Cache Constants ---
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024
+
+# --- Cart Profile Constants ---
+DEFAULT_PROFILE_NAME = "chisflash-epm240-8mb"
+SIZE_UNITS = {"KB": 1024, "MB": 1024 * 1024}
+
+# --- Metrics Constants ---
+METRICS_FORMATS = ("jsonl", "prometheus")
+METRICS_PREFIX = "rom_combiner"
+METRICS_FLUSH_INTERVAL = 10.0  # Seconds between sink flushes while events keep arriving
+
+# -----------------------------------------------------------------------------
+#                               CART PROFILES
+# -----------------------------------------------------------------------------
+
+def parse_size(value, field="size", allow_zero=False):
+    """Returns a byte count from an int or a string like "32KB", "2MB" or "0x8000". Raises ValueError if it is not a positive size."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        size = value
+    elif isinstance(value, str):
+        text = value.strip().upper()
+        unit = next((unit for unit in SIZE_UNITS if text.endswith(unit)), None)
+        try:
+            size = int(float(text[:-len(unit)]) * SIZE_UNITS[unit]) if unit else int(text, 0)
+        except ValueError:
+            raise ValueError(f"Invalid {field}: {value!r}. Expected a byte count or a size like '32KB' or '2MB'.")
+    else:
+        raise ValueError(f"Invalid {field}: {value!r}. Expected a byte count or a size like '32KB' or '2MB'.")
+    if size < 0 or (size == 0 and not allow_zero):
+        raise ValueError(f"Invalid {field}: {value!r}. It must be larger than zero.")
+    return size
+
+def format_size(size):
+    """Returns a size as MB or KB when it divides evenly, otherwise in bytes."""
+    if size % SIZE_UNITS["MB"] == 0:
+        return f"{size // SIZE_UNITS['MB']}MB"
+    if size % SIZE_UNITS["KB"] == 0:
+        return f"{size // SIZE_UNITS['KB']}KB"
+    return f"{size} bytes"
+
+class CartProfile:
+    """Read-only memory map of one flashcart variant (ROM size, menu region, slot layouts, SRAM banks, fill byte), validated and precomputed once."""
+
+    def __init__(self, name, rom_size, menu_size, layouts, menu_files, sram_bank_size, sram_bank_count, fill_byte=0x00):
+        self.name = name
+        self.rom_size = rom_size
+        self.menu_size = menu_size
+        self.fill_byte = fill_byte
+        self.layouts = {rom_count: list(slots) for rom_count, slots in layouts.items()}
+        self.menu_files = dict(menu_files)
+        self.sram_bank_size = sram_bank_size
+        self.sram_bank_count = sram_bank_count
+        self.validate()
+
+        # --- Precomputed layout math ---
+        self.rom_counts = sorted(self.layouts, reverse=True)
+        self.devices = sorted({device for device, _ in self.menu_files})
+        self.slot_order = {rom_count: sorted(range(len(slots)), key=lambda i, slots=slots: slots[i]["max_size"], reverse=True)
+                           for rom_count, slots in self.layouts.items()}
+        self.largest_slot = max(slot["max_size"] for slots in self.layouts.values() for slot in slots)
+        self.save_size = sram_bank_size * sram_bank_count
+        self.save_counts = [count for count in self.rom_counts if count <= sram_bank_count] or [sram_bank_count]
+        self.bank_offsets = [bank * sram_bank_size for bank in range(sram_bank_count)]
+
+    def validate(self):
+        """Checks the memory map is consistent. Raises ValueError describing the first problem found."""
+        def fail(message):
+            raise ValueError(f"Profile {self.name}: {message}")
+
+        if self.menu_size > self.rom_size:
+            fail(f"the {format_size(self.menu_size)} menu region is larger than the {format_size(self.rom_size)} ROM.")
+        if not 0 <= self.fill_byte <= 0xFF:
+            fail(f"fill byte {self.fill_byte} is not a byte value (0-255).")
+        if not self.layouts:
+            fail("it has no game slot layouts.")
+        for rom_count, slots in self.layouts.items():
+            if len(slots) != rom_count:
+                fail(f"the {rom_count}-game layout has {len(slots)} slots.")
+            end = self.menu_size
+            for slot in sorted(slots, key=lambda slot: slot["start"]):
+                if slot["start"] < end:
+                    fail(f"{slot['name']} at 0x{slot['start']:X} overlaps the menu region or another slot.")
+                end = slot["start"] + slot["max_size"]
+                if end > self.rom_size:
+                    fail(f"{slot['name']} ends at 0x{end:X}, past the end of the {format_size(self.rom_size)} ROM.")
+        for device, rom_count in self.menu_files:
+            if rom_count not in self.layouts:
+                fail(f"it has a {device} menu for a {rom_count}-game layout it does not define.")
+        if self.sram_bank_size <= 0 or self.sram_bank_count <= 0:
+            fail("SRAM bank size and count must be larger than zero.")
+
+    def slots(self, rom_count):
+        """Returns the slot layout for a ROM type of this profile."""
+        try:
+            return self.layouts[rom_count]
+        except KeyError:
+            counts = " or ".join(str(count) for count in sorted(self.layouts))
+            raise ValueError(f"Unsupported ROM type: {rom_count}. Expected a {counts} game ROM.") from None
+
+    def first_bank(self, save_count):
+        """Returns the first SRAM bank used when splitting or combining save_count saves: unused banks are at the start."""
+        if not 1 <= save_count <= self.sram_bank_count:
+            raise ValueError(f"Unsupported save mode: {save_count}. Expected 1 to {self.sram_bank_count} saves.")
+        return self.sram_bank_count - save_count
+
+    @classmethod
+    def from_dict(cls, data, name=None):
+        """Creates a profile from its JSON form (see profiles/example-16mb-256kb.json)."""
+        name = data.get("name", name or "custom")
+        try:
+            fill_byte = data.get("fill_byte", 0x00)
+            fill_byte = int(fill_byte, 0) if isinstance(fill_byte, str) else int(fill_byte)
+            sram = data.get("sram", {})
+            layouts = {}
+            menu_files = {}
+            for rom_count, layout in data["layouts"].items():
+                rom_count = int(rom_count)
+                slots = []
+                for n, slot in enumerate(layout["slots"], start=1):
+                    max_size = parse_size(slot["max_size"], f"max_size of slot {n}")
+                    slots.append({
+                        "start": parse_size(slot["start"], f"start of slot {n}", allow_zero=True),
+                        "max_size": max_size,
+                        "name": slot.get("name", f"Game Slot {n} ({format_size(max_size)})"),
+                    })
+                layouts[rom_count] = slots
+                for device, menu_filename in layout.get("menus", {}).items():
+                    menu_files[(device, rom_count)] = menu_filename
+            rom_size = parse_size(data["rom_size"], "rom_size")
+            menu_size = parse_size(data.get("menu_size", ROM_SIZE_32KB), "menu_size")
+            sram_bank_size = parse_size(sram.get("bank_size", CHUNK_SIZE_BYTES), "SRAM bank_size")
+            sram_bank_count = int(sram.get("bank_count", 4))
+        except KeyError as e:
+            raise ValueError(f"Profile {name}: missing required field {e}.") from None
+        except ValueError as e:
+            raise ValueError(f"Profile {name}: {e}") from None
+        except (TypeError, AttributeError):
+            raise ValueError(f"Profile {name}: unexpected value types. See the example in the 'profiles' folder.") from None
+        return cls(name, rom_size, menu_size, layouts, menu_files, sram_bank_size, sram_bank_count, fill_byte)
+
+DEFAULT_PROFILE = CartProfile(DEFAULT_PROFILE_NAME, TOTAL_ROM_SIZE_8MB, ROM_SIZE_32KB, {4: GAME_SLOTS_4, 3: GAME_SLOTS_3},
+                              MENU_FILES, CHUNK_SIZE_BYTES, 4)
+
+def get_profiles_dir():
+    """Returns the 'profiles' folder that sits next to this script."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, 'profiles')
+
+_loaded_profiles = {}
+
+def load_profile(name_or_path):
+    """Returns a cart profile given a JSON file path or a name from the 'profiles' folder (None or "" for the default), loading each file once."""
+    if name_or_path in (None, "", DEFAULT_PROFILE_NAME):
+        return DEFAULT_PROFILE
+    if os.path.isfile(name_or_path):
+        profile_path = os.path.abspath(name_or_path)
+    else:
+        profile_path = os.path.join(get_profiles_dir(), name_or_path + ".json")
+        if not os.path.isfile(profile_path):
+            raise FileNotFoundError(f"Could not find the cart profile: {name_or_path}.")
+
+    if profile_path not in _loaded_profiles:
+        with open(profile_path, "r", encoding="utf-8") as f_in:
+            data = json.load(f_in)
+        stem = os.path.splitext(os.path.basename(profile_path))[0]
+        _loaded_profiles[profile_path] = CartProfile.from_dict(data, name=stem)
+    return _loaded_profiles[profile_path]
+
+def list_profiles():
+    """Returns the names of the built-in default and of every profile in the 'profiles' folder."""
+    names = {DEFAULT_PROFILE_NAME}
+    names.update(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(get_profiles_dir(), "*.json")))
+    return sorted(names)
+
+_active_profile = DEFAULT_PROFILE
+
+def get_active_profile():
+    """Returns the profile used when a function is not given one."""
+    return _active_profile
+
+def set_active_profile(profile):
+    """Makes profile (a CartProfile, name or path) the one used when a function is not given one. Returns it."""
+    global _active_profile
+    _active_profile = profile if isinstance(profile, CartProfile) else load_profile(profile)
+    return _active_profile
+
+def _profile(profile):
+    return profile if profile is not None else _active_profile
+
+# -----------------------------------------------------------------------------
+#                                  METRICS
+# -----------------------------------------------------------------------------
+
+class _MetricSpan:
+    """Times a with block and records it as a span event, noting the exception type if the block raised."""
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event = {"type": "span", "name": self.name, "seconds": time.perf_counter() - self.start, "labels": self.labels,
+                 "time": time.time(), "pid": os.getpid()}
+        if exc_type is not None:
+            event["error"] = exc_type.__name__
+        self.metrics.record(event)
+        return False
+
+class Metrics:
+    """Collects timing spans and counters, sending them to a sink (flushed every flush_interval seconds) or keeping them until drain()."""
+
+    def __init__(self, sink=None, flush_interval=None):
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.events = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def span(self, name, **labels):
+        return _MetricSpan(self, name, labels)
+
+    def count(self, name, value=1, **labels):
+        self.record({"type": "counter", "name": name, "value": value, "labels": labels, "time": time.time(), "pid": os.getpid()})
+
+    def record(self, event):
+        with self._lock:
+            if self.sink is None:
+                self.events.append(event)
+                return
+            self.sink.write(event)
+            if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.sink.flush()
+                self._last_flush = time.monotonic()
+
+    def record_events(self, events):
+        for event in events:
+            self.record(event)
+
+    def drain(self):
+        """Returns and forgets the events kept in memory."""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def flush(self):
+        if self.sink is not None:
+            with self._lock:
+                self.sink.flush()
+                self._last_flush = time.monotonic()
+
+    def close(self):
+        if self.sink is not None:
+            with self._lock:
+                self.sink.close()
+
+class JsonLinesSink:
+    """Appends every event to a file as one JSON object per line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, event):
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+class PrometheusSink:
+    """Aggregates events into <prefix>_<name>_seconds summaries and <prefix>_<name>_total counters in an atomically rewritten Prometheus text file."""
+
+    def __init__(self, path, prefix=METRICS_PREFIX):
+        self.path = path
+        self.prefix = prefix
+        self.spans = {}
+        self.counters = {}
+
+    def _metric_name(self, name):
+        return self.prefix + "_" + "".join(c if c.isalnum() else "_" for c in name)
+
+    def write(self, event):
+        key = (event["name"], tuple(sorted(event["labels"].items())))
+        if event["type"] == "span":
+            total = self.spans.setdefault(key, [0.0, 0])
+            total[0] += event["seconds"]
+            total[1] += 1
         else:
-            self.rom_combiner_select_menu_button.config(state="disabled")
-            rom_count = int(self.rom_combiner_rom_mode.get())
-            device = self.rom_combiner_device_mode.get()
-            menu_filename = MENU_FILES.get((device, rom_count))
-            self.rom_combiner_menu_path_label.config(text=f"Automatic: {menu_filename}")
-
-    def select_custom_menu_file(self):
-        """Selects a custom menu ROM file."""
-        filepath = filedialog.askopenfilename(
-            title="Select Custom Menu ROM File (max 32KB)",
-            filetypes=[("ROM Files", "*.gb *.gbc *.gba"), ("All Files", "*.*")]
-        )
-        if not filepath:
-            return
+            self.counters[key] = self.counters.get(key, 0) + event["value"]
 
-        file_size = os.path.getsize(filepath)
-        if file_size > ROM_SIZE_32KB:
-            messagebox.showerror("Error", f"The menu file is {file_size/1024:.2f}KB, which is larger than the 32KB limit.")
-            self.rom_combiner_menu_file_path = None
-            self.rom_combiner_menu_path_label.config(text="No custom menu file selected.")
-            return
-        
-        self.rom_combiner_menu_file_path = filepath
-        self.rom_combiner_menu_path_label.config(text=os.path.basename(filepath))
-
-    def add_game_file(self):
-        """Adds a single game file to the list."""
-        max_games = 4 if self.rom_combiner_rom_mode.get() == "4" else 3
-        if len(self.rom_combiner_game_file_paths) >= max_games:
-            messagebox.showwarning("Warning", f"You can only add a maximum of {max_games} game files for the selected ROM type.")
-            return
+    def flush(self):
+        lines = []
+        seen = set()
+        for (name, labels), (seconds, count) in sorted(self.spans.items()):
+            metric = self._metric_name(name) + "_seconds"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            label_text = _prometheus_labels(dict(labels))
+            lines.append(f"{metric}_sum{label_text} {seconds:.9f}")
+            lines.append(f"{metric}_count{label_text} {count}")
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = self._metric_name(name) + "_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_prometheus_labels(dict(labels))} {value}")
+        with atomic_output(self.path, sync=OutputSync("none")) as f_out:
+            _write_all(f_out, memoryview(("\n".join(lines) + "\n").encode("utf-8")))
+
+    def close(self):
+        self.flush()
+
+def open_metrics_sink(path, metrics_format=None):
+    """Opens a metrics sink for path. The format defaults to Prometheus for .prom files and JSON lines otherwise."""
+    if metrics_format is None:
+        metrics_format = "prometheus" if path.endswith(".prom") else "jsonl"
+    if metrics_format not in METRICS_FORMATS:
+        raise ValueError(f"Unknown metrics format: {metrics_format}. Expected 'jsonl' or 'prometheus'.")
+    return PrometheusSink(path) if metrics_format == "prometheus" else JsonLinesSink(path)
+
+_metrics = None
+_NO_SPAN = nullcontext()
+
+def get_metrics():
+    """Returns the installed Metrics, or None when instrumentation is off."""
+    return _metrics
+
+def set_metrics(metrics):
+    """Installs a Metrics (or None to turn instrumentation off). Returns the previously installed one."""
+    global _metrics
+    previous, _metrics = _metrics, metrics
+    return previous
+
+def metric_span(name, **labels):
+    """Returns a context manager timing a span, or a shared no-op one when instrumentation is off."""
+    return _metrics.span(name, **labels) if _metrics is not None else _NO_SPAN
 
-        filepath = filedialog.askopenfilename(
-            title="Select a Game File",
-            filetypes=[("ROM Files", "*.gb *.gbc *.gba"), ("All Files", "*.*")]
+def metric_count(name, value=1, **labels):
+    if _metrics is not None:
+        _metrics.count(name, value, **labels)
+
+# -----------------------------------------------------------------------------
+#                          HEADLESS ROM BUILD CORE
+# -----------------------------------------------------------------------------
+
+class OperationCancelled(Exception):
+    """Raised by a progress callback to stop a build, split or combine. Partly written outputs are removed."""
+
+class VerificationError(Exception):
+    """Raised when an output read back from disk does not match the data that was written."""
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def get_game_slots(rom_count, profile=None):
+    """Returns the slot layout for a ROM type (3 or 4 games on the default profile)."""
+    return _profile(profile).slots(rom_count)
+
+def get_menus_dir():
+    """Returns the 'menus' folder that sits next to this script."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, 'menus')
+
+_builtin_menus = {}
+
+def load_builtin_menu(menu_filename):
+    """Returns the bytes of a built-in menu, decoded from rom_combiner_menus on first use, or None if it is not embedded."""
+    if menu_filename not in _builtin_menus:
+        try:
+            import rom_combiner_menus
+        except ImportError:
+            return None
+        encoded = rom_combiner_menus.MENUS.get(menu_filename)
+        _builtin_menus[menu_filename] = zlib.decompress(base64.b85decode(encoded)) if encoded else None
+    return _builtin_menus[menu_filename]
+
+def resolve_menu(device, rom_count, custom_menu_path=None, profile=None):
+    """Returns the menu to use: the custom file's path if given, otherwise the embedded automatic menu for the device/ROM type as bytes."""
+    if custom_menu_path:
+        return custom_menu_path
+
+    profile = _profile(profile)
+    menu_filename = profile.menu_files.get((device, rom_count))
+    if menu_filename is None:
+        raise ValueError(f"There is no automatic menu file for a {rom_count}-game {device} ROM on the {profile.name} profile.")
+
+    menu_data = load_builtin_menu(menu_filename)
+    if menu_data is not None:
+        return menu_data
+
+    menu_filepath = os.path.join(get_menus_dir(), menu_filename)
+    if not os.path.exists(menu_filepath):
+        raise FileNotFoundError(
+            f"Could not find the automatic menu file: {menu_filename}.\n\n"
+            "Please create a folder named 'menus' in the same directory as this script "
+            "and place the file inside. Alternatively, select a custom menu file."
         )
-        if filepath:
-            self.rom_combiner_game_file_paths.append(filepath)
-            self.rom_combiner_update_listbox()
-            
-    def remove_game_file(self):
-        """Removes the selected game file from the list."""
+    return menu_filepath
+
+def _is_menu_data(menu):
+    return isinstance(menu, (bytes, bytearray))
+
+def read_menu(menu):
+    """Returns the bytes of a menu given as a path or as bytes."""
+    if _is_menu_data(menu):
+        return bytes(menu)
+    with open(menu, "rb") as menu_in:
+        return menu_in.read()
+
+def validate_rom_build(menu, game_paths, rom_count, profile=None):
+    """Checks the menu (a path or bytes) and games fit the selected layout. Raises ValueError describing the first problem found."""
+    profile = _profile(profile)
+    current_slots = profile.slots(rom_count)
+
+    try:
+        menu_size = len(menu) if _is_menu_data(menu) else os.path.getsize(menu)
+    except OSError:
+        raise ValueError(f"Could not access menu file: {os.path.basename(menu)}.")
+    if menu_size > profile.menu_size:
+        raise ValueError(f"The menu file is {menu_size/1024:.2f}KB, which is larger than the {format_size(profile.menu_size)} limit.")
+
+    if len(game_paths) > len(current_slots):
+        raise ValueError(f"You have too many games selected for the {len(current_slots)}-game ROM configuration.")
+
+    # Check if any game file is too large for its slot (None leaves a slot empty)
+    for i, game_filepath in enumerate(game_paths):
+        if game_filepath is None:
+            continue
+        slot = current_slots[i]
         try:
-            selected_index = self.rom_combiner_listbox.curselection()[0]
-            del self.rom_combiner_game_file_paths[selected_index]
-            self.rom_combiner_update_listbox()
-        except IndexError:
-            messagebox.showwarning("Warning", "Please select a game to remove.")
-
-    def move_up(self):
-        """Moves the selected file up in the listbox."""
+            file_size = os.path.getsize(game_filepath)
+        except OSError:
+            raise ValueError(f"Could not access game file: {os.path.basename(game_filepath)}. Please ensure the file exists and is accessible.")
+        if file_size > slot["max_size"]:
+            raise ValueError(f"{os.path.basename(game_filepath)} ({file_size/1024/1024:.2f}MB) is larger than the {slot['max_size']/1024/1024}MB limit for {slot['name']}. No file will be created.")
+
+    return current_slots
+
+def _write_all(f_out, view):
+    """Writes a whole memoryview to an unbuffered file, retrying short writes."""
+    while view:
+        written = f_out.write(view)
+        view = view[written:]
+
+def _reflink_range(src_fd, dst_fd, src_offset, length, dst_offset):
+    """Tries to share the source blocks with the destination instead of copying them. Returns True on success."""
+    if fcntl is None or (src_offset | length | dst_offset) % REFLINK_ALIGNMENT:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONERANGE, struct.pack("qQQQ", src_fd, src_offset, length, dst_offset))
+        return True
+    except OSError:
+        return False
+
+def copy_range(f_in, f_out, dst_offset, length=None, src_offset=0, buffer=None, digest=None):
+    """Copies length bytes (default: to the end of f_in) from src_offset to dst_offset with the fastest kernel path available. Returns the bytes copied."""
+    src_fd = f_in.fileno()
+    dst_fd = f_out.fileno()
+    if length is None:
+        length = max(0, os.fstat(src_fd).st_size - src_offset)
+    if length == 0:
+        return 0
+
+    if digest is None and _reflink_range(src_fd, dst_fd, src_offset, length, dst_offset):
+        return length
+
+    copied = 0
+    if digest is None and hasattr(os, "copy_file_range"):
+        try:
+            while copied < length:
+                count = os.copy_file_range(src_fd, dst_fd, length - copied, src_offset + copied, dst_offset + copied)
+                if count == 0:
+                    return copied
+                copied += count
+            return copied
+        except OSError:
+            pass  # e.g. cross-device on older kernels, or unsupported filesystem
+
+    if digest is None and hasattr(os, "sendfile") and sys.platform.startswith("linux"):
         try:
-            selected_index = self.rom_combiner_listbox.curselection()[0]
-            if selected_index > 0:
-                self.rom_combiner_game_file_paths[selected_index], self.rom_combiner_game_file_paths[selected_index - 1] = self.rom_combiner_game_file_paths[selected_index - 1], self.rom_combiner_game_file_paths[selected_index]
-                self.rom_combiner_update_listbox()
-        except IndexError:
+            os.lseek(dst_fd, dst_offset + copied, os.SEEK_SET)
+            while copied < length:
+                count = os.sendfile(dst_fd, src_fd, src_offset + copied, length - copied)
+                if count == 0:
+                    return copied
+                copied += count
+            return copied
+        except OSError:
             pass
 
-    def move_down(self):
-        """Moves the selected file down in the listbox."""
+    if buffer is None:
+        buffer = bytearray(min(COPY_BUFFER_SIZE, length - copied))
+    view = memoryview(buffer)
+    f_in.seek(src_offset + copied)
+    f_out.seek(dst_offset + copied)
+    while copied < length:
+        count = f_in.readinto(view[:min(len(view), length - copied)])
+        if not count:
+            break
+        _write_all(f_out, view[:count])
+        if digest is not None:
+            digest.update(view[:count])
+        copied += count
+    return copied
+
+# --- Atomic Outputs ---
+
+def _fsync_path(path, directory=False):
+    """fsyncs a file or folder by path. Folders cannot be opened on Windows, so folder errors are ignored."""
+    try:
+        fd = os.open(path, os.O_RDONLY if os.name != "nt" else os.O_RDWR)
+    except OSError:
+        if directory:
+            return
+        raise
+    try:
+        os.fsync(fd)
+    except OSError:
+        if not directory:
+            raise
+    finally:
+        os.close(fd)
+
+class OutputSync:
+    """Decides when outputs are fsynced: "file" before each rename, "batch" all at once in flush(), or "none" (left to the OS)."""
+
+    def __init__(self, policy="file"):
+        if policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {policy}. Expected 'file', 'batch' or 'none'.")
+        self.policy = policy
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def before_rename(self, f_out):
+        if self.policy == "file":
+            os.fsync(f_out.fileno())
+
+    def committed(self, output_filepath):
+        """Called once an output is in place: fsyncs its folder ("file") or records it for flush() ("batch")."""
+        if self.policy == "file":
+            _fsync_path(os.path.dirname(os.path.abspath(output_filepath)), directory=True)
+        elif self.policy == "batch":
+            with self._lock:
+                self._pending.append(os.path.abspath(output_filepath))
+
+    def flush(self):
+        """fsyncs every output recorded since the last flush, then their folders. Returns how many outputs were synced."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        directories = sorted({os.path.dirname(path) for path in pending})
+        with ThreadPoolExecutor(max_workers=min(FSYNC_JOBS, len(pending))) as pool:
+            list(pool.map(_fsync_path, pending))
+            list(pool.map(lambda path: _fsync_path(path, directory=True), directories))
+        return len(pending)
+
+DEFAULT_OUTPUT_SYNC = OutputSync("file")
+CACHE_OUTPUT_SYNC = OutputSync("none")
+
+def _temp_output_path(output_filepath):
+    return f"{output_filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def _open_temp_output(temp_path, size=None):
+    """Opens an unbuffered temp file, preallocated to size with posix_fallocate where supported."""
+    f_out = open(temp_path, "wb", buffering=0)
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f_out.fileno(), 0, size)
+        except OSError:
+            pass  # e.g. not supported by the filesystem; the writes still extend the file
+    return f_out
+
+@contextmanager
+def atomic_output(output_filepath, size=None, sync=None):
+    """Yields an unbuffered temp file (preallocated to size) that is renamed over output_filepath only if the block completes."""
+    sync = sync or DEFAULT_OUTPUT_SYNC
+    temp_path = _temp_output_path(output_filepath)
+    try:
+        with _open_temp_output(temp_path, size) as f_out:
+            yield f_out
+            sync.before_rename(f_out)
+        os.replace(temp_path, output_filepath)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    sync.committed(output_filepath)
+
+@contextmanager
+def atomic_outputs(size=None, sync=None):
+    """Yields open_output(path) for a group of atomic outputs that are all renamed into place only if the block completes."""
+    sync = sync or DEFAULT_OUTPUT_SYNC
+    temp_paths = {}
+
+    @contextmanager
+    def open_output(output_filepath):
+        temp_paths[output_filepath] = temp_path = _temp_output_path(output_filepath)
+        with _open_temp_output(temp_path, size) as f_out:
+            yield f_out
+            sync.before_rename(f_out)
+
+    try:
+        yield open_output
+        for output_filepath, temp_path in temp_paths.items():
+            os.replace(temp_path, output_filepath)
+    except BaseException:
+        for temp_path in temp_paths.values():
+            _remove_quietly(temp_path)
+        raise
+    for output_filepath in temp_paths:
+        sync.committed(output_filepath)
+
+def write_json_output(output_filepath, data, sync=None, **options):
+    """Writes data as UTF-8 JSON (json.dumps options) through atomic_output, so a crash never leaves a truncated file."""
+    encoded = json.dumps(data, **options).encode("utf-8")
+    with atomic_output(output_filepath, sync=sync) as f_out:
+        _write_all(f_out, memoryview(encoded))
+
+def link_output(src_filepath, output_filepath, sync=None):
+    """Hardlinks src_filepath to output_filepath through a temp link, replacing any existing output atomically like atomic_output."""
+    sync = sync or DEFAULT_OUTPUT_SYNC
+    temp_path = _temp_output_path(output_filepath)
+    os.link(src_filepath, temp_path)
+    try:
+        if sync.policy == "file":
+            _fsync_path(temp_path)  # The source may have been written without an fsync, like a cache entry
+        os.replace(temp_path, output_filepath)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    sync.committed(output_filepath)
+
+def _clone_into(f_in, f_out):
+    if fcntl is not None:
         try:
-            selected_index = self.rom_combiner_listbox.curselection()[0]
-            if selected_index < len(self.rom_combiner_game_file_paths) - 1:
-                self.rom_combiner_game_file_paths[selected_index], self.rom_combiner_game_file_paths[selected_index + 1] = self.rom_combiner_game_file_paths[selected_index + 1], self.rom_combiner_game_file_paths[selected_index]
-                self.rom_combiner_update_listbox()
-        except IndexError:
+            fcntl.ioctl(f_out.fileno(), FICLONE, f_in.fileno())
+            return
+        except OSError:
             pass
-    
-    def rom_combiner_update_listbox(self):
-        """Refreshes the listbox with the current file order, highlighting files that are too large."""
-        self.rom_combiner_listbox.delete(0, tk.END)
-        current_slots = GAME_SLOTS_4 if self.rom_combiner_rom_mode.get() == "4" else GAME_SLOTS_3
-        
-        for i, path in enumerate(self.rom_combiner_game_file_paths):
-            if i >= len(current_slots):
-                continue
-                
-            slot = current_slots[i]
-            
+    copy_range(f_in, f_out, 0)
+
+def clone_file(src_filepath, dst_filepath, sync=None):
+    """Copies a whole file, as a reflink when the filesystem supports it, otherwise with copy_range. The copy is written atomically."""
+    with open(src_filepath, "rb", buffering=0) as f_in, atomic_output(dst_filepath, sync=sync) as f_out:
+        _clone_into(f_in, f_out)
+
+def unshare_file(filepath, sync=None):
+    """Gives a file with other hardlinks its own copy, so it can be patched in place without changing them. Returns True if it was shared."""
+    if os.stat(filepath).st_nlink <= 1:
+        return False
+    with atomic_output(filepath, sync=sync) as f_out:
+        with open(filepath, "rb", buffering=0) as f_in:  # Closed before the rename, which Windows needs
+            _clone_into(f_in, f_out)
+    return True
+
+def _fill_gap(f_out, length, fill_byte, fill_buffer):
+    """Moves past a gap of length bytes. Zero gaps are left as holes for the final truncate; other fills are written in bulk."""
+    if length <= 0:
+        return
+    if fill_byte == 0x00:
+        f_out.seek(length, os.SEEK_CUR)
+        return
+    view = memoryview(fill_buffer)
+    while length:
+        count = min(length, len(view))
+        _write_all(f_out, view[:count])
+        length -= count
+
+def write_rom_image(menu, game_paths, slots, output_filepath, total_size=TOTAL_ROM_SIZE_8MB, fill_byte=0x00, progress=None, digests=None, sync=None):
+    """Copies the menu (a path or bytes) and each game to its slot offset in the output image, written atomically."""
+    regions = [(0, menu, "Menu")] + [(slot["start"], path, slot["name"]) for slot, path in zip(slots, game_paths) if path]
+    regions.sort(key=lambda region: region[0])
+
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    fill_buffer = bytes([fill_byte]) * COPY_BUFFER_SIZE if fill_byte != 0x00 else None
+    position = 0
+    with atomic_output(output_filepath, total_size, sync) as f_out:
+        for start, source, name in regions:
+            f_out.seek(position)
+            _fill_gap(f_out, start - position, fill_byte, fill_buffer)
+            if fill_buffer is not None:
+                metric_count("bytes_written", start - position, op="build")
+            digest = None
+            if digests is not None:
+                digests[start] = digest = StreamDigest()
+            with metric_span("build.region", region=name):
+                if _is_menu_data(source):
+                    _write_all(f_out, memoryview(source))
+                    if digest is not None:
+                        digest.update(source)
+                    copied = len(source)
+                else:
+                    with open(source, "rb", buffering=0) as f_in:
+                        copied = copy_range(f_in, f_out, start, buffer=buffer, digest=digest)
+            position = start + copied
+            metric_count("bytes_read", copied, op="build")
+            metric_count("bytes_written", copied, op="build")
+            if progress:
+                progress(position, total_size)
+        f_out.seek(position)
+        _fill_gap(f_out, total_size - position, fill_byte, fill_buffer)
+        if fill_buffer is not None:
+            metric_count("bytes_written", total_size - position, op="build")
+        f_out.truncate(total_size)
+        if progress:
+            progress(total_size, total_size)  # Before the rename, so a cancel here still leaves the old output
+
+# --- Output Verification ---
+
+class StreamDigest:
+    """CRC32 and SHA-256 of a stream of data, updated chunk by chunk as it is written."""
+
+    def __init__(self):
+        self.crc32 = 0
+        self.sha256 = hashlib.sha256()
+        self.length = 0
+
+    def update(self, data):
+        self.crc32 = zlib.crc32(data, self.crc32)
+        self.sha256.update(data)
+        self.length += len(data)
+
+    def to_dict(self):
+        return {"length": self.length, "crc32": f"{self.crc32:08x}", "sha256": self.sha256.hexdigest()}
+
+def read_back_digests(filepath, regions):
+    """Reads a file back through mmap and returns (file digest, {offset: digest}) for the given (offset, length) regions."""
+    file_digest = StreamDigest()
+    region_digests = {}
+    if os.path.getsize(filepath) == 0:
+        return file_digest, {offset: StreamDigest() for offset, _ in regions}
+    with open(filepath, "rb") as f_in, mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as image:
+        view = memoryview(image)
+        try:
+            position = 0
+            for offset, length in sorted(regions):
+                if offset > position:
+                    file_digest.update(view[position:offset])
+                region = view[offset:offset + length]
+                file_digest.update(region)
+                region_digests[offset] = digest = StreamDigest()
+                digest.update(region)
+                region.release()
+                position = max(position, offset + length)
+            file_digest.update(view[position:])
+        finally:
+            view.release()
+    return file_digest, region_digests
+
+def verify_manifest_path(filepath):
+    """Returns the path of the checksum manifest written next to a verified file."""
+    return filepath + VERIFY_MANIFEST_SUFFIX
+
+def write_verify_manifest(filepath, kind, file_digest, regions, sync=None):
+    """Writes the checksum manifest of a verified file, recording its size and mtime. Returns the manifest path."""
+    stat = os.stat(filepath)
+    manifest = {
+        "version": VERIFY_MANIFEST_VERSION,
+        "kind": kind,
+        "file": os.path.basename(filepath),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "crc32": f"{file_digest.crc32:08x}",
+        "sha256": file_digest.sha256.hexdigest(),
+        "regions": regions,
+    }
+    manifest_path = verify_manifest_path(filepath)
+    write_json_output(manifest_path, manifest, sync, indent=2)
+    return manifest_path
+
+def load_verify_manifest(filepath):
+    """Returns the checksum manifest of a file if it still matches the file's size and mtime, otherwise None."""
+    try:
+        with open(verify_manifest_path(filepath), "r", encoding="utf-8") as f_in:
+            manifest = json.load(f_in)
+        stat = os.stat(filepath)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != VERIFY_MANIFEST_VERSION or (manifest.get("size"), manifest.get("mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return manifest
+
+def _check_read_back(filepath, expected, actual, names, skip=()):
+    """Compares streamed region digests with read-back ones. Raises VerificationError naming the regions that differ."""
+    mismatched = [names[offset] for offset, digest in expected.items()
+                  if offset not in skip and digest.to_dict() != actual[offset].to_dict()]
+    if mismatched:
+        raise VerificationError(f"{os.path.basename(filepath)} did not read back as written: {', '.join(mismatched)} differ.")
+
+# --- Build Cache ---
+
+_file_hash_memo = {}  # path -> ((size, mtime, inode), digest); one entry per path, so a long watch run does not grow it
+
+def hash_file(filepath):
+    """Returns the SHA-256 hex digest of a file, memoized by path and (size, mtime, inode) so unchanged files are not re-read."""
+    stat = os.stat(filepath)
+    path = os.path.abspath(filepath)
+    file_key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    memo = _file_hash_memo.get(path)
+    digest = memo[1] if memo is not None and memo[0] == file_key else None
+    if digest is None:
+        hasher = hashlib.sha256()
+        buffer = bytearray(COPY_BUFFER_SIZE)
+        view = memoryview(buffer)
+        with open(filepath, "rb", buffering=0) as f_in:
+            while True:
+                count = f_in.readinto(buffer)
+                if not count:
+                    break
+                hasher.update(view[:count])
+        digest = hasher.hexdigest()
+        _file_hash_memo[path] = (file_key, digest)
+    return digest
+
+class RomBuildCache:
+    """Content-addressed LRU cache of built ROM images, handed out as clones or hardlinks."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_CACHE_SIZE, link_mode="clone"):
+        if link_mode not in ("clone", "hardlink"):
+            raise ValueError(f"Unknown cache link mode: {link_mode}. Expected 'clone' or 'hardlink'.")
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.link_mode = link_mode
+        self.hits = 0
+        self.misses = 0
+
+    def build_key(self, menu, game_paths, slots, total_size=TOTAL_ROM_SIZE_8MB, fill_byte=0x00, fix_checksums=False):
+        """Returns the cache key for a build: a hash of the menu, the ordered games and the slot layout."""
+        inputs = {
+            "menu": hashlib.sha256(menu).hexdigest() if _is_menu_data(menu) else hash_file(menu),
+            "games": [hash_file(path) if path else None for path in game_paths],
+            "slots": [[slot["start"], slot["max_size"]] for slot in slots],
+            "total_size": total_size,
+            "fill_byte": fill_byte,
+        }
+        if fix_checksums:
+            inputs["fix_checksums"] = True  # Only added when set, so existing cache entries keep their keys
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".rom")
+
+    @staticmethod
+    def _mark_used(entry):
+        """Touches the entry's .used marker, which evict reads as its last use."""
+        marker = entry[:-len(".rom")] + ".used"
+        try:
+            with open(marker, "ab"):
+                pass
+            os.utime(marker)
+        except OSError:
+            pass  # A lost mark only makes the entry an earlier eviction candidate
+
+    def fetch(self, key, output_filepath, sync=None):
+        """Writes the cached image for key to output_filepath. Returns False (and counts a miss) if it is not cached."""
+        entry = self.entry_path(key)
+        try:
+            if self.link_mode == "hardlink":
+                link_output(entry, output_filepath, sync)
+            else:
+                clone_file(entry, output_filepath, sync)
+        except FileNotFoundError:
+            # Not cached, or evicted by another worker while we were fetching it
+            if not os.path.exists(entry):
+                self.misses += 1
+                metric_count("cache_misses")
+                return False
+            raise
+        self._mark_used(entry)
+        self.hits += 1
+        metric_count("cache_hits")
+        return True
+
+    def store(self, key, source_filepath):
+        """Adds a built image to the cache, then evicts old entries if the cache is over its size limit."""
+        entry = self.entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        clone_file(source_filepath, entry, CACHE_OUTPUT_SYNC)  # A lost entry is only a cache miss, so it is never fsynced
+        self._mark_used(entry)
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        used = {}
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                stem, ext = os.path.splitext(os.path.join(root, name))
+                if ext not in (".rom", ".used"):
+                    continue
+                try:
+                    stat = os.stat(stem + ext)
+                except OSError:
+                    continue
+                if ext == ".used":
+                    used[stem] = stat.st_mtime_ns
+                else:
+                    entries.append((stat.st_mtime_ns, stat.st_size, stem))
+                    total += stat.st_size
+
+        entries = sorted((used.pop(stem, mtime), size, stem) for mtime, size, stem in entries)
+        for stem in used:
+            _remove_quietly(stem + ".used")  # Markers left behind by entries another worker evicted
+        for _, size, stem in entries:
+            if total <= self.max_bytes:
+                break
             try:
-                file_size_bytes = os.path.getsize(path)
-                file_size_mb = file_size_bytes / (1024 * 1024)
-                display_text = f"Slot {i+1} ({slot['max_size']/1024/1024:.0f}MB): {os.path.basename(path)} ({file_size_mb:.2f}MB)"
-                
-                self.rom_combiner_listbox.insert(tk.END, display_text)
-                
-                if file_size_bytes > slot["max_size"]:
-                    self.rom_combiner_listbox.itemconfig(tk.END, {'fg': 'red'})
+                os.remove(stem + ".rom")
+                total -= size
             except OSError:
-                display_text = f"Slot {i+1}: ERROR - File not found or inaccessible."
-                self.rom_combiner_listbox.insert(tk.END, display_text)
-                self.rom_combiner_listbox.itemconfig(tk.END, {'fg': 'red'})
-        
-    def create_rom(self):
-        """Creates the final ROM file based on the memory map."""
-        menu_filepath = None
-        rom_count = int(self.rom_combiner_rom_mode.get())
-        
-        # Determine menu file path based on user selections
-        if self.rom_combiner_menu_mode.get() == "Automatic":
-            device = self.rom_combiner_device_mode.get()
-            menu_filename = MENU_FILES.get((device, rom_count))
-            
-            # Use the directory where the script is running
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            menu_filepath = os.path.join(script_dir, 'menus', menu_filename)
-
-            if not os.path.exists(menu_filepath):
-                messagebox.showerror(
-                    "Error", 
-                    f"Could not find the automatic menu file: {menu_filename}.\n\n"
-                    "Please create a folder named 'menus' in the same directory as this script "
-                    "and place the file inside. Alternatively, select a custom menu file."
-                )
-                return
-        else: # Custom menu mode
-            if not self.rom_combiner_menu_file_path:
-                messagebox.showerror("Error", "Please select a custom menu file.")
-                return
-            menu_filepath = self.rom_combiner_menu_file_path
-
-        current_slots = GAME_SLOTS_4 if self.rom_combiner_rom_mode.get() == "4" else GAME_SLOTS_3
-        
-        if len(self.rom_combiner_game_file_paths) > len(current_slots):
-             messagebox.showerror("Error", f"You have too many games selected for the {len(current_slots)}-game ROM configuration.")
-             return
-        
-        # Check if any game file is too large for its slot
-        for i, game_filepath in enumerate(self.rom_combiner_game_file_paths):
-            slot = current_slots[i]
+                continue
+            _remove_quietly(stem + ".used")
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+# --- ROM Header Index ---
+
+def parse_rom_header(header):
+    """Parses the cartridge header (bytes 0x100-0x14F of a ROM) into a dict."""
+    if len(header) < HEADER_END - HEADER_START:
+        raise ValueError("The file is too small to contain a Game Boy cartridge header.")
+
+    def at(address):
+        return header[address - HEADER_START]
+
+    cgb_flag = at(HEADER_CGB_FLAG)
+    title_end = HEADER_CGB_FLAG if cgb_flag & 0x80 else HEADER_CGB_FLAG + 1
+    title = bytes(header[HEADER_TITLE - HEADER_START:title_end - HEADER_START]).split(b"\x00")[0]
+
+    return {
+        "title": title.decode("ascii", errors="replace").strip(),
+        "cgb_flag": cgb_flag,
+        "cart_type": at(HEADER_CART_TYPE),
+        "rom_size_code": at(HEADER_ROM_SIZE),
+        "ram_size_code": at(HEADER_RAM_SIZE),
+        "header_checksum": at(HEADER_CHECKSUM),
+        "global_checksum": (at(HEADER_GLOBAL_CHECKSUM) << 8) | at(HEADER_GLOBAL_CHECKSUM + 1),
+        "header_checksum_ok": compute_header_checksum(header) == at(HEADER_CHECKSUM),
+    }
+
+def compute_header_checksum(header):
+    """Returns the header checksum the boot ROM expects, given the header bytes (0x100-0x14F)."""
+    checksum = 0
+    for byte in header[HEADER_TITLE - HEADER_START:HEADER_CHECKSUM - HEADER_START]:
+        checksum = (checksum - byte - 1) & 0xFF
+    return checksum
+
+def read_rom_header(filepath):
+    """Reads and parses only the header bytes of a ROM file."""
+    with open(filepath, "rb", buffering=0) as f_in:
+        if hasattr(os, "pread"):
+            header = os.pread(f_in.fileno(), HEADER_END - HEADER_START, HEADER_START)
+        else:
+            f_in.seek(HEADER_START)
+            header = f_in.read(HEADER_END - HEADER_START)
+    return parse_rom_header(header)
+
+def header_rom_size(header):
+    """Returns the ROM size declared by a parsed header, or None if the size code is unknown."""
+    code = header["rom_size_code"]
+    return ROM_SIZE_32KB << code if code <= 8 else None
+
+class RomIndex:
+    """On-disk JSON index of parsed cartridge headers, refreshed by file size and mtime."""
+
+    FIELDS = ("title", "cgb_flag", "cart_type", "rom_size_code", "ram_size_code",
+              "header_checksum", "global_checksum", "header_checksum_ok")
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        self.entries = {}
+        self.dirty = False
+        if index_path and os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f_in:
+                data = json.load(f_in)
+            if data.get("version") == ROM_INDEX_VERSION:
+                self.entries = data.get("roms", {})
+
+    def save(self, sync=None):
+        """Writes the index atomically (see write_json_output) if it changed since it was loaded."""
+        if not self.index_path or not self.dirty:
+            return
+        write_json_output(self.index_path, {"version": ROM_INDEX_VERSION, "roms": self.entries}, sync, separators=(",", ":"))
+        self.dirty = False
+
+    def _is_current(self, path, stat):
+        entry = self.entries.get(path)
+        return entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns
+
+    def _store(self, path, stat, header):
+        self.entries[path] = [stat.st_size, stat.st_mtime_ns] + [header[field] for field in self.FIELDS]
+        self.dirty = True
+
+    def get_header(self, filepath):
+        """Returns the parsed header for a ROM, reading the file only if it changed since it was indexed."""
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        if not self._is_current(path, stat):
+            self._store(path, stat, read_rom_header(path))
+        entry = self.entries[path]
+        return dict(zip(("size", "mtime_ns") + self.FIELDS, entry))
+
+    def update(self, paths, jobs=16):
+        """Indexes every new or changed ROM under the given files/folders in parallel. Returns (scanned, updated, removed) counts."""
+        scanned = {}
+        for path in find_rom_files(paths):
+            path = os.path.abspath(path)
             try:
-                file_size = os.path.getsize(game_filepath)
-                if file_size > slot["max_size"]:
-                    messagebox.showerror("Error", f"{os.path.basename(game_filepath)} ({file_size/1024/1024:.2f}MB) is larger than the {slot['max_size']/1024/1024}MB limit for {slot['name']}. No file will be created.")
-                    return
+                scanned[path] = os.stat(path)
             except OSError:
-                messagebox.showerror("Error", f"Could not access game file: {os.path.basename(game_filepath)}. Please ensure the file exists and is accessible.")
-                return
+                continue
 
+        changed = [path for path, stat in scanned.items() if not self._is_current(path, stat)]
+        updated = 0
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for path, header in zip(changed, pool.map(_read_rom_header_or_none, changed)):
+                if header is not None:
+                    self._store(path, scanned[path], header)
+                    updated += 1
 
-        output_filepath = filedialog.asksaveasfilename(
-            defaultextension=".gbc",
-            title="Save the combined ROM file",
-            filetypes=[("ROM Files", "*.gbc"), ("All Files", "*.*")]
-        )
-        if not output_filepath:
-            return
+        roots = [os.path.join(os.path.abspath(path), "") for path in paths if os.path.isdir(path)]
+        removed = [path for path in self.entries if path not in scanned and any(path.startswith(root) for root in roots)]
+        for path in removed:
+            del self.entries[path]
+        if removed:
+            self.dirty = True
+        return len(scanned), updated, len(removed)
+
+def _read_rom_header_or_none(filepath):
+    try:
+        return read_rom_header(filepath)
+    except (OSError, ValueError):
+        return None
+
+def rom_compatibility_warnings(game_paths, device, rom_count, index=None, profile=None):
+    """Checks the games' headers against the device and slot layout. Returns a list of warning messages."""
+    current_slots = get_game_slots(rom_count, profile)
+    warnings = []
+    for i, game_filepath in enumerate(game_paths):
+        if game_filepath is None or i >= len(current_slots):
+            continue
+        name = os.path.basename(game_filepath)
+        try:
+            header = index.get_header(game_filepath) if index is not None else read_rom_header(game_filepath)
+        except (OSError, ValueError):
+            warnings.append(f"{name}: could not read the cartridge header.")
+            continue
+        if device == "Gameboy" and header["cgb_flag"] == CGB_ONLY:
+            warnings.append(f"{name} ({header['title']}) only runs on a Gameboy Colour.")
+        declared_size = header_rom_size(header)
+        if declared_size is not None and declared_size > current_slots[i]["max_size"]:
+            warnings.append(f"{name} ({header['title']}) declares {declared_size/1024/1024:.2f}MB, more than {current_slots[i]['name']}.")
+        if not header["header_checksum_ok"]:
+            warnings.append(f"{name} ({header['title']}) has a bad header checksum.")
+    return warnings
+
+# --- Checksum Verification ---
+
+_numpy = None
+
+def _load_numpy():
+    """Returns the numpy module, imported on first use, or None if it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def byte_sum(data):
+    """Returns the sum of every byte in a buffer, with NumPy or with zlib.adler32 over 256-byte blocks."""
+    numpy = _load_numpy()
+    if numpy is not None:
+        return int(numpy.frombuffer(data, dtype=numpy.uint8).sum(dtype=numpy.uint64))
+    view = memoryview(data)
+    adler32 = zlib.adler32
+    total = 0
+    for position in range(0, len(view), ADLER_SUM_BLOCK):
+        total += adler32(view[position:position + ADLER_SUM_BLOCK], 0) & 0xFFFF
+    return total
+
+def check_rom_checksums(rom, fix=False):
+    """Checks the header and global checksums of one ROM in a buffer, repairing them in place with fix. Returns stored and expected values."""
+    if len(rom) < HEADER_END:
+        raise ValueError("The ROM is too small to contain a Game Boy cartridge header.")
+    header = parse_rom_header(rom[HEADER_START:HEADER_END])
+    header_stored = rom[HEADER_CHECKSUM]
+    header_expected = compute_header_checksum(rom[HEADER_START:HEADER_END])
+    global_stored = (rom[HEADER_GLOBAL_CHECKSUM] << 8) | rom[HEADER_GLOBAL_CHECKSUM + 1]
+    total = byte_sum(rom)
+
+    header_fixed = fix and header_stored != header_expected
+    if header_fixed:
+        rom[HEADER_CHECKSUM] = header_expected
+        total += header_expected - header_stored
+    global_expected = (total - rom[HEADER_GLOBAL_CHECKSUM] - rom[HEADER_GLOBAL_CHECKSUM + 1]) & 0xFFFF
+    global_fixed = fix and global_stored != global_expected
+    if global_fixed:
+        rom[HEADER_GLOBAL_CHECKSUM] = global_expected >> 8
+        rom[HEADER_GLOBAL_CHECKSUM + 1] = global_expected & 0xFF
 
+    return {
+        "title": header["title"],
+        "header_checksum": header_stored,
+        "header_expected": header_expected,
+        "header_ok": header_stored == header_expected,
+        "global_checksum": global_stored,
+        "global_expected": global_expected,
+        "global_ok": global_stored == global_expected,
+        "fixed": header_fixed or global_fixed,
+    }
+
+def verify_rom_image(image_filepath, rom_count, game_sizes=None, fix=False, profile=None):
+    """Checks (and with fix repairs) the header and global checksums of every game slot in a combined ROM. The menu is left alone."""
+    profile = _profile(profile)
+    slots = profile.slots(rom_count)
+    image_size = os.path.getsize(image_filepath)
+    if image_size != profile.rom_size:
+        raise ValueError(f"{os.path.basename(image_filepath)} is {image_size/1024/1024:.2f}MB, not a {format_size(profile.rom_size)} combined ROM.")
+    if fix:
+        unshare_file(image_filepath)
+
+    sizes = game_sizes if game_sizes is not None else [None] * len(slots)
+    regions = [(slot["name"], slot["start"], slot["max_size"], size) for slot, size in zip(slots, sizes)]
+    blank_header = bytes([profile.fill_byte]) * (HEADER_END - HEADER_START)
+
+    start = time.perf_counter()
+    report = {"image": image_filepath, "roms": [], "bad": 0, "fixed": 0, "used_bytes": 0}
+    with open(image_filepath, "r+b" if fix else "rb") as f_image, \
+            mmap.mmap(f_image.fileno(), 0, access=mmap.ACCESS_WRITE if fix else mmap.ACCESS_READ) as image:
+        view = memoryview(image)
+        try:
+            for name, offset, max_size, size in regions:
+                entry = {"name": name, "offset": offset, "size": 0, "empty": False}
+                header = view[offset + HEADER_START:offset + HEADER_END]
+                if (game_sizes is not None and size is None) or (game_sizes is None and header == blank_header):
+                    entry["empty"] = True
+                else:
+                    if size is None:
+                        declared_size = header_rom_size(parse_rom_header(header))
+                        size = min(declared_size or max_size, max_size)
+                    entry["size"] = size
+                    rom = view[offset:offset + size]
+                    try:
+                        entry.update(check_rom_checksums(rom, fix))
+                    finally:
+                        rom.release()
+                    report["used_bytes"] += size
+                    report["bad"] += not (entry["header_ok"] and entry["global_ok"])
+                    report["fixed"] += entry["fixed"]
+                header.release()
+                report["roms"].append(entry)
+        finally:
+            view.release()
+        if fix and report["fixed"]:
+            image.flush()
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+def checksum_report_lines(report, problems_only=False):
+    """Formats a verify_rom_image report as one line per ROM (or only the ROMs with a wrong checksum)."""
+    lines = []
+    for entry in report["roms"]:
+        if entry["empty"]:
+            if not problems_only:
+                lines.append(f"{entry['name']}: empty")
+            continue
+        problems = []
+        if not entry["header_ok"]:
+            problems.append(f"header checksum 0x{entry['header_checksum']:02X}, expected 0x{entry['header_expected']:02X} (checked by the boot ROM)")
+        if not entry["global_ok"]:
+            problems.append(f"global checksum 0x{entry['global_checksum']:04X}, expected 0x{entry['global_expected']:04X} (not checked by hardware, but often a bad dump)")
+        if problems:
+            fixed = " - fixed in the image" if entry["fixed"] else ""
+            lines.append(f"{entry['name']} ({entry['title']}): {'; '.join(problems)}{fixed}")
+        elif not problems_only:
+            lines.append(f"{entry['name']} ({entry['title']}): checksums ok")
+    return lines
+
+# --- Slot Packing ---
+
+def find_rom_files(paths):
+    """Expands a mix of files and folders (searched recursively) into a sorted list of .gb/.gbc files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in files if name.lower().endswith(ROM_EXTENSIONS))
+        else:
+            found.append(path)
+    return sorted(found)
+
+def assign_slots(games, rom_count, profile=None):
+    """Orders (path, size) games so that each one fits its slot, returning one path or None per slot. Raises ValueError if they cannot fit."""
+    profile = _profile(profile)
+    current_slots = profile.slots(rom_count)
+    if len(games) > len(current_slots):
+        raise ValueError(f"You have too many games selected for the {len(current_slots)}-game ROM configuration.")
+
+    slot_order = profile.slot_order[rom_count]
+    game_order = sorted(games, key=lambda game: game[1], reverse=True)
+    assignment = [None] * len(current_slots)
+    for slot_index, (path, size) in zip(slot_order, game_order):
+        slot = current_slots[slot_index]
+        if size > slot["max_size"]:
+            raise ValueError(f"{os.path.basename(path)} ({size/1024/1024:.2f}MB) does not fit any free slot in the {len(current_slots)}-game ROM configuration.")
+        assignment[slot_index] = path
+    return assignment
+
+def plan_carts(games, rom_counts=None, profile=None):
+    """Packs (path, size) games into as few carts as possible. Returns (carts, games too large for every slot)."""
+    profile = _profile(profile)
+    layouts = {rom_count: profile.slots(rom_count) for rom_count in (rom_counts or profile.rom_counts)}
+    largest_slot = max(slot["max_size"] for slots in layouts.values() for slot in slots)
+
+    carts = []        # [rom_count, [(path, size), ...]]
+    free_slots = {}   # max_size -> open cart indexes (oldest first), one entry per free slot
+    unplaced = []
+
+    for path, size in sorted(games, key=lambda game: game[1], reverse=True):
+        if size > largest_slot:
+            unplaced.append((path, size))
+            continue
+
+        fitting_sizes = sorted(max_size for max_size, cart_indexes in free_slots.items() if max_size >= size and cart_indexes)
+        if fitting_sizes:
+            cart_index = free_slots[fitting_sizes[0]].popleft()
+        else:
+            rom_count = max((count for count, slots in layouts.items() if any(slot["max_size"] >= size for slot in slots)),
+                            key=lambda count: (len(layouts[count]), sum(slot["max_size"] for slot in layouts[count])))
+            cart_index = len(carts)
+            carts.append([rom_count, []])
+            slot_sizes = sorted(slot["max_size"] for slot in layouts[rom_count])
+            taken = next(i for i, max_size in enumerate(slot_sizes) if max_size >= size)
+            for i, max_size in enumerate(slot_sizes):
+                if i != taken:
+                    free_slots.setdefault(max_size, deque()).append(cart_index)
+        carts[cart_index][1].append((path, size))
+
+    planned = []
+    for _, cart_games in carts:
+        # The layout the cart was opened with always fits, so one of these will succeed
+        for candidate in sorted(layouts, key=lambda count: len(layouts[count])):
+            try:
+                planned.append({"mode": candidate, "games": assign_slots(cart_games, candidate, profile)})
+                break
+            except ValueError:
+                continue
+    return planned, unplaced
+
+def build_rom(menu, game_paths, rom_count, output_filepath, cache=None, progress=None, profile=None, checksums=None, verify=False, sync=None):
+    """Builds a multi-game ROM file from a menu and an ordered list of games, using the profile's size, layout and fill byte."""
+    if checksums not in (None,) + CHECKSUM_MODES:
+        raise ValueError(f"Unknown checksum mode: {checksums}. Expected 'verify' or 'fix'.")
+    profile = _profile(profile)
+    with metric_span("build", mode=rom_count):
+        with metric_span("build.validate"):
+            current_slots = validate_rom_build(menu, game_paths, rom_count, profile)
+        game_sizes = None
+        if checksums:
+            game_sizes = [os.path.getsize(path) if path else None for path in game_paths]
+            game_sizes += [None] * (len(current_slots) - len(game_sizes))
+        fix = checksums == "fix"
+
+        if verify:
+            _remove_quietly(verify_manifest_path(output_filepath))
+
+        if cache is not None:
+            key = cache.build_key(menu, game_paths, current_slots, profile.rom_size, profile.fill_byte, fix_checksums=fix)
+            with metric_span("build.cache_fetch"):
+                fetched = cache.fetch(key, output_filepath, sync)
+            if fetched:
+                if progress:
+                    progress(profile.rom_size, profile.rom_size)
+                # Cached images were repaired when they were stored; only check them (they may be hardlinks)
+                report = None
+                if checksums:
+                    with metric_span("build.checksums"):
+                        report = verify_rom_image(output_filepath, rom_count, game_sizes, profile=profile)
+                    metric_count("bytes_read", report["used_bytes"], op="build")
+                manifest = None
+                if verify:
+                    # Nothing was streamed, so the whole read-back is compared with the cache entry it came from
+                    with metric_span("build.verify"):
+                        manifest = _verify_rom_output(output_filepath, menu, game_paths, current_slots, {}, report,
+                                                      expected_sha256=hash_file(cache.entry_path(key)), sync=sync)
+                    metric_count("bytes_read", 2 * profile.rom_size, op="build")
+                return {"cached": True, "checksums": report, "manifest": manifest}
+
+        digests = {} if verify else None
+        with metric_span("build.write"):
+            write_rom_image(menu, game_paths, current_slots, output_filepath, profile.rom_size, profile.fill_byte, progress=progress, digests=digests, sync=sync)
+        report = None
+        if checksums:
+            with metric_span("build.checksums"):
+                report = verify_rom_image(output_filepath, rom_count, game_sizes, fix, profile)
+            metric_count("bytes_read", report["used_bytes"], op="build")
+        manifest = None
+        if verify:
+            with metric_span("build.verify"):
+                manifest = _verify_rom_output(output_filepath, menu, game_paths, current_slots, digests, report, sync=sync)
+            metric_count("bytes_read", profile.rom_size, op="build")
+        if cache is not None:
+            with metric_span("build.cache_store"):
+                cache.store(key, output_filepath)
+        return {"cached": False, "checksums": report, "manifest": manifest}
+
+def _verify_rom_output(output_filepath, menu, game_paths, slots, expected, report, expected_sha256=None, sync=None):
+    """Reads a built image back, compares each region with its written digest (or the whole image with expected_sha256) and writes its manifest."""
+    names = {0: "Menu"}
+    sources = {0: "(built-in menu)" if _is_menu_data(menu) else os.path.abspath(menu)}
+    for slot, path in zip(slots, game_paths):
+        if path:
+            names[slot["start"]] = slot["name"]
+            sources[slot["start"]] = os.path.abspath(path)
+    lengths = {0: len(menu) if _is_menu_data(menu) else os.path.getsize(menu)}
+    lengths.update((slot["start"], os.path.getsize(path)) for slot, path in zip(slots, game_paths) if path)
+
+    fixed = {entry["offset"] for entry in report["roms"] if entry.get("fixed")} if report else set()
+    file_digest, actual = read_back_digests(output_filepath, list(lengths.items()))
+    _check_read_back(output_filepath, expected, actual, names, skip=fixed)
+    if expected_sha256 is not None and file_digest.sha256.hexdigest() != expected_sha256:
+        raise VerificationError(f"{os.path.basename(output_filepath)} did not read back as written: it differs from the cached image.")
+
+    regions = [{"name": names[offset], "offset": offset, "source": sources[offset], "fixed": offset in fixed, **actual[offset].to_dict()}
+               for offset in sorted(lengths)]
+    return write_verify_manifest(output_filepath, "rom", file_digest, regions, sync)
+
+def _fill_view(view, fill_byte, fill_buffer):
+    """Sets every byte of a memoryview to fill_byte, skipping blocks that already hold it so clean pages stay clean."""
+    fill_view = memoryview(fill_buffer)
+    written = 0
+    for position in range(0, len(view), len(fill_view)):
+        block = view[position:position + len(fill_view)]
+        expected = fill_view[:len(block)]
+        if block != expected:
+            block[:] = expected
+            written += len(block)
+    return written
+
+def update_rom_slot(image_filepath, rom_count, slot_index, game_filepath, menu=None, profile=None):
+    """Replaces (or with None empties) the game in one slot of an existing combined ROM in place. Returns the bytes written."""
+    profile = _profile(profile)
+    fill_byte = profile.fill_byte
+    current_slots = profile.slots(rom_count)
+    if not 0 <= slot_index < len(current_slots):
+        raise ValueError(f"Slot {slot_index+1} does not exist in the {len(current_slots)}-game ROM configuration.")
+    slot = current_slots[slot_index]
+
+    image_size = os.path.getsize(image_filepath)
+    if image_size != profile.rom_size:
+        raise ValueError(f"{os.path.basename(image_filepath)} is {image_size/1024/1024:.2f}MB, not a {format_size(profile.rom_size)} combined ROM.")
+    if game_filepath:
+        game_size = os.path.getsize(game_filepath)
+        if game_size > slot["max_size"]:
+            raise ValueError(f"{os.path.basename(game_filepath)} ({game_size/1024/1024:.2f}MB) is larger than the {slot['max_size']/1024/1024}MB limit for {slot['name']}.")
+
+    menu_region = None
+    if menu:
+        menu_data = read_menu(menu)
+        if len(menu_data) > profile.menu_size:
+            raise ValueError(f"The menu file is larger than the {format_size(profile.menu_size)} limit.")
+        menu_region = menu_data + bytes([fill_byte]) * (profile.menu_size - len(menu_data))
+
+    unshare_file(image_filepath)
+    fill_buffer = bytes([fill_byte]) * COPY_BUFFER_SIZE
+    written = 0
+    with open(image_filepath, "r+b") as f_image, mmap.mmap(f_image.fileno(), 0) as image:
+        view = memoryview(image)
+        try:
+            if menu_region is not None and view[:profile.menu_size] != menu_region:
+                view[:profile.menu_size] = menu_region
+                written += profile.menu_size
+
+            slot_view = view[slot["start"]:slot["start"] + slot["max_size"]]
+            game_size = 0
+            if game_filepath:
+                with open(game_filepath, "rb", buffering=0) as game_in:
+                    while game_size < len(slot_view):
+                        count = game_in.readinto(slot_view[game_size:])
+                        if not count:
+                            break
+                        game_size += count
+                written += game_size
+            written += _fill_view(slot_view[game_size:], fill_byte, fill_buffer)
+            slot_view.release()
+        finally:
+            view.release()
+        image.flush()
+    return written
+
+def _read_manifest(manifest_path, key):
+    """Loads a JSON manifest holding a list (or an object with the list under key). Returns the entries and a relative path resolver."""
+    with open(manifest_path, "r", encoding="utf-8") as f_in:
+        manifest = json.load(f_in)
+
+    entries = manifest.get(key, []) if isinstance(manifest, dict) else manifest
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    def resolve(path):
+        return os.path.normpath(os.path.join(base_dir, os.path.expanduser(path)))
+
+    return entries, resolve
+
+def load_build_manifest(manifest_path):
+    """Reads a JSON build manifest and returns its build specs with paths made relative to the manifest absolute."""
+    entries, resolve = _read_manifest(manifest_path, "builds")
+    builds = []
+    for i, entry in enumerate(entries):
+        if "output" not in entry:
+            raise ValueError(f"Build {i+1} in {os.path.basename(manifest_path)} has no output path.")
+        menu = entry.get("menu", "Automatic")
+        builds.append({
+            "device": entry.get("device", "Gameboy Colour"),
+            "mode": int(entry.get("mode", 4)),
+            "menu": None if menu in (None, "", "Automatic") else resolve(menu),
+            "games": [resolve(path) if path else None for path in entry.get("games", [])],
+            "output": resolve(entry["output"]),
+        })
+    return builds
+
+def run_build(build, cache=None, profile=None, checksums=None, verify=False, fsync="file", collect_metrics=False):
+    """Runs a single build spec and returns a result dict with its timing. Never raises, so it is safe to run in a worker process."""
+    previous_metrics = set_metrics(Metrics() if collect_metrics else None)
+    start = time.perf_counter()
+    error = None
+    cached = False
+    warnings = []
+    report = None
+    manifest = None
+    try:
+        sync = OutputSync(fsync)
+        menu = resolve_menu(build["device"], build["mode"], build.get("menu"), profile)
+        warnings = rom_compatibility_warnings(build["games"], build["device"], build["mode"], profile=profile)
+        output_dir = os.path.dirname(build["output"])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        outcome = build_rom(menu, build["games"], build["mode"], build["output"], cache=cache, profile=profile,
+                            checksums=checksums, verify=verify, sync=sync)
+        cached, report, manifest = outcome["cached"], outcome["checksums"], outcome["manifest"]
+        sync.flush()
+    except Exception as e:
+        error = str(e)
+        metric_count("errors", op="build")
+    metrics = set_metrics(previous_metrics)
+    return {"output": build["output"], "seconds": time.perf_counter() - start, "error": error, "cached": cached,
+            "warnings": warnings, "checksums": report, "manifest": manifest, "metrics": metrics.drain() if metrics else None}
+
+def run_build_batch(builds, jobs=None, on_result=None, cache=None, profile=None, checksums=None, verify=False, fsync="batch"):
+    """Runs many build specs across a process pool. Calls on_result(result) as each build finishes and returns all results."""
+    from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing, so only import it when needed
+    profile = _profile(profile)
+    sync = OutputSync(fsync)
+    metrics = get_metrics()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_build, build, cache, profile, checksums, verify, "none" if fsync == "batch" else fsync, metrics is not None)
+                   for build in builds]
+        for future in as_completed(futures):
+            result = future.result()
+            if metrics is not None:
+                metrics.record_events(result["metrics"])
+            results.append(result)
+            if result["error"] is None:
+                sync.committed(result["output"])
+            if on_result:
+                on_result(result)
+    sync.flush()
+    return results
+
+
+# -----------------------------------------------------------------------------
+#                         HEADLESS CART EXTRACTION
+# -----------------------------------------------------------------------------
+
+def _is_fill(data, fill_byte):
+    return not bytes(data).strip(bytes([fill_byte]))
+
+def detect_cart_layout(image, profile=None):
+    """Works out (rom_count, device or None) of a combined image from its menu or slot headers. Raises ValueError if nothing matches."""
+    profile = _profile(profile)
+    for (device, rom_count), menu_filename in sorted(profile.menu_files.items()):
+        menu = load_builtin_menu(menu_filename)
+        if menu is not None and image[:len(menu)] == menu:
+            return rom_count, device
+
+    best = None
+    for rom_count, slots in profile.layouts.items():
+        valid = empty = 0
+        for slot in slots:
+            header = image[slot["start"] + HEADER_START:slot["start"] + HEADER_END]
+            if len(header) < HEADER_END - HEADER_START or _is_fill(header, profile.fill_byte):
+                empty += 1
+            elif parse_rom_header(header)["header_checksum_ok"]:
+                valid += 1
+        score = (valid, len(slots) - empty, -empty)
+        if valid and (best is None or score > best[0]):
+            best = (score, rom_count)
+    if best is None:
+        raise ValueError("Could not detect the cart layout: the menu is not a built-in one and no slot holds a valid ROM header. "
+                         "Give the ROM type explicitly.")
+    return best[1], None
+
+def _is_builtin_menu(image, device, rom_count, profile):
+    """Checks the image's menu region holds exactly the built-in menu for device, as an automatic build writes it."""
+    menu = load_builtin_menu(profile.menu_files[(device, rom_count)])
+    end = min(slot["start"] for slot in profile.slots(rom_count))
+    return menu is not None and image[:len(menu)] == menu and _is_fill(image[len(menu):end], profile.fill_byte)
+
+def _region_rom_length(image, start, max_size, fill_byte):
+    """Returns (length, source) of the ROM at start: the size from its header if it fits, otherwise the data up to the trailing fill, in 32KB steps."""
+    limit = min(max_size, len(image) - start)
+    try:
+        size = header_rom_size(parse_rom_header(image[start + HEADER_START:start + HEADER_END]))
+    except ValueError:
+        size = None
+    if size is not None and size <= limit:
+        return size, "header"
+    used = len(image[start:start + limit].rstrip(bytes([fill_byte])))
+    return min(limit, max(ROM_SIZE_32KB, -(-used // ROM_SIZE_32KB) * ROM_SIZE_32KB)), "fill"
+
+def _safe_filename(text):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in text).strip("_") or "untitled"
+
+def plan_cart_extraction(image, rom_count=None, profile=None):
+    """Lists the menu and games held in a combined image without copying anything. Returns (rom_count, device or None, regions)."""
+    profile = _profile(profile)
+    device = None
+    if rom_count is None:
+        rom_count, device = detect_cart_layout(image, profile)
+    slots = profile.slots(rom_count)
+
+    candidates = [(0, "Menu", 0, min(slot["start"] for slot in slots))]
+    candidates += [(n, slot["name"], slot["start"], slot["max_size"]) for n, slot in enumerate(slots, start=1)]
+    regions = []
+    for n, name, start, max_size in candidates:
+        if start + HEADER_END > len(image) or _is_fill(image[start:start + HEADER_END], profile.fill_byte):
+            continue
+        length, source = _region_rom_length(image, start, max_size, profile.fill_byte)
+        header = parse_rom_header(image[start + HEADER_START:start + HEADER_END])
+        regions.append({
+            "slot": n,
+            "name": name,
+            "offset": start,
+            "length": length,
+            "length_from": source,
+            "title": header["title"],
+            "ext": ".gbc" if header["cgb_flag"] & 0x80 else ".gb",
+            "builtin": n == 0 and device is not None and _is_builtin_menu(image, device, rom_count, profile),
+        })
+    return rom_count, device, regions
+
+def extract_output_path(image_filepath, region, template=DEFAULT_EXTRACT_TEMPLATE):
+    """Returns the output path of one extracted region, filling {dir}, {stem}, {slot}, {name} and {ext} in the template."""
+    directory = os.path.dirname(os.path.abspath(image_filepath))
+    stem = os.path.splitext(os.path.basename(image_filepath))[0]
+    name = "menu" if region["slot"] == 0 else _safe_filename(region["title"])
+    return template.format(dir=directory, stem=stem, slot=region["slot"], name=name, ext=region["ext"])
+
+def find_cart_images(paths, template=DEFAULT_EXTRACT_TEMPLATE, any_size=False, profile=None):
+    """Expands files and folders into the combined images to extract, skipping earlier outputs. Returns (images, skipped paths)."""
+    profile = _profile(profile)
+    candidates = find_rom_files(paths)
+    output_dirs = set()
+    for path in candidates:
+        output_dir = os.path.abspath(os.path.dirname(extract_output_path(path, {"slot": 0, "title": "", "ext": ""}, template)))
+        if output_dir != os.path.dirname(os.path.abspath(path)):
+            output_dirs.add(os.path.normcase(output_dir) + os.sep)
+    images = []
+    skipped = []
+    for path in candidates:
+        normalized = os.path.normcase(os.path.abspath(path))
+        if any(normalized.startswith(output_dir) for output_dir in output_dirs):
+            continue  # Written by an earlier extract
+        try:
+            right_size = any_size or os.path.getsize(path) == profile.rom_size
+        except OSError:
+            right_size = True  # Let the extract report why it cannot be read
+        (images if right_size else skipped).append(path)
+    return images, skipped
+
+def extract_cart(image_filepath, template=DEFAULT_EXTRACT_TEMPLATE, rom_count=None, include_menu=True, profile=None, sync=None):
+    """Writes the menu and every game of a combined image back out as separate ROM files."""
+    profile = _profile(profile)
+    with metric_span("extract"), open(image_filepath, "rb", buffering=0) as f_in:
+        if os.fstat(f_in.fileno()).st_size < HEADER_END:
+            raise ValueError(f"{os.path.basename(image_filepath)} is too small to be a combined ROM.")
+        with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            rom_count, device, regions = plan_cart_extraction(image, rom_count, profile)
+        if not include_menu:
+            regions = [region for region in regions if region["slot"] != 0]
+        for region in regions:
+            output_filepath = extract_output_path(image_filepath, region, template)
+            output_dir = os.path.dirname(output_filepath)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            with metric_span("extract.slot", slot=region["slot"]), atomic_output(output_filepath, region["length"], sync) as f_out:
+                copied = copy_range(f_in, f_out, 0, length=region["length"], src_offset=region["offset"])
+            metric_count("bytes_read", copied, op="extract")
+            metric_count("bytes_written", copied, op="extract")
+            region["output"] = output_filepath
+    return {"image": image_filepath, "mode": rom_count, "device": device, "roms": regions}
+
+def extract_carts_batch(image_paths, template=DEFAULT_EXTRACT_TEMPLATE, rom_count=None, jobs=None, on_result=None, include_menu=True, profile=None, fsync="batch"):
+    """Extracts many combined images concurrently on a thread pool. Returns (results, seconds)."""
+    profile = _profile(profile)
+    sync = OutputSync(fsync)
+
+    def extract_one(image_filepath):
+        start = time.perf_counter()
         try:
-            # Create a byte array for the final ROM to simplify file writing
-            final_rom_data = bytearray(TOTAL_ROM_SIZE_8MB)
-
-            # Place the Menu File (first 32KB)
-            with open(menu_filepath, "rb") as menu_in:
-                menu_data = menu_in.read()
-                final_rom_data[:len(menu_data)] = menu_data
-            
-            # Place the game files into their respective slots
-            for i, game_filepath in enumerate(self.rom_combiner_game_file_paths):
-                slot = current_slots[i]
-                with open(game_filepath, "rb") as game_in:
-                    game_data = game_in.read()
-                    final_rom_data[slot["start"]:slot["start"] + len(game_data)] = game_data
-            
-            # Write the byte array to the output file
-            with open(output_filepath, "wb") as f_out:
-                f_out.write(final_rom_data)
-
-            messagebox.showinfo("Success", f"Multi-game ROM created successfully at:\n{output_filepath}")
-        
+            result = extract_cart(image_filepath, template, rom_count, include_menu, profile, sync)
+            result["error"] = None
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {e}")
-            
-    # -------------------------------------------------------------------------
-    #                         SAVE SPLITTER/COMBINER GUI
-    # -------------------------------------------------------------------------
-
-    def setup_save_splitter_ui(self, parent_frame):
-        frame = tk.Frame(parent_frame, padx=20, pady=20)
-        frame.pack()
-
-        # Split File Section
-        tk.Label(frame, text="Split a Save File", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
-        
-        split_mode_frame = tk.Frame(frame)
-        split_mode_frame.pack()
-        self.savesplit_split_mode = tk.StringVar(value="4")
-        tk.Radiobutton(split_mode_frame, text="4-Game Split", variable=self.savesplit_split_mode, value="4", command=self.update_split_ui).pack(side=tk.LEFT, padx=10)
-        tk.Radiobutton(split_mode_frame, text="3-Game Split", variable=self.savesplit_split_mode, value="3", command=self.update_split_ui).pack(side=tk.LEFT, padx=10)
-
-        split_frame = tk.Frame(frame)
-        split_frame.pack()
-
-        self.savesplit_name_entries = []
-        default_names = [f"save{i+1}.sav" for i in range(4)]
-        for i in range(4):
-            entry_frame = tk.Frame(split_frame)
-            entry_frame.pack(fill=tk.X, pady=2)
-            tk.Label(entry_frame, text=f"File {i+1} Name:", width=15, anchor='w').pack(side=tk.LEFT)
-            entry = tk.Entry(entry_frame)
-            entry.insert(0, default_names[i])
-            entry.pack(side=tk.LEFT, expand=True, fill=tk.X)
-            self.savesplit_name_entries.append(entry)
-
-        split_button = tk.Button(frame, text="Select File to Split", command=self.split_file, width=30)
-        split_button.pack(pady=10)
-
-        tk.Label(frame, text="-"*40).pack(pady=10)
-        
-        # Combine Files Section
-        tk.Label(frame, text="Combine Save Files", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
-
-        combine_mode_frame = tk.Frame(frame)
-        combine_mode_frame.pack()
-        self.savesplit_mode = tk.StringVar(value="4")
-        tk.Radiobutton(combine_mode_frame, text="4-Save Combine", variable=self.savesplit_mode, value="4", command=self.savesplit_update_ui).pack(side=tk.LEFT, padx=10)
-        tk.Radiobutton(combine_mode_frame, text="3-Save Combine", variable=self.savesplit_mode, value="3", command=self.savesplit_update_ui).pack(side=tk.LEFT, padx=10)
-        
-        self.select_combine_button = tk.Button(frame, text="Select 4 Files to Combine", command=self.select_files_to_combine, width=30)
-        self.select_combine_button.pack(pady=5)
-
-        self.savesplit_listbox = tk.Listbox(frame, selectmode=tk.SINGLE, width=50, height=4)
-        self.savesplit_listbox.pack(pady=5)
-
-        # Re-ordering buttons frame
-        order_frame = tk.Frame(frame)
-        order_frame.pack(pady=5)
-        move_up_button = tk.Button(order_frame, text="Move Up", command=self.savesplit_move_up)
-        move_up_button.pack(side=tk.LEFT, padx=5)
-        move_down_button = tk.Button(order_frame, text="Move Down", command=self.savesplit_move_down)
-        move_down_button.pack(side=tk.LEFT, padx=5)
-
-        combine_button = tk.Button(frame, text="Combine Files", command=self.combine_files, width=30)
-        combine_button.pack(pady=10)
-        
-        self.savesplit_update_ui()
-        self.update_split_ui()
-
-    def update_split_ui(self):
-        # Disable/enable entry fields for 3-game split
-        for i in range(4):
-            state = "normal"
-            if self.savesplit_split_mode.get() == "3" and i == 0:
-                state = "disabled"
-            self.savesplit_name_entries[i].config(state=state)
-            
-    def savesplit_update_ui(self):
-        """Updates the Save Splitter/Combiner UI based on radio button selections."""
-        max_files = 4 if self.savesplit_mode.get() == "4" else 3
-        self.select_combine_button.config(text=f"Select {max_files} Files to Combine")
-        
-        # Clear the listbox if the mode changes and file count doesn't match
-        if len(self.savesplit_file_paths) != max_files:
-            self.savesplit_file_paths = []
-            self.savesplit_update_listbox()
-        
-    def split_file(self):
-        """Splits a save file into individual save files based on selected mode."""
-        filepath = filedialog.askopenfilename(
-            title="Select 128kb file to split",
-            filetypes=[("Save Files", "*.sav"), ("All Files", "*.*")]
-        )
-        if not filepath:
-            return
+            metric_count("errors", op="extract")
+            result = {"image": image_filepath, "mode": None, "device": None, "roms": [], "error": str(e)}
+        result["seconds"] = time.perf_counter() - start
+        return result
 
-        file_size = os.path.getsize(filepath)
-        if file_size != 4 * CHUNK_SIZE_BYTES:
-            messagebox.showerror("Error", "The selected file is not a 128kb file. Cannot split.")
-            return
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(extract_one, path) for path in image_paths]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    sync.flush()
+    return results, time.perf_counter() - start
+
+def repack_output_path(result):
+    """Returns where the re-packed copy of an extracted cart is built: <stem>_repacked<ext> next to its extracted ROMs, never over the original image."""
+    stem, ext = os.path.splitext(os.path.basename(result["image"]))
+    folder = os.path.dirname(result["roms"][0]["output"] if result["roms"] else os.path.abspath(result["image"]))
+    return os.path.join(folder, f"{stem}_repacked{ext}")
+
+def write_extract_manifest(results, manifest_path, sync=None):
+    """Writes a build manifest that re-packs every extracted cart to repack_output_path. Returns the number of carts written."""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    def relative(path):
+        return os.path.relpath(os.path.abspath(path), base_dir).replace(os.sep, "/")
+
+    builds = []
+    for result in sorted(results, key=lambda result: result["image"]):
+        if result["error"]:
+            continue
+        games = [None] * result["mode"]
+        menu = None
+        for region in result["roms"]:
+            if region["slot"] == 0:
+                menu = None if region["builtin"] else relative(region["output"])
+            else:
+                games[region["slot"] - 1] = relative(region["output"])
+        build = {"mode": result["mode"], "games": games, "output": relative(repack_output_path(result))}
+        if result["device"]:
+            build["device"] = result["device"]
+        build["menu"] = menu or "Automatic"
+        builds.append(build)
+    write_json_output(manifest_path, {"builds": builds}, sync, indent=2)
+    return len(builds)
+
+
+# -----------------------------------------------------------------------------
+#                       HEADLESS SAVE SPLIT/COMBINE CORE
+# -----------------------------------------------------------------------------
+
+def split_save(filepath, output_paths, save_count, buffer=None, make_dirs=False, progress=None, profile=None, verify=False, sync=None):
+    """Splits a full SRAM save into one file per bank (skipping the first banks for fewer saves). Returns the number of files written."""
+    profile = _profile(profile)
+    first_bank = profile.first_bank(save_count)
+    save_size = profile.save_size
+    file_size = os.path.getsize(filepath)
+    if file_size != save_size:
+        raise ValueError(f"{os.path.basename(filepath)} is not a {format_size(save_size)} file ({file_size/1024:.2f}KB). Cannot split.")
+
+    with metric_span("split"):
+        if buffer is None or len(buffer) < save_size:
+            buffer = bytearray(save_size)
+        view = memoryview(buffer)
+        with metric_span("split.read"), open(filepath, "rb", buffering=0) as f_in:
+            size = 0
+            while size < save_size:
+                count = f_in.readinto(view[size:save_size])
+                if not count:
+                    raise ValueError(f"{os.path.basename(filepath)} was shorter than expected while reading.")
+                size += count
+        metric_count("bytes_read", save_size, op="split")
+
+        file_digest = StreamDigest() if verify else None
+        bank_digests = {}
+        if verify:
+            file_digest.update(view[:profile.bank_offsets[first_bank]])
+        with atomic_outputs(profile.sram_bank_size, sync) as open_output:
+            for written, bank in enumerate(range(first_bank, profile.sram_bank_count), start=1):
+                output_dir = os.path.dirname(output_paths[bank])
+                if make_dirs and output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                offset = profile.bank_offsets[bank]
+                data = view[offset:offset + profile.sram_bank_size]
+                with metric_span("split.bank", bank=bank + 1), open_output(output_paths[bank]) as f_out:
+                    _write_all(f_out, data)
+                metric_count("bytes_written", len(data), op="split")
+                if verify:
+                    file_digest.update(data)
+                    bank_digests[bank] = digest = StreamDigest()
+                    digest.update(data)
+                if progress:
+                    progress(written, save_count)
+
+        if verify:
+            with metric_span("split.verify"):
+                actual = {bank: read_back_digests(output_paths[bank], [])[0] for bank in bank_digests}
+            metric_count("bytes_read", len(bank_digests) * profile.sram_bank_size, op="split")
+            names = {bank: os.path.basename(output_paths[bank]) for bank in bank_digests}
+            _check_read_back(filepath, bank_digests, actual, names)
+            regions = [{"name": f"Bank {bank+1}", "offset": profile.bank_offsets[bank], "output": os.path.abspath(output_paths[bank]),
+                        **bank_digests[bank].to_dict()} for bank in sorted(bank_digests)]
+            write_verify_manifest(filepath, "split", file_digest, regions, sync)
+        return save_count
+
+def find_save_files(patterns):
+    """Expands folders (their .sav files), glob patterns and plain paths into a sorted list of save files."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found.update(glob.glob(os.path.join(pattern, "*.sav")))
+        elif glob.has_magic(pattern):
+            found.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        else:
+            found.add(pattern)
+    return sorted(found)
+
+def split_output_paths(filepath, template=DEFAULT_SPLIT_TEMPLATE, profile=None):
+    """Returns one output path per SRAM bank for a save, filling {dir}, {stem} and {n} (1-4 on the default profile) in the template."""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return [template.format(dir=directory, stem=stem, n=n) for n in range(1, _profile(profile).sram_bank_count + 1)]
 
+def split_saves_batch(save_paths, template=DEFAULT_SPLIT_TEMPLATE, save_count=4, jobs=None, on_result=None, store=None, profile=None, verify=False, fsync="batch"):
+    """Splits many full SRAM saves concurrently on a thread pool, each thread reusing one read buffer. Returns (results, seconds)."""
+    profile = _profile(profile)
+    sync = OutputSync(fsync)
+    first_bank = profile.first_bank(save_count)
+    local = threading.local()
+
+    def split_one(filepath):
+        if not hasattr(local, "buffer"):
+            local.buffer = bytearray(profile.save_size)
+        output_paths = split_output_paths(filepath, template, profile)
         try:
-            output_dir = os.path.dirname(filepath)
-            output_names = [entry.get() for entry in self.savesplit_name_entries]
-            
-            start_index = 0
-            file_count = 4
-            if self.savesplit_split_mode.get() == "3":
-                start_index = 1
-                file_count = 3
-            
-            with open(filepath, "rb") as f_in:
-                save_data = f_in.read()
-            
-            for i in range(file_count):
-                data_index = i + start_index
-                start_byte = data_index * CHUNK_SIZE_BYTES
-                end_byte = start_byte + CHUNK_SIZE_BYTES
-                data = save_data[start_byte:end_byte]
-                
-                filename = output_names[data_index]
-                if not filename:
-                    filename = f"save{data_index+1}.sav"
-                
-                part_filepath = os.path.join(output_dir, filename)
-                with open(part_filepath, "wb") as f_out:
-                    f_out.write(data)
-
-            messagebox.showinfo("Success", f"File split successfully into {file_count} files using the names provided.")
+            split_save(filepath, output_paths, save_count, local.buffer, make_dirs=True, profile=profile, verify=verify, sync=sync)
+            if store is not None:
+                for path in output_paths[first_bank:]:
+                    store.backup(path, sync=sync)
+            return {"input": filepath, "outputs": output_paths[first_bank:], "error": None}
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {e}")
-
-    def select_files_to_combine(self):
-        """Opens a file dialog to select files for combining and updates the listbox."""
-        max_files = 4 if self.savesplit_mode.get() == "4" else 3
-        file_paths = filedialog.askopenfilenames(
-            title=f"Select the {max_files} save files to combine",
-            filetypes=[("Save Files", "*.sav"), ("All Files", "*.*")]
-        )
-        if len(file_paths) != max_files:
-            messagebox.showerror("Error", f"You must select exactly {max_files} files to combine.")
+            metric_count("errors", op="split")
+            return {"input": filepath, "outputs": [], "error": str(e)}
+
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for result in pool.map(split_one, save_paths):
+            results.append(result)
+            if on_result:
+                on_result(result)
+    sync.flush()
+    return results, time.perf_counter() - start
+
+def combine_saves(save_paths, output_filepath, save_count, progress=None, profile=None, verify=False, sync=None):
+    """Combines one save file per SRAM bank into one full save, padding short files with zeros. Returns how many files were padded."""
+    profile = _profile(profile)
+    try:
+        first_bank = profile.first_bank(save_count)
+    except ValueError:
+        raise ValueError(f"Unsupported save combine mode: {save_count}. Expected 1 to {profile.sram_bank_count} saves.") from None
+    if len(save_paths) != save_count:
+        raise ValueError(f"Please select exactly {save_count} files before combining.")
+
+    sizes = []
+    for filepath in save_paths:
+        try:
+            file_size = os.path.getsize(filepath)
+        except OSError:
+            raise ValueError(f"Could not access save file: {os.path.basename(filepath)}.")
+        if file_size > profile.sram_bank_size:
+            raise ValueError(f"{os.path.basename(filepath)} is {file_size/1024:.2f}KB, which is larger than the {format_size(profile.sram_bank_size)} limit.")
+        sizes.append(file_size)
+
+    with metric_span("combine"):
+        if verify:
+            _remove_quietly(verify_manifest_path(output_filepath))
+        digests = {}
+        padded_files_count = 0
+        with atomic_output(output_filepath, profile.save_size, sync) as f_out:
+            for i, (filepath, file_size) in enumerate(zip(save_paths, sizes)):
+                offset = profile.bank_offsets[first_bank + i]
+                digest = None
+                if verify:
+                    digests[offset] = digest = StreamDigest()
+                with metric_span("combine.bank", bank=first_bank + i + 1), open(filepath, "rb", buffering=0) as f_in:
+                    copied = copy_range(f_in, f_out, offset, digest=digest)
+                metric_count("bytes_read", copied, op="combine")
+                metric_count("bytes_written", copied, op="combine")
+                if file_size < profile.sram_bank_size:
+                    padded_files_count += 1
+                if progress:
+                    progress(i + 1, save_count)
+            f_out.truncate(profile.save_size)
+
+        if verify:
+            with metric_span("combine.verify"):
+                file_digest, actual = read_back_digests(output_filepath, [(offset, digest.length) for offset, digest in digests.items()])
+            metric_count("bytes_read", profile.save_size, op="combine")
+            names = {offset: f"Bank {offset // profile.sram_bank_size + 1}" for offset in digests}
+            _check_read_back(output_filepath, digests, actual, names)
+            regions = [{"name": names[offset], "offset": offset, "source": os.path.abspath(path), **digests[offset].to_dict()}
+                       for offset, path in zip(sorted(digests), save_paths)]
+            write_verify_manifest(output_filepath, "save", file_digest, regions, sync)
+        return padded_files_count
+
+def load_combine_manifest(manifest_path):
+    """Reads a JSON combine manifest and returns its combine specs with paths made relative to the manifest absolute."""
+    entries, resolve = _read_manifest(manifest_path, "combines")
+    combines = []
+    for i, entry in enumerate(entries):
+        if "output" not in entry:
+            raise ValueError(f"Combine {i+1} in {os.path.basename(manifest_path)} has no output path.")
+        combines.append({
+            "mode": int(entry.get("mode", 4)),
+            "saves": [resolve(path) for path in entry.get("saves", [])],
+            "output": resolve(entry["output"]),
+        })
+    return combines
+
+def run_combine(combine, store=None, profile=None, verify=False, sync=None):
+    """Runs a single combine spec and returns a result dict with its timing. Never raises."""
+    start = time.perf_counter()
+    error = None
+    padded = 0
+    try:
+        output_dir = os.path.dirname(combine["output"])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        padded = combine_saves(combine["saves"], combine["output"], combine["mode"], profile=profile, verify=verify, sync=sync)
+        if store is not None:
+            store.backup(combine["output"], sync=sync)
+    except Exception as e:
+        error = str(e)
+        metric_count("errors", op="combine")
+    return {"output": combine["output"], "seconds": time.perf_counter() - start, "error": error, "padded": padded}
+
+def combine_saves_batch(combines, jobs=None, on_result=None, store=None, profile=None, verify=False, fsync="batch"):
+    """Runs many combine specs on a thread pool and calls on_result(result) as each one finishes. Returns (results, seconds)."""
+    sync = OutputSync(fsync)
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_combine, combine, store, profile, verify, sync) for combine in combines]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    sync.flush()
+    return results, time.perf_counter() - start
+
+# --- Save Archive ---
+
+def save_archive_name(filepath):
+    """Returns the name a save is archived under by default: its file stem plus a short hash of its absolute path."""
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    path_hash = hashlib.sha256(os.path.normcase(os.path.abspath(filepath)).encode("utf-8")).hexdigest()
+    return f"{stem}-{path_hash[:8]}"
+
+class SaveStore:
+    """Deduplicating archive of save files: shared blocks under blocks/, and per-backup delta manifests under saves/<name>/."""
+
+    def __init__(self, root, block_size=SAVE_BLOCK_SIZE):
+        self.root = os.path.abspath(root)
+        self.block_size = block_size
+        self._manifest_lock = threading.Lock()
+
+    def _block_path(self, digest):
+        return os.path.join(self.root, "blocks", digest[:2], digest)
+
+    def _save_dir(self, name):
+        return os.path.join(self.root, "saves", name)
+
+    def _read_manifest(self, name, backup_id):
+        with open(os.path.join(self._save_dir(name), backup_id + ".json"), "r", encoding="utf-8") as f_in:
+            return json.load(f_in)
+
+    def _write_block(self, digest, data, sync=None):
+        path = self._block_path(digest)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_output(path, sync=sync) as f_out:
+            _write_all(f_out, data)
+        return True
+
+    def names(self):
+        """Returns the names of all archived saves."""
+        saves_dir = os.path.join(self.root, "saves")
+        return sorted(os.listdir(saves_dir)) if os.path.isdir(saves_dir) else []
+
+    def history(self, name):
+        """Returns the backup ids recorded for a save, oldest first."""
+        save_dir = self._save_dir(name)
+        if not os.path.isdir(save_dir):
+            return []
+        return sorted(entry[:-5] for entry in os.listdir(save_dir) if entry.endswith(".json"))
+
+    def block_list(self, name, backup_id):
+        """Returns (size, [block hash per block]) for a backup, resolving its delta chain."""
+        chain = []
+        while backup_id is not None:
+            manifest = self._read_manifest(name, backup_id)
+            chain.append(manifest)
+            backup_id = manifest["parent"]
+
+        blocks = []
+        for manifest in reversed(chain):
+            size = manifest["size"]
+            block_count = -(-size // manifest["block_size"])
+            blocks = (blocks + [None] * block_count)[:block_count]
+            for index, digest in manifest["blocks"].items():
+                blocks[int(index)] = digest
+        return size, blocks
+
+    def backup(self, filepath, name=None, sync=None):
+        """Archives a save file under name (default: save_archive_name) and returns its backup id, reusing the last one if nothing changed."""
+        if name is None:
+            name = save_archive_name(filepath)
+        with open(filepath, "rb") as f_in:
+            data = f_in.read()
+
+        view = memoryview(data)
+        digests = []
+        for offset in range(0, len(data), self.block_size):
+            block = view[offset:offset + self.block_size]
+            digest = hashlib.sha256(block).hexdigest()
+            self._write_block(digest, block, sync)
+            digests.append(digest)
+
+        with self._manifest_lock:
+            return self._record_backup(filepath, name, len(data), digests, sync)
+
+    def _record_backup(self, filepath, name, size, digests, sync):
+        history = self.history(name)
+        parent = history[-1] if history else None
+        depth = 0
+        changed = dict(enumerate(digests))
+        if parent is not None:
+            parent_size, parent_blocks = self.block_list(name, parent)
+            depth = self._read_manifest(name, parent).get("depth", 0) + 1
+            if parent_size == size and parent_blocks == digests:
+                return parent
+            if depth < FULL_MANIFEST_INTERVAL:
+                changed = {index: digest for index, digest in enumerate(digests)
+                           if index >= len(parent_blocks) or parent_blocks[index] != digest}
+            else:
+                depth = 0
+        if depth == 0:
+            parent = None
+
+        backup_id = f"{time.time_ns():020d}"
+        manifest = {
+            "parent": parent,
+            "depth": depth,
+            "size": size,
+            "block_size": self.block_size,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "source": os.path.abspath(filepath),
+            "blocks": {str(index): digest for index, digest in changed.items()},
+        }
+        save_dir = self._save_dir(name)
+        os.makedirs(save_dir, exist_ok=True)
+        write_json_output(os.path.join(save_dir, backup_id + ".json"), manifest, sync, separators=(",", ":"))
+        return backup_id
+
+    def restore(self, name, backup_id, output_filepath, sync=None):
+        """Rebuilds an archived save (the latest one if backup_id is None) into output_filepath, written atomically."""
+        if backup_id is None:
+            history = self.history(name)
+            if not history:
+                raise ValueError(f"There are no backups of {name} in the archive.")
+            backup_id = history[-1]
+        size, blocks = self.block_list(name, backup_id)
+        with atomic_output(output_filepath, size, sync) as f_out:
+            for digest in blocks:
+                with open(self._block_path(digest), "rb", buffering=0) as f_in:
+                    _write_all(f_out, memoryview(f_in.read()))
+            f_out.truncate(size)
+        return backup_id
+
+# -----------------------------------------------------------------------------
+#                                WATCH MODE
+# -----------------------------------------------------------------------------
+
+class InotifyWatcher:
+    """Reports files changed in a set of folders using Linux inotify through ctypes. Raises OSError if inotify is not available."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        import select
+        self._select = select
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this system.")
+        self._libc = libc
+        self._ctypes = ctypes
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+
+    def add_directory(self, path):
+        path = os.path.abspath(path)
+        if path in self.directories.values():
             return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), INOTIFY_MASK)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), f"Could not watch {path}")
+        self.directories[wd] = path
+
+    def read(self, timeout):
+        """Waits up to timeout seconds and returns the set of changed paths, or None if events were lost (the queue overflowed)."""
+        if not self._select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        header = struct.Struct("iIII")
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = header.unpack_from(data, offset)
+                name = data[offset + header.size:offset + header.size + length].rstrip(b"\0")
+                offset += header.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                if wd in self.directories and name:
+                    changed.add(os.path.join(self.directories[wd], os.fsdecode(name)))
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Reports files changed in a set of folders by comparing their sizes and mtimes every interval. Used where inotify is not available."""
 
-        self.savesplit_file_paths = list(file_paths)
-        self.savesplit_update_listbox()
+    def __init__(self, interval=WATCH_POLL_INTERVAL):
+        self.interval = interval
+        self.snapshots = {}
+        self._next_scan = time.monotonic() + interval
 
-    def savesplit_move_up(self):
-        """Moves the selected file up in the list."""
+    def _scan(self, path):
+        snapshot = {}
         try:
-            selected_index = self.savesplit_listbox.curselection()[0]
-            if selected_index > 0:
-                self.savesplit_file_paths[selected_index], self.savesplit_file_paths[selected_index - 1] = self.savesplit_file_paths[selected_index - 1], self.savesplit_file_paths[selected_index]
-                self.savesplit_update_listbox()
-        except IndexError:
+            for entry in os.scandir(path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
             pass
+        return snapshot
+
+    def add_directory(self, path):
+        path = os.path.abspath(path)
+        if path not in self.snapshots:
+            self.snapshots[path] = self._scan(path)
+
+    def read(self, timeout):
+        """Waits up to timeout seconds and returns the set of paths that changed since the last scan."""
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0, wait))
+        self._next_scan = time.monotonic() + self.interval
+        changed = set()
+        for path, old in self.snapshots.items():
+            new = self._scan(path)
+            changed.update(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
+            self.snapshots[path] = new
+        return changed
+
+    def close(self):
+        pass
 
-    def savesplit_move_down(self):
-        """Moves the selected file down in the list."""
+def open_watcher(poll_interval=None):
+    """Returns an InotifyWatcher, or a PollingWatcher when poll_interval is given or inotify is not available."""
+    if poll_interval is None:
         try:
-            selected_index = self.savesplit_listbox.curselection()[0]
-            if selected_index < len(self.savesplit_file_paths) - 1:
-                self.savesplit_file_paths[selected_index], self.savesplit_file_paths[selected_index + 1] = self.savesplit_file_paths[selected_index + 1], self.savesplit_file_paths[selected_index]
-                self.savesplit_update_listbox()
-        except IndexError:
-            pass
+            return InotifyWatcher()
+        except (OSError, AttributeError, TypeError):  # Not Linux, or no usable libc
+            poll_interval = WATCH_POLL_INTERVAL
+    return PollingWatcher(poll_interval)
 
-    def savesplit_update_listbox(self):
-        """Refreshes the listbox with the current file order."""
-        self.savesplit_listbox.delete(0, tk.END)
-        for i, path in enumerate(self.savesplit_file_paths):
-            self.savesplit_listbox.insert(tk.END, f"{i+1}: {os.path.basename(path)}")
-        if self.savesplit_file_paths:
-            self.savesplit_listbox.select_set(0)
-
-    def combine_files(self):
-        """Combines the files based on the selected mode, padding smaller files to 32kb."""
-        max_files = 4 if self.savesplit_mode.get() == "4" else 3
-        if len(self.savesplit_file_paths) != max_files:
-            messagebox.showerror("Error", f"Please select exactly {max_files} files before combining.")
-            return
+def _output_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
 
-        output_filepath = filedialog.asksaveasfilename(
-            defaultextension=".sav",
-            title="Save the combined 128kb file",
-            filetypes=[("Save Files", "*.sav")]
-        )
-        if not output_filepath:
-            return
+def load_watch_jobs(manifest_path):
+    """Reads the builds and combines of one manifest as watch jobs, keyed by "build:<output>" or "combine:<output>"."""
+    with open(manifest_path, "r", encoding="utf-8") as f_in:
+        manifest = json.load(f_in)
+    jobs = {}
+    for build in load_build_manifest(manifest_path):
+        inputs = [path for path in build["games"] if path] + ([build["menu"]] if build["menu"] else [])
+        jobs["build:" + build["output"]] = {"kind": "build", "spec": build, "inputs": inputs}
+    if isinstance(manifest, dict):
+        for combine in load_combine_manifest(manifest_path):
+            jobs["combine:" + combine["output"]] = {"kind": "combine", "spec": combine, "inputs": list(combine["saves"])}
+    return jobs
+
+class CartWatcher:
+    """Keeps the carts and saves of build and combine manifests up to date, redoing only the jobs whose inputs changed."""
+
+    def __init__(self, manifest_paths, state_path=None, jobs=None, queue_size=None, debounce=WATCH_DEBOUNCE, cache=None,
+                 checksums=None, verify=False, fsync="file", profile=None, watcher=None, log=None):
+        self.manifest_paths = [os.path.abspath(path) for path in manifest_paths]
+        self.state_path = state_path or os.path.splitext(self.manifest_paths[0])[0] + WATCH_STATE_SUFFIX
+        self.job_count = jobs or min(4, os.cpu_count() or 1)
+        self.queue_size = queue_size or 2 * self.job_count
+        self.debounce = debounce
+        self.cache = cache
+        self.checksums = checksums
+        self.verify = verify
+        self.sync = OutputSync(fsync)
+        self.profile = _profile(profile)
+        self.watcher = watcher
+        self.log = log or (lambda message: None)
+        self.jobs = {}
+        self.dependents = {}
+        self.state = self._load_state()
+        self.active = set()
+        self.rerun = set()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._finished = queue.Queue()
+        self._pool = None
 
+    def _load_state(self):
         try:
-            padded_files_count = 0
-            with open(output_filepath, "wb") as f_out:
-                # Add padding for 3-file mode
-                if self.savesplit_mode.get() == "3":
-                    f_out.write(b'\x00' * CHUNK_SIZE_BYTES)
-
-                for filepath in self.savesplit_file_paths:
-                    file_size = os.path.getsize(filepath)
-                    with open(filepath, "rb") as f_in:
-                        data = f_in.read()
-
-                    if file_size < CHUNK_SIZE_BYTES:
-                        padding_needed = CHUNK_SIZE_BYTES - file_size
-                        data += b'\x00' * padding_needed
-                        padded_files_count += 1
-                        
-                    f_out.write(data)
-            
-            success_message = f"Files combined successfully into {os.path.basename(output_filepath)}"
-            if padded_files_count > 0:
-                success_message += f"\n{padded_files_count} file(s) were padded to 32kb."
-            
-            messagebox.showinfo("Success", success_message)
+            with open(self.state_path, "r", encoding="utf-8") as f_in:
+                state = json.load(f_in)
+        except (OSError, ValueError):
+            return {}
+        return state.get("jobs", {}) if state.get("version") == WATCH_STATE_VERSION else {}
+
+    def save_state(self):
+        with self._lock:
+            data = json.dumps({"version": WATCH_STATE_VERSION, "jobs": self.state}, indent=2).encode("utf-8")
+        with atomic_output(self.state_path, sync=OutputSync("none")) as f_out:
+            _write_all(f_out, memoryview(data))
+
+    def load_manifests(self):
+        """(Re)reads every manifest and rebuilds the input-to-job map. Returns the job keys."""
+        jobs = {}
+        for manifest_path in self.manifest_paths:
+            jobs.update(load_watch_jobs(manifest_path))
+        dependents = {}
+        for key, job in jobs.items():
+            job["spec_hash"] = hashlib.sha256(json.dumps(
+                {"spec": job["spec"], "checksums": self.checksums, "verify": self.verify, "profile": self.profile.name},
+                sort_keys=True).encode("utf-8")).hexdigest()
+            for path in job["inputs"]:
+                dependents.setdefault(os.path.abspath(path), set()).add(key)
+        self.jobs, self.dependents = jobs, dependents
+        with self._lock:
+            self.state = {key: entry for key, entry in self.state.items() if key in jobs}
+        if self.watcher is not None:
+            for path in set(self.dependents) | set(self.manifest_paths):
+                self.watcher.add_directory(os.path.dirname(path))
+        return set(jobs)
+
+    def _changed_slots(self, job, previous, digests, output_stat):
+        """Returns the slot indexes to rewrite in place, or None if the image has to be rebuilt."""
+        spec = job["spec"]
+        if (previous is None or self.checksums or self.verify or output_stat is None or output_stat != previous["output"]
+                or previous["spec"] != job["spec_hash"] or set(previous["inputs"]) != set(digests)):
+            return None
+        if self.cache is not None and self.cache.link_mode == "hardlink":
+            return None  # A hardlinked image is copied before any patch, so a rebuild (often a cache hit) is no slower
+        changed = {path for path, digest in digests.items() if previous["inputs"][path] != digest}
+        if spec["menu"] in changed:
+            return None
+        return [i for i, path in enumerate(spec["games"]) if path in changed]
+
+    def run_job(self, key, job):
+        """Brings one job's output up to date. Never raises; returns a result dict with the action taken."""
+        spec = job["spec"]
+        start = time.perf_counter()
+        action = "unchanged"
+        error = None
+        slots = None
+        try:
+            with metric_span("watch.job", kind=job["kind"]):
+                digests = {path: hash_file(path) for path in job["inputs"]}
+                output_stat = _output_stat(spec["output"])
+                with self._lock:
+                    previous = self.state.get(key)
+                if (previous is not None and previous["spec"] == job["spec_hash"] and previous["inputs"] == digests
+                        and output_stat is not None and output_stat == previous["output"]):
+                    metric_count("watch_skipped", kind=job["kind"])
+                else:
+                    output_dir = os.path.dirname(spec["output"])
+                    if output_dir:
+                        os.makedirs(output_dir, exist_ok=True)
+                    if job["kind"] == "combine":
+                        combine_saves(spec["saves"], spec["output"], spec["mode"], profile=self.profile, verify=self.verify, sync=self.sync)
+                        action = "combined"
+                    else:
+                        slots = self._changed_slots(job, previous, digests, output_stat)
+                        if slots is not None:
+                            for slot_index in slots:
+                                update_rom_slot(spec["output"], spec["mode"], slot_index, spec["games"][slot_index], profile=self.profile)
+                            action = "updated"
+                        else:
+                            menu = resolve_menu(spec["device"], spec["mode"], spec["menu"], self.profile)
+                            build_rom(menu, spec["games"], spec["mode"], spec["output"], cache=self.cache, profile=self.profile,
+                                      checksums=self.checksums, verify=self.verify, sync=self.sync)
+                            action = "built"
+                    with self._lock:
+                        self.state[key] = {"spec": job["spec_hash"], "inputs": digests, "output": _output_stat(spec["output"])}
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {e}")
+            action = "failed"
+            error = str(e)
+            metric_count("errors", op="watch")
+        return {"key": key, "output": spec["output"], "action": action, "slots": slots, "error": error,
+                "seconds": time.perf_counter() - start}
 
-if __name__ == "__main__":
+    def _job_done(self, key, future):
+        self._slots.release()
+        self._finished.put((key, future.result()))
+
+    def schedule(self, keys):
+        """Queues the given jobs. Blocks while queue_size jobs are already queued or running."""
+        for key in sorted(keys):
+            if key in self.active:
+                self.rerun.add(key)
+                continue
+            job = self.jobs.get(key)
+            if job is None:
+                continue
+            while not self._slots.acquire(timeout=0.1):
+                self.collect()  # Keep handling finished jobs while waiting for room
+            self.active.add(key)
+            future = self._pool.submit(self.run_job, key, job)
+            future.add_done_callback(lambda future, key=key: self._job_done(key, future))
+
+    def collect(self):
+        """Handles finished jobs: logs them and queues the ones that changed again. Flushes outputs, the state and metrics once idle."""
+        handled = False
+        while True:
+            try:
+                key, result = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            handled = True
+            self.active.discard(key)
+            if result["action"] == "failed":
+                self.log(f"[FAIL] {result['output']}: {result['error']}")
+            elif result["action"] == "updated":
+                slots = ", ".join(str(slot_index + 1) for slot_index in result["slots"])
+                self.log(f"[ OK ] {result['output']} (slot {slots} updated in {result['seconds']:.3f}s)")
+            elif result["action"] != "unchanged":
+                self.log(f"[ OK ] {result['output']} ({result['action']} in {result['seconds']:.3f}s)")
+            if key in self.rerun:
+                self.rerun.discard(key)
+                self.schedule([key])
+        if handled and not self.active:
+            self.sync.flush()
+            self.save_state()
+            metrics = get_metrics()
+            if metrics is not None:
+                metrics.flush()
+
+    def wait_idle(self):
+        while self.active:
+            time.sleep(0.01)
+            self.collect()
+
+    def affected_jobs(self, changed):
+        """Returns the jobs to look at for a set of changed paths (None means anything may have changed), reloading manifests if one changed."""
+        if changed is None or any(path in self.manifest_paths for path in changed):
+            try:
+                keys = self.load_manifests()
+                self.log(f"Loaded {len(keys)} job(s) from {len(self.manifest_paths)} manifest(s)")
+            except (OSError, ValueError) as e:
+                self.log(f"[FAIL] Could not reload the manifests, keeping the previous jobs: {e}")
+                keys = set(self.jobs)
+            return keys
+        keys = set()
+        for path in changed:
+            keys |= self.dependents.get(path, set())
+        return keys
+
+    def run(self, stop=None, once=False):
+        """Brings every job up to date, then (unless once) watches for changes until stop (a threading.Event) is set or Ctrl+C."""
+        stop = stop or threading.Event()
+        if self.watcher is None and not once:
+            self.watcher = open_watcher()
+        with ThreadPoolExecutor(max_workers=self.job_count) as self._pool:
+            try:
+                self.schedule(self.affected_jobs(None))
+                self.wait_idle()
+                if once:
+                    return
+                self.log(f"Watching {len(self.dependents)} input(s) with {type(self.watcher).__name__}")
+                pending = set()
+                last_event = 0.0
+                while not stop.is_set():
+                    changed = self.watcher.read(0.1 if pending or self.active else 0.5)
+                    if changed is None or changed & (self.dependents.keys() | set(self.manifest_paths)):
+                        metric_count("watch_events")
+                        pending = None if changed is None or pending is None else pending | changed
+                        last_event = time.monotonic()
+                    self.collect()
+                    if (pending is None or pending) and time.monotonic() - last_event >= self.debounce:
+                        keys = self.affected_jobs(pending)
+                        pending = set()
+                        self.schedule(keys)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.wait_idle()
+                self.sync.flush()
+                self.save_state()
+                if self.watcher is not None:
+                    self.watcher.close()
+
+
+# -----------------------------------------------------------------------------
+#                               COMMAND LINE
+# -----------------------------------------------------------------------------
+
+def cli_build(args):
+    """Builds every cart in a manifest and prints per-build timings."""
+    builds = load_build_manifest(args.manifest)
+    print(f"Building {len(builds)} cart(s) from {args.manifest}")
+
+    cache = None
+    if args.cache_dir:
+        cache = RomBuildCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024, link_mode=args.cache_link)
+
+    def report(result):
+        if result["error"]:
+            print(f"[FAIL] {result['output']} ({result['seconds']:.3f}s): {result['error']}")
+        else:
+            print(f"[ OK ] {result['output']} ({result['seconds']:.3f}s{', cached' if result['cached'] else ''}{', verified' if result['manifest'] else ''})")
+            for warning in result["warnings"]:
+                print(f"       Warning: {warning}")
+            if result["checksums"]:
+                for line in checksum_report_lines(result["checksums"], problems_only=True):
+                    print(f"       Checksum: {line}")
+
+    start = time.perf_counter()
+    results = run_build_batch(builds, jobs=args.jobs, on_result=report, cache=cache, checksums=args.checksums, verify=args.verify, fsync=args.fsync)
+    failed = sum(1 for result in results if result["error"])
+    print(f"{len(results) - failed} built, {failed} failed in {time.perf_counter() - start:.3f}s")
+    if cache is not None:
+        # Each worker process keeps its own counters, so total them from the results
+        hits = sum(1 for result in results if result["cached"])
+        print(f"Cache: {hits} hit(s), {len(results) - failed - hits} miss(es)")
+    return 1 if failed else 0
+
+def cli_plan(args):
+    """Packs a catalogue of ROMs into as few carts as possible and writes a build manifest for them."""
+    profile = get_active_profile()
+    unknown = [rom_count for rom_count in args.modes or () if rom_count not in profile.rom_counts]
+    if unknown:
+        print(f"Unsupported cart layout: {unknown[0]}. Expected {' or '.join(str(count) for count in profile.rom_counts)}.")
+        return 2
+    games = []
+    for path in find_rom_files(args.paths):
+        try:
+            games.append((os.path.abspath(path), os.path.getsize(path)))
+        except OSError:
+            print(f"Skipping {path}: file not found or inaccessible.")
+
+    start = time.perf_counter()
+    carts, unplaced = plan_carts(games, rom_counts=args.modes)
+    rom_counts = args.modes or profile.rom_counts
+    elapsed = time.perf_counter() - start
+
+    extension = ".gb" if args.device == "Gameboy" else ".gbc"
+    builds = [{"device": args.device, "mode": cart["mode"], "menu": "Automatic", "games": cart["games"],
+               "output": os.path.join(args.out_dir, f"cart_{i+1:03d}{extension}")}
+              for i, cart in enumerate(carts)]
+    write_json_output(args.output, {"builds": builds}, indent=2)
+
+    for rom_count in sorted(set(rom_counts), reverse=True):
+        print(f"{sum(1 for cart in carts if cart['mode'] == rom_count)} x {rom_count}-game cart(s)")
+    print(f"{len(games) - len(unplaced)} game(s) packed into {len(carts)} cart(s) in {elapsed:.3f}s. Manifest written to {args.output}")
+    for path, size in unplaced:
+        print(f"Too large for any slot: {path} ({size/1024/1024:.2f}MB)")
+    return 1 if unplaced else 0
+
+def cli_index(args):
+    """Builds or refreshes a ROM header index and optionally lists it."""
+    index = RomIndex(args.index)
+    start = time.perf_counter()
+    scanned, updated, removed = index.update(args.paths, jobs=args.jobs)
+    index.save()
+    print(f"Indexed {scanned} ROM(s) in {time.perf_counter() - start:.3f}s: {updated} read, {removed} removed. Index: {args.index}")
+
+    if args.list:
+        for path in sorted(index.entries):
+            header = index.get_header(path)
+            device = "GBC only" if header["cgb_flag"] == CGB_ONLY else "GBC" if header["cgb_flag"] & 0x80 else "GB"
+            checksum = "ok" if header["header_checksum_ok"] else "BAD"
+            print(f"{header['title']:<16} {device:<8} type=0x{header['cart_type']:02X} rom=0x{header['rom_size_code']:02X} "
+                  f"ram=0x{header['ram_size_code']:02X} header={checksum} global=0x{header['global_checksum']:04X}  {path}")
+    return 0
+
+def cli_split(args):
+    """Splits every matching full SRAM save concurrently and reports throughput."""
+    profile = get_active_profile()
+    if args.mode not in profile.save_counts:
+        print(f"Unsupported split mode: {args.mode}. Expected {' or '.join(str(count) for count in profile.save_counts)}.")
+        return 2
+    save_paths = find_save_files(args.paths)
+    # With a template that writes next to the inputs, earlier outputs would be picked up as saves
+    outputs = {os.path.normcase(os.path.abspath(path)) for save_path in save_paths for path in split_output_paths(save_path, args.template)}
+    save_paths = [path for path in save_paths if os.path.normcase(os.path.abspath(path)) not in outputs]
+    print(f"Splitting {len(save_paths)} save(s)")
+
+    def report(result):
+        if result["error"]:
+            print(f"[SKIP] {result['input']}: {result['error']}")
+
+    store = SaveStore(args.archive) if args.archive else None
+    results, seconds = split_saves_batch(save_paths, args.template, args.mode, jobs=args.jobs, on_result=report, store=store, verify=args.verify, fsync=args.fsync)
+    split = sum(1 for result in results if not result["error"])
+    megabytes = split * profile.save_size / 1024 / 1024
+    print(f"{split} split, {len(results) - split} flagged in {seconds:.3f}s ({megabytes / seconds if seconds else 0:.1f} MB/s)")
+    return 1 if split < len(results) else 0
+
+def cli_combine(args):
+    """Combines every save set in a manifest and prints per-file timings."""
+    combines = load_combine_manifest(args.manifest)
+    print(f"Combining {len(combines)} save set(s) from {args.manifest}")
+
+    def report(result):
+        if result["error"]:
+            print(f"[FAIL] {result['output']} ({result['seconds']:.3f}s): {result['error']}")
+        else:
+            padded = f", {result['padded']} padded" if result["padded"] else ""
+            verified = ", verified" if args.verify else ""
+            print(f"[ OK ] {result['output']} ({result['seconds']:.3f}s{padded}{verified})")
+
+    store = SaveStore(args.archive) if args.archive else None
+    results, seconds = combine_saves_batch(combines, jobs=args.jobs, on_result=report, store=store, verify=args.verify, fsync=args.fsync)
+    failed = sum(1 for result in results if result["error"])
+    print(f"{len(results) - failed} combined, {failed} failed in {seconds:.3f}s")
+    return 1 if failed else 0
+
+def cli_archive(args):
+    """Backs up, lists or restores saves in a deduplicating save archive."""
+    store = SaveStore(args.archive, block_size=args.block_size)
+    names = store.names()
+
+    def archived_name(name_or_path):
+        # Saves can also be named by the path they were backed up from
+        return name_or_path if name_or_path in names else save_archive_name(name_or_path)
+
+    if args.action == "backup":
+        for path in find_save_files(args.paths):
+            backup_id = store.backup(path)
+            print(f"{path}: {save_archive_name(path)} {backup_id}")
+    elif args.action == "list":
+        for name in map(archived_name, args.paths) if args.paths else names:
+            history = store.history(name)
+            print(f"{name}: {len(history)} backup(s)")
+            for backup_id in history:
+                print(f"    {backup_id}")
+    else:
+        if len(args.paths) not in (2, 3):
+            print("Usage: archive restore NAME [BACKUP_ID] OUTPUT")
+            return 2
+        name, output_filepath = archived_name(args.paths[0]), args.paths[-1]
+        backup_id = args.paths[1] if len(args.paths) == 3 else None
+        backup_id = store.restore(name, backup_id, output_filepath)
+        print(f"Restored {name} backup {backup_id} to {output_filepath}")
+    return 0
+
+def cli_update_slot(args):
+    """Replaces one game in an existing combined ROM."""
+    menu = None
+    if args.menu or args.device:
+        menu = resolve_menu(args.device, args.mode, args.menu)
+    start = time.perf_counter()
+    written = update_rom_slot(args.image, args.mode, args.slot - 1, args.game, menu)
+    print(f"Updated slot {args.slot} of {args.image}: {written/1024:.0f}KB written in {time.perf_counter() - start:.3f}s")
+    return 0
+
+def cli_checksums(args):
+    """Checks (and with --fix repairs) the checksums of every ROM in existing combined images."""
+    bad = 0
+    for image_filepath in args.images:
+        report = verify_rom_image(image_filepath, args.mode, fix=args.fix)
+        print(f"{image_filepath}: {report['bad']} bad, {report['fixed']} fixed, "
+              f"{report['used_bytes']/1024/1024:.2f}MB checked in {report['seconds']*1000:.1f}ms")
+        for line in checksum_report_lines(report):
+            print(f"    {line}")
+        bad += report["bad"] - report["fixed"]
+    return 1 if bad else 0
+
+def cli_extract(args):
+    """Extracts the menu and games of every combined image back into separate ROM files."""
+    image_paths, skipped = find_cart_images(args.paths, args.template, any_size=args.mode is not None)
+    print(f"Extracting {len(image_paths)} cart(s)")
+    if skipped:
+        print(f"Skipping {len(skipped)} file(s) that are not {format_size(get_active_profile().rom_size)} combined ROMs (give --mode to extract them anyway)")
+
+    def report(result):
+        if result["error"]:
+            print(f"[FAIL] {result['image']}: {result['error']}")
+            return
+        device = f", {result['device']} menu" if result["device"] else ""
+        print(f"[ OK ] {result['image']} ({result['mode']}-game{device}, {result['seconds']:.3f}s)")
+        for region in result["roms"]:
+            print(f"    {region['name']}: {region['title'] or '(no title)'} {format_size(region['length'])} "
+                  f"(size from {region['length_from']}) -> {region['output']}")
+
+    results, seconds = extract_carts_batch(image_paths, args.template, args.mode, jobs=args.jobs, on_result=report,
+                                           include_menu=not args.no_menu, fsync=args.fsync)
+    extracted = sum(1 for result in results if not result["error"])
+    megabytes = sum(region["length"] for result in results for region in result["roms"]) / 1024 / 1024
+    print(f"{extracted} extracted, {len(results) - extracted} failed in {seconds:.3f}s ({megabytes / seconds if seconds else 0:.1f} MB/s)")
+    if args.manifest:
+        sync = OutputSync(args.fsync)
+        count = write_extract_manifest(results, args.manifest, sync)
+        sync.flush()
+        print(f"Wrote a build manifest for {count} cart(s) to {args.manifest}")
+    return 1 if extracted < len(results) else 0
+
+def cli_watch(args):
+    """Rebuilds the carts and saves of the given manifests whenever their inputs change."""
+    cache = None
+    if args.cache_dir:
+        cache = RomBuildCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024, link_mode=args.cache_link)
+
+    def log(message):
+        print(f"{time.strftime('%H:%M:%S')} {message}", flush=True)
+
+    watcher = None
+    if not args.once:
+        watcher = open_watcher(args.poll)
+    cart_watcher = CartWatcher(args.manifests, state_path=args.state, jobs=args.jobs, queue_size=args.queue, debounce=args.debounce,
+                               cache=cache, checksums=args.checksums, verify=args.verify, fsync=args.fsync, watcher=watcher, log=log)
+    import signal
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())  # Stop as cleanly as Ctrl+C, so outputs, state and metrics are flushed
+    cart_watcher.run(stop, once=args.once)
+    return 0
+
+def cli_profiles(args):
+    """Lists the available cart profiles and their memory maps."""
+    for name in list_profiles():
+        profile = load_profile(name)
+        active = " (active)" if profile is get_active_profile() else ""
+        print(f"{name}{active}: {format_size(profile.rom_size)} ROM, {format_size(profile.menu_size)} menu, "
+              f"{profile.sram_bank_count} x {format_size(profile.sram_bank_size)} SRAM, fill 0x{profile.fill_byte:02X}")
+        for rom_count in profile.rom_counts:
+            slots = ", ".join(f"0x{slot['start']:06X}+{format_size(slot['max_size'])}" for slot in profile.slots(rom_count))
+            menus = ", ".join(device for device, count in profile.menu_files if count == rom_count) or "custom menu only"
+            print(f"    {rom_count}-game: {slots} ({menus})")
+    return 0
+
+def run_gui():
+    """Opens the GUI. The GUI (and tkinter) is only imported when it is needed, so the command line starts fast."""
+    sys.modules.setdefault("rom_combiner", sys.modules[__name__])
+    from rom_combiner_gui import MultiFunctionTool
     app = MultiFunctionTool()
     app.mainloop()
+    return 0
+
+def main(argv=None):
+    """Starts the GUI when run without a command, otherwise runs the command line tool."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        return run_gui()
+
+    parser = argparse.ArgumentParser(prog="rom_combiner", description="Game Boy Multi-Function Tool (headless mode).")
+    parser.add_argument("--profile", default=None, help=f"Cart profile: a name from the 'profiles' folder or a JSON file (default: {DEFAULT_PROFILE_NAME}).")
+    parser.add_argument("--metrics", default=None, help="Record timing spans, byte counts, cache hits and errors to this file (off by default).")
+    parser.add_argument("--metrics-format", choices=METRICS_FORMATS, default=None, help="jsonl (one event per line) or prometheus (text format for a textfile collector). Default: prometheus for .prom files, otherwise jsonl.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    # --- Options shared by several commands ---
+    build_options = argparse.ArgumentParser(add_help=False)
+    build_options.add_argument("--cache-dir", default=None, help="Reuse identical earlier builds from this cache folder.")
+    build_options.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE // 1024 // 1024, help="Cache size limit in MB (default: %(default)s).")
+    build_options.add_argument("--cache-link", choices=["clone", "hardlink"], default="clone", help="How cached images are handed out (default: clone).")
+    build_options.add_argument("--checksums", choices=CHECKSUM_MODES, default=None, help="Check the header and global checksum of each game in the built image, or also fix them in the image.")
+    verify_options = argparse.ArgumentParser(add_help=False)
+    verify_options.add_argument("--verify", action="store_true", help="Hash outputs while writing, read them back and compare, and write a .manifest.json of checksums next to each.")
+    fsync_options = argparse.ArgumentParser(add_help=False)
+    fsync_options.add_argument("--fsync", choices=FSYNC_POLICIES, default="batch", help="When outputs are flushed to disk: 'file' after each output, 'batch' all together once the run (or in watch mode, each burst of jobs) is done (default), or 'none' (left to the OS).")
+
+    build_parser = subparsers.add_parser("build", parents=[build_options, verify_options, fsync_options], help="Build every cart listed in a JSON manifest.")
+    build_parser.add_argument("manifest", help="Path to the JSON build manifest.")
+    build_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    build_parser.set_defaults(func=cli_build)
+
+    plan_parser = subparsers.add_parser("plan", help="Pack a catalogue of ROMs into as few carts as possible and write a build manifest.")
+    plan_parser.add_argument("paths", nargs="+", help="ROM files, or folders to search for .gb/.gbc files.")
+    plan_parser.add_argument("-o", "--output", default="carts.json", help="Build manifest to write (default: %(default)s).")
+    plan_parser.add_argument("--out-dir", default="carts", help="Folder for the planned carts, relative to the manifest (default: %(default)s).")
+    plan_parser.add_argument("--device", choices=["Gameboy", "Gameboy Colour"], default="Gameboy Colour", help="Device for the automatic menus (default: %(default)s).")
+    plan_parser.add_argument("--modes", type=int, nargs="+", default=None, help="Cart layouts to use (default: every layout in the profile, e.g. 4 3).")
+    plan_parser.set_defaults(func=cli_plan)
+
+    index_parser = subparsers.add_parser("index", help="Build or refresh an index of ROM cartridge headers.")
+    index_parser.add_argument("paths", nargs="+", help="ROM files, or folders to search for .gb/.gbc files.")
+    index_parser.add_argument("--index", default="rom_index.json", help="Index file to create or update (default: %(default)s).")
+    index_parser.add_argument("--list", action="store_true", help="Print the indexed headers.")
+    index_parser.add_argument("-j", "--jobs", type=int, default=16, help="Threads used to read changed headers (default: %(default)s).")
+    index_parser.set_defaults(func=cli_index)
+
+    split_parser = subparsers.add_parser("split", parents=[verify_options, fsync_options], help="Split many full SRAM saves (128KB on the default profile) into one save per bank at once.")
+    split_parser.add_argument("paths", nargs="+", help="Save files, folders of .sav files, or glob patterns.")
+    split_parser.add_argument("--template", default=DEFAULT_SPLIT_TEMPLATE, help="Output path template using {dir}, {stem} and {n} (default: %(default)s).")
+    split_parser.add_argument("--mode", type=int, default=4, help="4-game split, or 3-game split that skips the first 32KB (default: 4). Must be a layout of the profile.")
+    split_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker threads.")
+    split_parser.add_argument("--archive", default=None, help="Also back up each split save to this save archive folder.")
+    split_parser.set_defaults(func=cli_split)
+
+    combine_parser = subparsers.add_parser("combine", parents=[verify_options, fsync_options], help="Combine every save set listed in a JSON manifest into full SRAM saves.")
+    combine_parser.add_argument("manifest", help="Path to the JSON combine manifest.")
+    combine_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker threads.")
+    combine_parser.add_argument("--archive", default=None, help="Also back up each combined save to this save archive folder.")
+    combine_parser.set_defaults(func=cli_combine)
+
+    archive_parser = subparsers.add_parser("archive", help="Back up, list or restore saves in a deduplicating save archive.")
+    archive_parser.add_argument("action", choices=["backup", "list", "restore"], help="backup SAVES... | list [NAMES...] | restore NAME [BACKUP_ID] OUTPUT. A NAME may also be the path of the archived save.")
+    archive_parser.add_argument("paths", nargs="*", help="Arguments for the action.")
+    archive_parser.add_argument("--archive", default="save_archive", help="Save archive folder (default: %(default)s).")
+    archive_parser.add_argument("--block-size", type=int, default=SAVE_BLOCK_SIZE, help="Deduplication block size in bytes for new backups (default: %(default)s).")
+    archive_parser.set_defaults(func=cli_archive)
+
+    update_parser = subparsers.add_parser("update-slot", help="Replace one game in an existing combined ROM, in place.")
+    update_parser.add_argument("image", help="Path to the combined ROM to update.")
+    update_parser.add_argument("slot", type=int, help="Slot number to replace (1-based).")
+    update_parser.add_argument("game", nargs="?", default=None, help="New game ROM. Leave out to empty the slot.")
+    update_parser.add_argument("--mode", type=int, default=4, help="ROM type of the image (default: 4).")
+    update_parser.add_argument("--device", choices=["Gameboy", "Gameboy Colour"], default=None, help="Also refresh the automatic menu for this device.")
+    update_parser.add_argument("--menu", default=None, help="Also refresh the menu from this custom menu file.")
+    update_parser.set_defaults(func=cli_update_slot)
+
+    extract_parser = subparsers.add_parser("extract", parents=[fsync_options], help="Extract the menu and games of combined ROMs back into separate ROM files.")
+    extract_parser.add_argument("paths", nargs="+", help="Combined ROM images, or folders to search for .gb/.gbc files.")
+    extract_parser.add_argument("--template", default=DEFAULT_EXTRACT_TEMPLATE, help="Output path template using {dir}, {stem}, {slot}, {name} and {ext} (default: %(default)s).")
+    extract_parser.add_argument("--mode", type=int, default=None, help="ROM type of the images (default: detect it from the menu or the slot headers). Also extracts files that are not the profile's ROM size.")
+    extract_parser.add_argument("--no-menu", action="store_true", help="Only extract the games.")
+    extract_parser.add_argument("--manifest", default=None, help="Also write a build manifest that re-packs the extracted carts.")
+    extract_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker threads.")
+    extract_parser.set_defaults(func=cli_extract)
+
+    watch_parser = subparsers.add_parser("watch", parents=[build_options, verify_options, fsync_options], help="Keep the carts and saves of build/combine manifests up to date as their inputs change.")
+    watch_parser.add_argument("manifests", nargs="+", help="Build and/or combine manifests (an object may hold both a \"builds\" and a \"combines\" list).")
+    watch_parser.add_argument("--state", default=None, help=f"File recording input hashes between runs (default: next to the first manifest, ending in {WATCH_STATE_SUFFIX}).")
+    watch_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker threads (default: up to 4).")
+    watch_parser.add_argument("--queue", type=int, default=None, help="Most jobs queued or running at once before new changes wait (default: twice the jobs).")
+    watch_parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE, help="Seconds to wait for a burst of changes to settle (default: %(default)s).")
+    watch_parser.add_argument("--poll", type=float, default=None, help="Poll for changes every this many seconds instead of using inotify.")
+    watch_parser.add_argument("--once", action="store_true", help="Bring everything up to date once and exit.")
+    watch_parser.set_defaults(func=cli_watch)
+
+    checksums_parser = subparsers.add_parser("checksums", help="Check the header and global checksums of every ROM in combined images.")
+    checksums_parser.add_argument("images", nargs="+", help="Combined ROM images to check.")
+    checksums_parser.add_argument("--mode", type=int, default=4, help="ROM type of the images (default: 4).")
+    checksums_parser.add_argument("--fix", action="store_true", help="Repair wrong checksums in the images, in place.")
+    checksums_parser.set_defaults(func=cli_checksums)
+
+    profiles_parser = subparsers.add_parser("profiles", help="List the available cart profiles.")
+    profiles_parser.set_defaults(func=cli_profiles)
+
+    args = parser.parse_args(argv)
+    try:
+        set_active_profile(args.profile)
+        metrics = Metrics(open_metrics_sink(args.metrics, args.metrics_format), METRICS_FLUSH_INTERVAL) if args.metrics else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    set_metrics(metrics)
+    try:
+        if args.command is None:
+            return run_gui()
+        return args.func(args)
+    finally:
+        if metrics is not None:
+            set_metrics(None)
+            metrics.close()
+
+if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        import multiprocessing  # Lets worker processes start from a frozen executable; skipped otherwise, it slows every launch
+        multiprocessing.freeze_support()
+    sys.exit(main())
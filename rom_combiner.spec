@@ -5,8 +5,8 @@ a = Analysis(
     ['rom_combiner.py'],
     pathex=[],
     binaries=[],
-    datas=[('menus', 'menus')],
-    hiddenimports=[],
+    datas=[('profiles', 'profiles')],
+    hiddenimports=['rom_combiner_gui', 'rom_combiner_menus'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
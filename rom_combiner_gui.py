@@ -0,0 +1,709 @@
+"""Tkinter GUI for the Game Boy Multi-Function Tool.
+
+Kept apart from rom_combiner.py so the command line never imports tkinter.
+Start it with `python rom_combiner.py` (no arguments).
+"""
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rom_combiner import (
+    DEFAULT_PROFILE, OperationCancelled, assign_slots, build_rom, checksum_report_lines, combine_saves,
+    format_size, get_active_profile, resolve_menu, rom_compatibility_warnings, split_save, validate_rom_build,
+)
+
+# --- GUI Constants ---
+JOB_POLL_INTERVAL_MS = 50
+STAT_CACHE_MAX_AGE = 2.0  # Seconds before a cached file size is re-checked in the background
+STAT_REFRESH_INTERVAL_MS = int(STAT_CACHE_MAX_AGE * 1000)  # How often the shown file sizes are re-checked while the window is idle
+
+# --- File Metadata Cache ---
+
+def _stat_key(result):
+    if isinstance(result, OSError):
+        return ("error", result.errno)
+    return (result.st_size, result.st_mtime_ns)
+
+class StatCache:
+    """Thread-safe cache of os.stat results, re-checked on a background thread, so list refreshes never wait on the disk."""
+
+    def __init__(self, max_age=STAT_CACHE_MAX_AGE, jobs=4):
+        self.max_age = max_age
+        self._entries = {}  # path -> (checked_at, os.stat_result or OSError)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+
+    def get(self, path):
+        """Returns the cached stat result, the OSError from the last attempt, or None if not looked up yet."""
+        with self._lock:
+            entry = self._entries.get(path)
+        return entry[1] if entry else None
+
+    def refresh(self, path, on_change):
+        """Re-stats path in the background if its entry is missing or older than max_age, calling on_change(path) from there if it changed."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if path in self._pending or (entry and now - entry[0] < self.max_age):
+                return
+            self._pending.add(path)
+        self._executor.submit(self._stat, path, on_change)
+
+    def _stat(self, path, on_change):
+        try:
+            result = os.stat(path)
+        except OSError as e:
+            result = e
+        with self._lock:
+            previous = self._entries.get(path)
+            self._entries[path] = (time.monotonic(), result)
+            self._pending.discard(path)
+        if previous is None or _stat_key(previous[1]) != _stat_key(result):
+            on_change(path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class MultiFunctionTool(tk.Tk):
+    def __init__(self, profile=None):
+        super().__init__()
+        # Every layout, size and limit shown or checked by the GUI comes from the cart profile
+        self.profile = profile or get_active_profile()
+        self.title("Game Boy Multi-Function Tool" if self.profile is DEFAULT_PROFILE else f"Game Boy Multi-Function Tool - {self.profile.name}")
+        
+        # --- Rom Combiner Variables ---
+        self.rom_combiner_menu_file_path = None
+        self.rom_combiner_game_file_paths = []
+        self.rom_combiner_rom_mode = tk.StringVar(value=str(self.profile.rom_counts[0]))
+        self.rom_combiner_device_mode = tk.StringVar(value="Gameboy Colour")
+        self.rom_combiner_menu_mode = tk.StringVar(value="Automatic")
+        self.rom_combiner_checksum_mode = tk.StringVar(value="Off") # "Off", "verify" or "fix"
+        self.rom_combiner_verify_writes = tk.BooleanVar(value=False) # Read the ROM back and write a checksum manifest
+        
+        # --- Save Splitter/Combiner Variables ---
+        self.savesplit_file_paths = []
+        self.savesplit_name_entries = []
+        self.savesplit_mode = tk.StringVar(value=str(self.profile.save_counts[0])) # "4" or "3" on the default profile
+        self.savesplit_verify_writes = tk.BooleanVar(value=False) # Read outputs back and write a checksum manifest
+
+        # --- Background Job Variables ---
+        self.job_executor = ThreadPoolExecutor(max_workers=1)
+        self.job_events = queue.Queue()
+        self.pending_jobs = []
+        self.current_job = None
+        self.stat_cache = StatCache()
+        self.listbox_rows = {}  # listbox -> rows currently shown, for incremental updates
+
+        self.setup_ui()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(JOB_POLL_INTERVAL_MS, self.poll_job_events)
+        self.after(STAT_REFRESH_INTERVAL_MS, self.refresh_file_stats)
+
+    def setup_ui(self):
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
+
+        # Create frames for each tab
+        rom_combiner_frame = tk.Frame(self.notebook)
+        save_splitter_frame = tk.Frame(self.notebook)
+
+        self.notebook.add(rom_combiner_frame, text="ROM Combiner")
+        self.notebook.add(save_splitter_frame, text="Save Splitter/Combiner")
+
+        self.setup_rom_combiner_ui(rom_combiner_frame)
+
+        # The Save Splitter tab is only built the first time it is opened, so the window shows sooner
+        self.save_splitter_frame = save_splitter_frame
+        self.save_splitter_built = False
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # Background job status bar
+        status_frame = tk.Frame(self)
+        status_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self.job_status_label = tk.Label(status_frame, text="Ready.", anchor="w")
+        self.job_status_label.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.job_progress = ttk.Progressbar(status_frame, length=200, mode="determinate")
+        self.job_progress.pack(side=tk.LEFT, padx=5)
+        self.job_cancel_button = tk.Button(status_frame, text="Cancel", command=self.cancel_job, state="disabled")
+        self.job_cancel_button.pack(side=tk.LEFT)
+
+    def on_tab_changed(self, event=None):
+        """Builds the Save Splitter tab the first time it is selected."""
+        if not self.save_splitter_built and self.notebook.select() == str(self.save_splitter_frame):
+            self.save_splitter_built = True
+            self.setup_save_splitter_ui(self.save_splitter_frame)
+
+    # -------------------------------------------------------------------------
+    #                            BACKGROUND JOBS
+    # -------------------------------------------------------------------------
+
+    def submit_job(self, description, work, on_success):
+        """Queues work(progress) on the background worker. on_success(result) runs on the Tk main loop."""
+        job = {"description": description, "cancel": threading.Event()}
+
+        def progress(done, total):
+            if job["cancel"].is_set():
+                raise OperationCancelled()
+            self.job_events.put(("progress", job, (done, total)))
+
+        def run():
+            self.job_events.put(("start", job, None))
+            try:
+                if job["cancel"].is_set():
+                    raise OperationCancelled()
+                self.job_events.put(("done", job, work(progress)))
+            except Exception as e:
+                self.job_events.put(("error", job, e))
+
+        job["on_success"] = on_success
+        self.pending_jobs.append(job)
+        self.job_executor.submit(run)
+        self.update_job_status()
+
+    def poll_job_events(self):
+        """Applies progress and results posted by the worker thread. Widgets are only touched here, on the main loop."""
+        try:
+            while True:
+                event, job, value = self.job_events.get_nowait()
+                if event == "stat":
+                    # A file's size changed (or it was looked up for the first time)
+                    self.rom_combiner_update_listbox()
+                elif event == "start":
+                    self.current_job = job
+                    self.job_progress.config(value=0, maximum=1)
+                elif event == "progress":
+                    done, total = value
+                    self.job_progress.config(value=done, maximum=max(total, 1))
+                else:
+                    self.pending_jobs.remove(job)
+                    self.current_job = None
+                    self.job_progress.config(value=0)
+                    # Callbacks and dialogs run later, so a modal dialog or a failing callback never holds up other jobs' events
+                    if event == "done":
+                        self.after_idle(job["on_success"], value)
+                    elif isinstance(value, OperationCancelled):
+                        self.job_status_label.config(text=f"Cancelled: {job['description']}")
+                    else:
+                        self.after_idle(messagebox.showerror, "Error", f"An error occurred: {value}")
+                self.update_job_status()
+        except queue.Empty:
+            pass
+        finally:
+            self.after(JOB_POLL_INTERVAL_MS, self.poll_job_events)
+
+    def update_job_status(self):
+        """Shows the running job and how many are queued behind it."""
+        if not self.pending_jobs:
+            self.job_cancel_button.config(state="disabled")
+            if self.job_status_label.cget("text").startswith(("Working", "Queued")):
+                self.job_status_label.config(text="Ready.")
+            return
+        running = self.current_job or self.pending_jobs[0]
+        queued = len(self.pending_jobs) - 1
+        text = f"Working: {running['description']}"
+        if queued:
+            text += f" ({queued} more queued)"
+        self.job_status_label.config(text=text)
+        self.job_cancel_button.config(state="normal")
+
+    def cancel_job(self):
+        """Cancels the running job. Anything it had partly written is removed."""
+        if self.current_job:
+            self.current_job["cancel"].set()
+
+    def on_close(self):
+        for job in self.pending_jobs:
+            job["cancel"].set()
+        self.job_executor.shutdown(wait=False)
+        self.stat_cache.shutdown()
+        self.destroy()
+        
+    # -------------------------------------------------------------------------
+    #                            ROM COMBINER GUI
+    # -------------------------------------------------------------------------
+
+    def setup_rom_combiner_ui(self, parent_frame):
+        frame = tk.Frame(parent_frame, padx=20, pady=20)
+        frame.pack()
+
+        # Rom Type Section
+        tk.Label(frame, text="1. Select ROM Type", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+        rom_mode_frame = tk.Frame(frame)
+        rom_mode_frame.pack()
+        for rom_count in self.profile.rom_counts:
+            tk.Radiobutton(rom_mode_frame, text=f"{rom_count}-Game ROM", variable=self.rom_combiner_rom_mode, value=str(rom_count), command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
+        
+        # Device Type Section
+        tk.Label(frame, text="-"*60).pack(pady=10)
+        tk.Label(frame, text="2. Select Device Type", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+        device_mode_frame = tk.Frame(frame)
+        device_mode_frame.pack()
+        tk.Radiobutton(device_mode_frame, text="Gameboy", variable=self.rom_combiner_device_mode, value="Gameboy", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
+        tk.Radiobutton(device_mode_frame, text="Gameboy Colour", variable=self.rom_combiner_device_mode, value="Gameboy Colour", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
+
+        # Menu File Section
+        tk.Label(frame, text="-"*60).pack(pady=10)
+        tk.Label(frame, text="3. Select Menu File", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+        menu_mode_frame = tk.Frame(frame)
+        menu_mode_frame.pack()
+        tk.Radiobutton(menu_mode_frame, text="Automatic", variable=self.rom_combiner_menu_mode, value="Automatic", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
+        tk.Radiobutton(menu_mode_frame, text="Custom", variable=self.rom_combiner_menu_mode, value="Custom", command=self.rom_combiner_update_ui).pack(side=tk.LEFT, padx=10)
+
+        self.rom_combiner_menu_path_label = tk.Label(frame, text="No menu file selected.", bg="white", width=50, anchor="w")
+        self.rom_combiner_menu_path_label.pack(pady=5)
+        self.rom_combiner_select_menu_button = tk.Button(frame, text="Select Custom Menu File", command=self.select_custom_menu_file, width=40, state="disabled")
+        self.rom_combiner_select_menu_button.pack(pady=5)
+        
+        # Game Files Section
+        tk.Label(frame, text="-"*60).pack(pady=10)
+        tk.Label(frame, text="4. Manage Game ROMs", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=5)
+        add_game_button = tk.Button(button_frame, text="Add Game", command=self.add_game_file)
+        add_game_button.pack(side=tk.LEFT, padx=5)
+        remove_game_button = tk.Button(button_frame, text="Remove Selected", command=self.remove_game_file)
+        remove_game_button.pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(frame, text="Selected Games (in order of combination):").pack(pady=(5, 0))
+        self.rom_combiner_listbox = tk.Listbox(frame, selectmode=tk.SINGLE, width=60, height=max(self.profile.rom_counts))
+        self.rom_combiner_listbox.pack(pady=5)
+
+        order_frame = tk.Frame(frame)
+        order_frame.pack(pady=5)
+        move_up_button = tk.Button(order_frame, text="Move Up", command=self.move_up)
+        move_up_button.pack(side=tk.LEFT, padx=5)
+        move_down_button = tk.Button(order_frame, text="Move Down", command=self.move_down)
+        move_down_button.pack(side=tk.LEFT, padx=5)
+        auto_arrange_button = tk.Button(order_frame, text="Auto Arrange", command=self.auto_arrange)
+        auto_arrange_button.pack(side=tk.LEFT, padx=5)
+
+        # Checksum Section
+        tk.Label(frame, text="-"*60).pack(pady=10)
+        tk.Label(frame, text="5. Checks", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+        checksum_mode_frame = tk.Frame(frame)
+        checksum_mode_frame.pack()
+        tk.Radiobutton(checksum_mode_frame, text="Don't Check", variable=self.rom_combiner_checksum_mode, value="Off").pack(side=tk.LEFT, padx=10)
+        tk.Radiobutton(checksum_mode_frame, text="Verify", variable=self.rom_combiner_checksum_mode, value="verify").pack(side=tk.LEFT, padx=10)
+        tk.Radiobutton(checksum_mode_frame, text="Verify and Fix", variable=self.rom_combiner_checksum_mode, value="fix").pack(side=tk.LEFT, padx=10)
+        tk.Checkbutton(frame, text="Read back and verify the written ROM", variable=self.rom_combiner_verify_writes).pack()
+
+        # Create ROM Button
+        tk.Label(frame, text="-"*60).pack(pady=10)
+        create_rom_button = tk.Button(frame, text="Create Multi-Game ROM", command=self.create_rom, width=40, height=2)
+        create_rom_button.pack(pady=10)
+        self.rom_combiner_update_ui()
+
+    def rom_combiner_update_ui(self):
+        """Updates the ROM Combiner UI based on radio button selections."""
+        self.rom_combiner_update_listbox()
+        if self.rom_combiner_menu_mode.get() == "Custom":
+            self.rom_combiner_select_menu_button.config(state="normal")
+            self.rom_combiner_menu_path_label.config(text=os.path.basename(self.rom_combiner_menu_file_path) if self.rom_combiner_menu_file_path else "No custom menu file selected.")
+        else:
+            self.rom_combiner_select_menu_button.config(state="disabled")
+            rom_count = int(self.rom_combiner_rom_mode.get())
+            device = self.rom_combiner_device_mode.get()
+            menu_filename = self.profile.menu_files.get((device, rom_count))
+            self.rom_combiner_menu_path_label.config(text=f"Automatic: {menu_filename}" if menu_filename else "Automatic: no menu for this profile, select a custom one.")
+
+    def select_custom_menu_file(self):
+        """Selects a custom menu ROM file."""
+        filepath = filedialog.askopenfilename(
+            title=f"Select Custom Menu ROM File (max {format_size(self.profile.menu_size)})",
+            filetypes=[("ROM Files", "*.gb *.gbc *.gba"), ("All Files", "*.*")]
+        )
+        if not filepath:
+            return
+
+        file_size = os.path.getsize(filepath)
+        if file_size > self.profile.menu_size:
+            messagebox.showerror("Error", f"The menu file is {file_size/1024:.2f}KB, which is larger than the {format_size(self.profile.menu_size)} limit.")
+            self.rom_combiner_menu_file_path = None
+            self.rom_combiner_menu_path_label.config(text="No custom menu file selected.")
+            return
+        
+        self.rom_combiner_menu_file_path = filepath
+        self.rom_combiner_menu_path_label.config(text=os.path.basename(filepath))
+
+    def add_game_file(self):
+        """Adds a single game file to the list."""
+        max_games = int(self.rom_combiner_rom_mode.get())
+        if len(self.rom_combiner_game_file_paths) >= max_games and None not in self.rom_combiner_game_file_paths:
+            messagebox.showwarning("Warning", f"You can only add a maximum of {max_games} game files for the selected ROM type.")
+            return
+
+        filepath = filedialog.askopenfilename(
+            title="Select a Game File",
+            filetypes=[("ROM Files", "*.gb *.gbc *.gba"), ("All Files", "*.*")]
+        )
+        if filepath:
+            if None in self.rom_combiner_game_file_paths:
+                # Fill the first slot left empty by Auto Arrange
+                self.rom_combiner_game_file_paths[self.rom_combiner_game_file_paths.index(None)] = filepath
+            else:
+                self.rom_combiner_game_file_paths.append(filepath)
+            self.rom_combiner_update_listbox()
+            
+    def remove_game_file(self):
+        """Removes the selected game file from the list."""
+        try:
+            selected_index = self.rom_combiner_listbox.curselection()[0]
+            del self.rom_combiner_game_file_paths[selected_index]
+            self.rom_combiner_update_listbox()
+        except IndexError:
+            messagebox.showwarning("Warning", "Please select a game to remove.")
+
+    def move_up(self):
+        """Moves the selected file up in the listbox."""
+        try:
+            selected_index = self.rom_combiner_listbox.curselection()[0]
+            if selected_index > 0:
+                self.rom_combiner_game_file_paths[selected_index], self.rom_combiner_game_file_paths[selected_index - 1] = self.rom_combiner_game_file_paths[selected_index - 1], self.rom_combiner_game_file_paths[selected_index]
+                self.rom_combiner_update_listbox()
+                self.select_listbox_item(self.rom_combiner_listbox, selected_index - 1)
+        except IndexError:
+            pass
+
+    def move_down(self):
+        """Moves the selected file down in the listbox."""
+        try:
+            selected_index = self.rom_combiner_listbox.curselection()[0]
+            if selected_index < len(self.rom_combiner_game_file_paths) - 1:
+                self.rom_combiner_game_file_paths[selected_index], self.rom_combiner_game_file_paths[selected_index + 1] = self.rom_combiner_game_file_paths[selected_index + 1], self.rom_combiner_game_file_paths[selected_index]
+                self.rom_combiner_update_listbox()
+                self.select_listbox_item(self.rom_combiner_listbox, selected_index + 1)
+        except IndexError:
+            pass
+
+    def auto_arrange(self):
+        """Reorders the games so that each one fits its slot, leaving a slot empty if needed."""
+        rom_count = int(self.rom_combiner_rom_mode.get())
+        games = []
+        try:
+            for path in self.rom_combiner_game_file_paths:
+                if path is not None:
+                    games.append((path, os.path.getsize(path)))
+        except OSError:
+            messagebox.showerror("Error", f"Could not access game file: {os.path.basename(path)}. Please ensure the file exists and is accessible.")
+            return
+
+        try:
+            arranged = assign_slots(games, rom_count, self.profile)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        while arranged and arranged[-1] is None:
+            arranged.pop()
+        self.rom_combiner_game_file_paths = arranged
+        self.rom_combiner_update_listbox()
+    
+    def sync_listbox(self, listbox, rows):
+        """Updates a listbox to show rows of (text, colour), touching only the items that changed."""
+        shown = self.listbox_rows.setdefault(listbox, [])
+        for i, row in enumerate(rows):
+            if i < len(shown) and shown[i] == row:
+                continue
+            if i < len(shown):
+                listbox.delete(i)
+            listbox.insert(i, row[0])
+            if row[1]:
+                listbox.itemconfig(i, {'fg': row[1]})
+        if len(shown) > len(rows):
+            listbox.delete(len(rows), tk.END)
+        shown[:] = rows
+
+    def select_listbox_item(self, listbox, index):
+        listbox.selection_clear(0, tk.END)
+        listbox.selection_set(index)
+        listbox.activate(index)
+
+    def refresh_file_stats(self):
+        """Re-checks the sizes shown in the ROM list in the background, so files changed while the window is idle show up."""
+        try:
+            self.rom_combiner_update_listbox()
+        finally:
+            self.after(STAT_REFRESH_INTERVAL_MS, self.refresh_file_stats)
+
+    def rom_combiner_update_listbox(self):
+        """Refreshes the listbox with the current file order and cached sizes, highlighting files that are too large."""
+        current_slots = self.profile.slots(int(self.rom_combiner_rom_mode.get()))
+        on_change = lambda path: self.job_events.put(("stat", None, path))
+        rows = []
+        
+        for i, path in enumerate(self.rom_combiner_game_file_paths):
+            if i >= len(current_slots):
+                continue
+                
+            slot = current_slots[i]
+            if path is None:
+                rows.append((f"Slot {i+1} ({slot['max_size']/1024/1024:.0f}MB): (empty)", None))
+                continue
+
+            self.stat_cache.refresh(path, on_change)
+            stat = self.stat_cache.get(path)
+            if stat is None:
+                rows.append((f"Slot {i+1} ({slot['max_size']/1024/1024:.0f}MB): {os.path.basename(path)} (...)", None))
+            elif isinstance(stat, OSError):
+                rows.append((f"Slot {i+1}: ERROR - File not found or inaccessible.", "red"))
+            else:
+                file_size_mb = stat.st_size / (1024 * 1024)
+                display_text = f"Slot {i+1} ({slot['max_size']/1024/1024:.0f}MB): {os.path.basename(path)} ({file_size_mb:.2f}MB)"
+                rows.append((display_text, "red" if stat.st_size > slot["max_size"] else None))
+
+        self.sync_listbox(self.rom_combiner_listbox, rows)
+        
+    def create_rom(self):
+        """Creates the final ROM file based on the memory map."""
+        rom_count = int(self.rom_combiner_rom_mode.get())
+        device = self.rom_combiner_device_mode.get()
+
+        # Determine menu file path based on user selections
+        if self.rom_combiner_menu_mode.get() == "Custom" and not self.rom_combiner_menu_file_path:
+            messagebox.showerror("Error", "Please select a custom menu file.")
+            return
+        custom_menu_path = self.rom_combiner_menu_file_path if self.rom_combiner_menu_mode.get() == "Custom" else None
+        game_paths = list(self.rom_combiner_game_file_paths)
+        profile = self.profile
+
+        def check(progress):
+            # Stats and reads every game, which can take a while on a network share, so it runs on the worker
+            menu = resolve_menu(device, rom_count, custom_menu_path, profile)
+            validate_rom_build(menu, game_paths, rom_count, profile)
+            return menu, rom_compatibility_warnings(game_paths, device, rom_count, profile=profile)
+
+        self.submit_job("Checking the selected games", check, lambda result: self.save_rom(rom_count, game_paths, *result))
+
+    def save_rom(self, rom_count, game_paths, menu, warnings):
+        """Asks where to save the checked build (after confirming any warnings) and queues it."""
+        if warnings and not messagebox.askokcancel("Warning", "\n".join(warnings) + "\n\nCreate the ROM anyway?"):
+            return
+
+        output_filepath = filedialog.asksaveasfilename(
+            defaultextension=".gbc",
+            title="Save the combined ROM file",
+            filetypes=[("ROM Files", "*.gbc"), ("All Files", "*.*")]
+        )
+        if not output_filepath:
+            return
+
+        def on_success(result):
+            success_message = f"Multi-game ROM created successfully at:\n{output_filepath}"
+            if result["manifest"]:
+                success_message += f"\n\nRead back and verified. Checksums saved to {os.path.basename(result['manifest'])}."
+            report = result["checksums"]
+            if report is None:
+                messagebox.showinfo("Success", success_message)
+                return
+            problems = checksum_report_lines(report, problems_only=True)
+            if not problems:
+                messagebox.showinfo("Success", success_message + f"\n\nAll checksums are correct ({report['seconds']*1000:.0f}ms).")
+            else:
+                messagebox.showwarning("Checksums", success_message + "\n\n" + "\n".join(problems))
+
+        profile = self.profile
+        checksums = None if self.rom_combiner_checksum_mode.get() == "Off" else self.rom_combiner_checksum_mode.get()
+        verify = self.rom_combiner_verify_writes.get()
+        self.submit_job(
+            f"Creating {os.path.basename(output_filepath)}",
+            lambda progress: build_rom(menu, game_paths, rom_count, output_filepath, progress=progress, profile=profile,
+                                       checksums=checksums, verify=verify),
+            on_success
+        )
+            
+    # -------------------------------------------------------------------------
+    #                         SAVE SPLITTER/COMBINER GUI
+    # -------------------------------------------------------------------------
+
+    def setup_save_splitter_ui(self, parent_frame):
+        frame = tk.Frame(parent_frame, padx=20, pady=20)
+        frame.pack()
+
+        # Split File Section
+        tk.Label(frame, text="Split a Save File", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+        
+        split_mode_frame = tk.Frame(frame)
+        split_mode_frame.pack()
+        self.savesplit_split_mode = tk.StringVar(value=str(self.profile.save_counts[0]))
+        for save_count in self.profile.save_counts:
+            tk.Radiobutton(split_mode_frame, text=f"{save_count}-Game Split", variable=self.savesplit_split_mode, value=str(save_count), command=self.update_split_ui).pack(side=tk.LEFT, padx=10)
+
+        split_frame = tk.Frame(frame)
+        split_frame.pack()
+
+        self.savesplit_name_entries = []
+        default_names = [f"save{i+1}.sav" for i in range(self.profile.sram_bank_count)]
+        for i in range(self.profile.sram_bank_count):
+            entry_frame = tk.Frame(split_frame)
+            entry_frame.pack(fill=tk.X, pady=2)
+            tk.Label(entry_frame, text=f"File {i+1} Name:", width=15, anchor='w').pack(side=tk.LEFT)
+            entry = tk.Entry(entry_frame)
+            entry.insert(0, default_names[i])
+            entry.pack(side=tk.LEFT, expand=True, fill=tk.X)
+            self.savesplit_name_entries.append(entry)
+
+        tk.Checkbutton(frame, text="Read back and verify written files", variable=self.savesplit_verify_writes).pack(pady=(5, 0))
+
+        split_button = tk.Button(frame, text="Select File to Split", command=self.split_file, width=30)
+        split_button.pack(pady=10)
+
+        tk.Label(frame, text="-"*40).pack(pady=10)
+        
+        # Combine Files Section
+        tk.Label(frame, text="Combine Save Files", font=("Helvetica", 12, "bold")).pack(pady=(0, 5))
+
+        combine_mode_frame = tk.Frame(frame)
+        combine_mode_frame.pack()
+        for save_count in self.profile.save_counts:
+            tk.Radiobutton(combine_mode_frame, text=f"{save_count}-Save Combine", variable=self.savesplit_mode, value=str(save_count), command=self.savesplit_update_ui).pack(side=tk.LEFT, padx=10)
+        
+        self.select_combine_button = tk.Button(frame, text=f"Select {self.profile.save_counts[0]} Files to Combine", command=self.select_files_to_combine, width=30)
+        self.select_combine_button.pack(pady=5)
+
+        self.savesplit_listbox = tk.Listbox(frame, selectmode=tk.SINGLE, width=50, height=self.profile.sram_bank_count)
+        self.savesplit_listbox.pack(pady=5)
+
+        # Re-ordering buttons frame
+        order_frame = tk.Frame(frame)
+        order_frame.pack(pady=5)
+        move_up_button = tk.Button(order_frame, text="Move Up", command=self.savesplit_move_up)
+        move_up_button.pack(side=tk.LEFT, padx=5)
+        move_down_button = tk.Button(order_frame, text="Move Down", command=self.savesplit_move_down)
+        move_down_button.pack(side=tk.LEFT, padx=5)
+
+        combine_button = tk.Button(frame, text="Combine Files", command=self.combine_files, width=30)
+        combine_button.pack(pady=10)
+        
+        self.savesplit_update_ui()
+        self.update_split_ui()
+
+    def update_split_ui(self):
+        # Disable/enable entry fields for the banks a 3-game split skips
+        first_bank = self.profile.first_bank(int(self.savesplit_split_mode.get()))
+        for i in range(self.profile.sram_bank_count):
+            state = "normal"
+            if i < first_bank:
+                state = "disabled"
+            self.savesplit_name_entries[i].config(state=state)
+            
+    def savesplit_update_ui(self):
+        """Updates the Save Splitter/Combiner UI based on radio button selections."""
+        max_files = int(self.savesplit_mode.get())
+        self.select_combine_button.config(text=f"Select {max_files} Files to Combine")
+        
+        # Clear the listbox if the mode changes and file count doesn't match
+        if len(self.savesplit_file_paths) != max_files:
+            self.savesplit_file_paths = []
+            self.savesplit_update_listbox()
+        
+    def split_file(self):
+        """Splits a save file into individual save files based on selected mode."""
+        filepath = filedialog.askopenfilename(
+            title=f"Select {format_size(self.profile.save_size)} file to split",
+            filetypes=[("Save Files", "*.sav"), ("All Files", "*.*")]
+        )
+        if not filepath:
+            return
+
+        # split_save checks the file's size on the worker, so a slow share never blocks the window
+        output_dir = os.path.dirname(filepath)
+        output_names = [entry.get() for entry in self.savesplit_name_entries]
+        file_count = int(self.savesplit_split_mode.get())
+        output_paths = [os.path.join(output_dir, filename or f"save{data_index+1}.sav")
+                        for data_index, filename in enumerate(output_names)]
+
+        profile = self.profile
+        verify = self.savesplit_verify_writes.get()
+        verified = " Every file was read back and verified." if verify else ""
+        self.submit_job(
+            f"Splitting {os.path.basename(filepath)}",
+            lambda progress: split_save(filepath, output_paths, file_count, progress=progress, profile=profile, verify=verify),
+            lambda result: messagebox.showinfo("Success", f"File split successfully into {file_count} files using the names provided.{verified}")
+        )
+
+    def select_files_to_combine(self):
+        """Opens a file dialog to select files for combining and updates the listbox."""
+        max_files = int(self.savesplit_mode.get())
+        file_paths = filedialog.askopenfilenames(
+            title=f"Select the {max_files} save files to combine",
+            filetypes=[("Save Files", "*.sav"), ("All Files", "*.*")]
+        )
+        if len(file_paths) != max_files:
+            messagebox.showerror("Error", f"You must select exactly {max_files} files to combine.")
+            return
+
+        self.savesplit_file_paths = list(file_paths)
+        self.savesplit_update_listbox()
+
+    def savesplit_move_up(self):
+        """Moves the selected file up in the list."""
+        try:
+            selected_index = self.savesplit_listbox.curselection()[0]
+            if selected_index > 0:
+                self.savesplit_file_paths[selected_index], self.savesplit_file_paths[selected_index - 1] = self.savesplit_file_paths[selected_index - 1], self.savesplit_file_paths[selected_index]
+                self.savesplit_update_listbox()
+                self.select_listbox_item(self.savesplit_listbox, selected_index - 1)
+        except IndexError:
+            pass
+
+    def savesplit_move_down(self):
+        """Moves the selected file down in the list."""
+        try:
+            selected_index = self.savesplit_listbox.curselection()[0]
+            if selected_index < len(self.savesplit_file_paths) - 1:
+                self.savesplit_file_paths[selected_index], self.savesplit_file_paths[selected_index + 1] = self.savesplit_file_paths[selected_index + 1], self.savesplit_file_paths[selected_index]
+                self.savesplit_update_listbox()
+                self.select_listbox_item(self.savesplit_listbox, selected_index + 1)
+        except IndexError:
+            pass
+
+    def savesplit_update_listbox(self):
+        """Refreshes the listbox with the current file order."""
+        rows = [(f"{i+1}: {os.path.basename(path)}", None) for i, path in enumerate(self.savesplit_file_paths)]
+        self.sync_listbox(self.savesplit_listbox, rows)
+        if self.savesplit_file_paths and not self.savesplit_listbox.curselection():
+            self.savesplit_listbox.select_set(0)
+
+    def combine_files(self):
+        """Combines the files based on the selected mode, padding smaller files to the SRAM bank size."""
+        max_files = int(self.savesplit_mode.get())
+        if len(self.savesplit_file_paths) != max_files:
+            messagebox.showerror("Error", f"Please select exactly {max_files} files before combining.")
+            return
+
+        output_filepath = filedialog.asksaveasfilename(
+            defaultextension=".sav",
+            title=f"Save the combined {format_size(self.profile.save_size)} file",
+            filetypes=[("Save Files", "*.sav")]
+        )
+        if not output_filepath:
+            return
+
+        verify = self.savesplit_verify_writes.get()
+
+        def on_success(padded_files_count):
+            success_message = f"Files combined successfully into {os.path.basename(output_filepath)}"
+            if verify:
+                success_message += "\nThe combined file was read back and verified."
+            if padded_files_count > 0:
+                success_message += f"\n{padded_files_count} file(s) were padded to {format_size(self.profile.sram_bank_size)}."
+            
+            messagebox.showinfo("Success", success_message)
+
+        save_paths = list(self.savesplit_file_paths)
+        profile = self.profile
+        self.submit_job(
+            f"Combining into {os.path.basename(output_filepath)}",
+            lambda progress: combine_saves(save_paths, output_filepath, max_files, progress=progress, profile=profile, verify=verify),
+            on_success
+        )
+
+if __name__ == "__main__":
+    app = MultiFunctionTool()
+    app.mainloop()
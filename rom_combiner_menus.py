@@ -0,0 +1,138 @@
+"""Built-in menu ROMs, generated by embed_menus.py from the 'menus' folder. Do not edit."""
+
+MENUS = {
+    'Daz 3in1.gb': (
+        'c-rljU2Ggz6@btBFSawb$4Mmy#l&|aBTe(-Nm7{=+KxAlAudWF68)ih=?K$lfoW_4cqi>J*#rrtf'
+        '`=p$l8q_~54`lLAfcv25gVDT6f$cOiAJhoThpppM*^HJC}l}jGn{j0wh2!>&<7sQH#>9gx%bXF=b'
+        'n3JW&!>;-u-W~OVM(>21Kh{{Oc;VJ9lr}J|OOOi+_^VjT-6AZgH3Nt#|*?*kA7u_deWpe?a`bTil'
+        'VoS?BI;_qS)g@QJZ}q;KVKjuQ^R*3R$34?%$e=p7zC^C}FkhR5n_Yws>yy!gWGvBAHFYpYAIUwnI'
+        '?C8qZuJ-q+PCk}|zglWPK=*sO=Cx3LVZ8kXdt5cVjP6a`7Gg;n90ymChKd*wC_odAHdFt@hw8IC`'
+        '3Iz=yNj8>oegXw&YRV}<vb=QZ($aD=v}NcAVHkP^$8ic;piS<ZG|l-&baM9O?CcBm%F@xo#zx`jQ'
+        'aNhI&8Q3=gH~(}cA(Wj(}IHL5a7Vcn>SzCv112Vvw7Fehn|cz2;@ARmdN><26PE1AWexCjTULgwn'
+        '?)ql}e0a%t@Rvps)jsmI9a4+n5BH;JU8VT{p(V1=Fv1N)ruLL(O!mkazP7tKkCJc16z9Oxw0i4e-'
+        '>k4d4`#f+G#KO!H&oH~_7OoI#I*vnyrrt1Igt)qODMDS#Gup^~@5R4TaKk%Ak>%1&rinhNQ8yVAt'
+        '8LMucAXvaf^biDYAHZN^IblT*F;*;+2hi&pq_BC3sUtM2cuXtdhfmRqo%W-_iY2kKa-f%ygF7AWd'
+        'guu2v+YT~m%kdS*f>7QTf+rK`!A=Fk#CYnC>$y%H^F#zt-HhWK)hbl$AFZ!cDUa1^)y+$Pw%wrk!'
+        '&PrY>U5tMM&1am(@b|Jl(bUmnSgiSh&Rz58bMnid(nR^6B~mk{dz!)S9&_YqXN-9tY@73fW$Q0Mc'
+        '^qu?rUV*xc*hr!wThJ!EWp)y@h$oyLN-(1z4brHzV6!a4=pI=H>boND~m*lz_VIrG9{r5`eNvE0F'
+        'd=S<b7JfktL;C+Z81v@Z(}RMR)j$0$a+Z6TE&6&9{Prdq`W$R&j`9^B+b^BXM~G0n&{M<9DPfE4V'
+        '4h1G1iln8t-XdiK#!N~0Qs_8maBh81A<wdBe#2iYQrbjh#o}6!F`4MVcPxGM~ne0uafrUnOX3m&W'
+        '_NoCER6tMMw%}|4){(QXHO~H={LB0pS)Rx)N!3W>6lyAsY~6;B6;buUsHPIsG{F3Hu~96>u<XzaL'
+        ';JYiMod{*QE#>`Rb+9B%#TRz?>&_6*WN?b`i&LLb6zR96BurOdOA<fKfM7cfe@F=GO=+-2VSS9XP'
+        '$oai)Thj?tbp{7BhRpz}U>$8F~-RjBOj60XVY@54^td6dv%#Q>8ULlG2*`fJR$T!!V57cp6klsci'
+        'S(?v(=>IGpLXd$A}08%??GWGAfvX}7)q*i72bMCNytE~KaTsY$zgG>v0C^)xOf<!zH9?YNWPfY&?'
+        'O__&NGk^MAI{p2pyjm&Q%9aAG)!er_f{mJpvFFDG_<va>23oKg}$heaXX&Gr`3}v*(kmEl&^Lebt'
+        '8GmYu9*%gbSd2(cPfu^6CR8y+9}uw89S^bp<sv?x=w$>0^v|F7DJ=i=?@s$9PP@h?N|9BFd;Yxqq'
+        '#VlT6^dq&>ZLG+pc{GMI%E6+6xA*j%N6jdcA-?%{{X)uDo#f`Uw@5$6!(L#OxEbdGuQF{*drRXzB'
+        'WeXX3k(`LpvJ}y#e<m$*sHZT#1K`9_xeXp!O-N9KEQ2GpTL%W9wV`x2Z)6L<gd&+FHMUBsUD@9Q4'
+        '*+0ZZs&F&A~#ehm8e`-fpM_XyN}3Hq!3!{TRYdl2+pi?{SY^!GsD?q>oW%+kv`h|={d@92;1&kfO'
+        '>>z8!_pT4CiR?pkw&+l13jfxg%pREmUJy<V_0k2*bLted4JPz7lPP}DoJg)Vf=;^p%tm7B_D?Om='
+        'izhA^U6#-~EcHq*2N+In6#6cAS)CWe2WaLkaZmd-#%_V0yuSCEFYaRq6FCfK0(2-&s5-o<d`JId|'
+        '8P0UZHL-RV4aJKm#=@Q!!MT0Nv&1``V%GgJ@Mr|LI|j3JoslN)vvm9-}}PhBTqhic<$KT?2E_eUV'
+        '5Hd;|J#4x#RL8=8m~1@I8?$=g@uU{KP!Dhxhix$ui^`#VvnoOvmTMy+-lc@1x>XD=AqgOV)2o*3%'
+        '{HOC{^kk_Gg;x-)^#h}Kn0M9_d|YFoDcrapA-a|bQ;A^pwqPw;Oi!!QiPFbu;m48t%C!!QiPFbu;'
+        'm48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m'
+        '48t%C!!ZB<{2LzshFt'
+    ),
+    'Daz 3in1.gbc': (
+        'c-rljU2Ggz6@btBFSawb$4Mmy#l&|aBTe(-Nm7{=+KxAlAudWFQvV<?j4(_KOk)$kJ86f>COnV|9'
+        '+F5%HmWFn;H6Im2{mmLbt99NLS`)@(MVNnYl@n6B*58%QkG;j!#Q_moAAT~ec<7Ivoq(Od+(fc?z'
+        'v}X7T|y5z5gb=6fL)FK(xBWzpi4tbN9CG1L9t{_$O)IsFB|67I#VCdiNiV{q+uU@55d92gKjI#U0'
+        't3b?)AFe|y#opBT$W`d0qtIN<<n?fgFc7!(+Q-r><RFT>z!c&xs*_TJLPi_gs-8~kgywz~A{#kcl'
+        'ZVtW74!~36l;((AA%BBfBpewgeedj0V+Gc}Ozdm(o=~NITH<RU!Byi(6_VX&Jd0)!BpQjFAO*?!5'
+        'tx(Val4N5U=O<8brly<%B+E;eE-fu5LtBP^6o#Q!a2%(g1={4kNz<HfL?>rY&dxqpuPhxcY-|*cE'
+        '|sHZ+>FZ5F=)lsU<X<aG%YA-4gn6Fym|Ab9Xob_HJf+ceCWwogFw#1X^EV#X+W2N0@9RNK>?;6+a'
+        '}GfR4OrwF(+}xfWi(iS_)iFZ(|Z*g6q0ccik8d7fiq6DNQs~4K>rLLf*|UtcD9<+Z8!aGi}>8HNa'
+        'EDHh@z|3XU|`GR=>T;{dcCat1vL&aRZfudb|rRQJK0rvO^ug-YHIQ>ox`M+$BjD?6c8X)2`W?Mf5'
+        'V3at<gpdAkt((&Re+Pt*=&}owwich-7AGXOe+1F^jesz6)z2bq123lbVEywX4r-j>zdBgo|y0{N+'
+        '69U`zY&*!LEyq_J3qpBY2%b!!2RjuE6XU5nuID;+%o7nnbu*4{RI5;}f3&_*r94)vRW~pF*>;2C4'
+        '_CbrsndO47<nVKPBYz^P|`}JX9C`RBi=-NXasG6>_z{vOl%CE^y>jFUg_xoj|xQdu%2=90}|707l'
+        'EhvxUZ3I<N8-g4=a>^1-r4I^cLnR@7fKD7hr)h-i&N_!NGV<n3wBUAWcAIQv&L;m-+!hN&w0xtw7'
+        'ofWjU`>1{#^Yov1H3(!MM_P)*-7AEOxQwuMxBR9LwFm}(UhAeR)%cyN;!&2P3~#55z*9D(fF08+3'
+        'E7FM(6QX=rVpnb$`1|zfItETHzjWi!dmKUL>5_2eJnjY1}d2+sy<wvM(J<W$|WU@Dv1{NCCnK@%h'
+        '*{cRvPys!0+k&$JSVzvj(m4A|@-OpaWO*XHBvm7gQ>dvlvUM9iRz%eYqnb)k(*X0+#YV9h!?Hs!4'
+        'DI838!=^NMZMX&RFTCgGCv}<zxPnOUwaQ#>o-;~&v~WbPGGqC>FGQ@|MUi+1VUUc%f!YV9eACZo_'
+        'XfcFP<4Cx%=y<x0u-*2F7O2&d_^kW^CKo48WOPc;NN*r}2Q-pDwN8k(Acd2Q=D(8irxq#?zoeN@c'
+        'tMcCQ@Bz~M~4-HSy5*l5aaCp&2cNW1O*$7a%gCNjUHbRj*xPfgn0qiG!Dsi$!<DQ}w;X~&)P2E5+'
+        'M#>ZtmiR`Cw>L+)pZe)HF>6jYX5++l>=ueKPe#ucbF6U8LSzy_+K*pV9NXtkgV<@9Nh8+Ldna^WA'
+        '&iGSP^l-#e#bQKqdU|>jHKB?r`hb9y?s$m(FBb9nL@y&4pnv|nPht6|-#+b=IPDsnC`DEw?)mfbl'
+        'X57VS16iAs+YnPf^Ou2>x}USP*l5AELXs*+J#b4{{#Gvs5l+%eB%}RQQQx{GFhV+&s@i!#~#tB_0'
+        '=&dH**Fn8`{};=nc3hNp9VJ_ewl$^jIH62enUG<>-0++evM+A6wtize_DrAUY6D)z<p;Be`KH=b*'
+        'Rt5?DePi@B(?_EXS**gp)5xksS(8t5<g4~t)<?Lp9YE#A_9-`@j$yPpkoFiS7$AWGM-ysJO9KQ}~'
+        'ku3y##eEOE6SUqovKfQ1LJStkCeYQ5Z^<cdy2E2M%40-iF@i=IIIq{~k@wnD^qNn46v5sHxuk?Vf'
+        'FP^wybXh{{u+%HL9AG%PQRuteWp!Q<AE22x#Xape7`p{}^6K7ezPOJeOyn?_3DBW9q3ZC4@;&_z{'
+        'ln!Xw;gIPfORe^UcUaJ4!>G1C$(A)=uec`_r#a?2qB=B@!+48RG)O`e(;6EN1poH;kjdTv(F!&d*'
+        'NHu8b2`S&K;K*F?Y;8f$xc2Ifw2$=O^aLJ-ojsPL?6pC~o;<V>&)3?lp?n-ieA=t)yg~ELp!RS<j'
+        'TLFO{rEOBT@Y>dpi{BU)E25kUi<t!>%*+xpP8&mFYXhx9kbKf%A948t%C!!QiPFbu;m48t%C!!Qi'
+        'PFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiP'
+        'Fbu;m48#2Y^KV@uhh6'
+    ),
+    'Daz 4in1.gb': (
+        'c-rljQEU|F5rAineH?gguK}qW;ljVjkv6<|0gIlh%W^(DwNrt@14#-})oopEns!Uww6d45Js<Ris'
+        ';xwjD%ow+v=3FKJf)Q?ND;~*i<1z0w0?jp!nTem97t{9(h7Qo({5+}-3#=o59M*bz1#U`_TQQL=b'
+        'zm>fd7vV|Cj7mb!A7NX!nSJU&iseotrlIiHAMnU!?V*MtZA9+$X*F{y&>zjV|%<lO2!x#6Nn(J!w'
+        'siJ2ySroLb?jv2<|5)xW!L*ayAqz6U=975X4Mxc$_RpnoMi+E`uvaPj>4*QSs5|1DfyS$yaG`+IC'
+        'LDqcJ)c8T$?zVUr>VOg*hx|KcJPk(W%<F<6-HzzJEo+y>#8}ZWZxa37q6y!9}a)Fe&AV-EkOAG;k'
+        'p3mz5aeR9T=f{wDi$ymN@zUaj3yVwf!1{q7gkk9CUDwU)C4JwXeU>%Ttj|x+Pfx$rs4O1I-@ctcv'
+        'RJOSqE@{OUHx`s_jjS!lCGEXx=Vly^EYlB-@0`x*wZ=B%Z0wowN#Sxa9S+q>pIY>L<#9?r0TRtCv'
+        'q&BU8z(e6vJ-p4g;lK!fYvVIlY5LfCZlCN!{}zJUp<1im$fNQ8m;pw+cBgH@gzfg5y-=Jl%2}$I='
+        '16I*tL{e4KZs!?tC8>KrdX`-xzXQE_&q3_<nk+Ji;_)(j=k20v7DPMAm)mphdA!bsf)?Mh1}J?B('
+        'fSXO9<=m7orsF04QK-FiY?<c+vMWOs;c>Lg)B9nie)*DpU*48RMSm>Y~hR}B1z;)ZWome;A&z6V#'
+        ';I*LSIKJbQQt8O+S6v%Id0Pm+ET9kDR7?}|X}F&6xecrnQG)8-D7s#)LbdT=?P`_kSglsQoQ&r<P'
+        '0Bx9@rR^N_xWMnAEI?y$<Bn5b|QTX@b2r;UG#@e&=*K6#*buSBk*NhA87GvrVD&(5Z%Xq#>tO~Ev'
+        'wT6z8c`Z)*T1eze0Lgq57+6Mmy<ktW(Z&nv^fVELFT!cf45_^R-|`u3v?u0Ck57(2!QL1B6rnlr3'
+        '6;^cTu@UZDy!Q-9k~pLL~w*?6E?fn|+Sj&$2>B7JHsTz^EpiUp8M3S~aH$qUxk+c0EVb;}xp^w|J'
+        'X&;+w9>2j$M_*~FF;x>bs`p;^~IyEz?hndzzXo<ucN|}^Lvv8iAZ>IGTT1QXnp_!@7Cep-4qdv2y'
+        'EGe^E2^*?JPu!-`=@QrnPruzf{Y#23>tm*MBEKXxGs#nEi8Rx7n*nx2H2|}kNYIi5a}$MTp%B56O'
+        'D_!l(|#MWWM|d0>AEzL<|)!RBJsa_f3jb@_g5R&uVS5ZYTnz6>E<RTa`gPu8-NN3QMoJ&8+CQzxi'
+        '~TP%5z^hwVmY7ubf<OrEeG*o;p26@1d#TO~X?Fr*`0h=XYPm1KxdkZWWJsZdH3svm<C=n&ut+n$$'
+        '>%?AY&Q<%JZyoa%S7*c5<+mfUvolXQUe+u45{#+_#(jk}#rq$l@jamTzp$zvpmG$QuN+xCgXa4)$'
+        '5&-c>nBQl>@+UYvkDO{qPY1~)_ra`)deMwx5C$A@QDNuS{&ZD%_#L{Jf%sWnzo{?tCKuYHt^2Se2'
+        'eIEO9Dkv7|;fRWbLY?Hq#Kc|HgeHpg0|Iuk<00DLEa3BrQHC(V;LMqT(h5%g@nk^aq-WkmDbfz{&'
+        'YY1yDf`oT`GQrTe#sXR3?mO*XM`Vsg4V5Jy8@oIZj`F_U*PYEhSSl{*WRWN<^A|qCLLt)t8{%dyh'
+        'W$cmxig`tSRhl=v3p0H{h-~zIFfFrD)L1*dNy?_0QPl`ZtW%<65B?N8dEQMI%z6K3*@@MtY5d${>'
+        '^#$kvX7Eex@s)YsL1491@}4#I-68EU@<<D-p(;^)d18fUtV9Sc2|4t?2puu<uTYiL@&X!O7{_UP$'
+        'LiUPOr-kZvC*l^K5EB?|C#`wZ5V@q!aHtc-0WPmmIrU7DZ`O-CGbW9l_kIRODXKoqeW2LBUs!_$%'
+        'jCiB69`t@A)2n1a&lqa2l7;0omV>iZ)y}>zetXmYS-oI`{%p<Zoop0DpWi5p0l%?9JP-O`kDWDdK'
+        'd)~%mRWbsT*E&HFJ-_OTR3*k?6!s8Wowi!W~<C&vfXy~Iq@;NIV&FOzr(WFV8rk2z7mK>nD1T%Gv'
+        '5ma6!vNcy!TyWsCTd&Q*pix_FMJB#pO>7_|;N5uGMN{V(f?*ef{VzabR53Qpk8<?9hv;WpeDm3oj'
+        'fvc<3+<iZ30WERIYT$MGY+bJROl0DSW(Wd)<Io7p=<QQ_vUC|&}kSy=z)=0x<Cc-Sml`Ji67Y{zr'
+        '<{G9!VIs274`-^k-b8|M(=km4~J}cUnZBd6NyjnZl`}@YgmCsGu+7tSFBTw;<EW<Di!!QiPFbu;m'
+        '48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m48t%C!!QiPFbu;m4'
+        '8t%C!!QiPFbu;m48t%_oBsg+eVjr'
+    ),
+    'Daz 4in1.gbc': (
+        'c-rljUu+cT5x{5t=Q!}%UIS7$!i8^<BW-x`@<;SkU6%9NshtWG9!OG<s&4CQ)3jUarj>6A+vA`wR'
+        'P6&ns${oO(>_#@@|0GpAVnyLEKWkKY5f3Igt3k&J|ne-ODpIVPP?7?b}!JUK9tA#?cL5dv)|6lH{'
+        'a~u0sMb_^uJ_}sw><3MY~u0`wEV`cWm6$FCO-af05RU8tJWGai8?Q`~Pf?HM+#ZPq#nn7ysxL_oO'
+        'v7?%4QfQ)-2$#=^n%*Z%IhVL$YB{{VgrD)d8kXxr(Zz`$~Nv~la!NAnjhyf%Gw;BVor<@t9me6ZU'
+        'Vd&G-J#ZEE)^*4Tq9x9dvTcAhTt@ZzMwd1yY^0y~1&Yvuo<D2oqT3q&`C<<~KXt_YjT#zF}pe2R?'
+        'K+orOfH+=T!1*!c-D1(rL%cA5@#6eKJh*P~M`0NHdDnIGdRgDMd!J>^H0vj(PfSn0)~L=O$*-;Dk'
+        'IYx<t*BM6K-YjB*#lkZwXEyqyzUa<!ik$Vk8jzs1?=gZ=jB3Q=2|Yxc{nYW^K~8QRHlS<HBwQ4<w'
+        'TA}v#Zr=gkr>v-4UR)%a|=CE~j^}2(ZBOJgIwLgog)KQ1#UoI;w@b<<=nQ<z|<|S#X@HoTpok<5)'
+        'W2SI04cn~(FZblA46&z$20Xg?7QGAholRv@TdTY1n3z?z{1+Te$3&IuE#;&O-cUKpucp<QjMr01M'
+        '!3(E@a5FMZ&9~IK^6sY=)^!>!wp(vD}438fiQ)Ke5(|Uv2%F0UB2MZmv!w}l88@O&8w-f7z``Pkv'
+        'AG{Wn9mjW^aw;8p{hDh-C~phFmj(1;tBPr2J`LCNJ-2~%BFa#^8$~y2HK;WntX!*69c#6kmy_`vr'
+        '%CyT%l@#`={`TK`@^(OE7_S)(oUpr0p5Khx{LnM3HkzQ#rTmdYy`fH>jN!b&2)iJ4Wj$l&p7!pv1'
+        'N6dz*hs@*Sh22`j<%$t5km#&1fgRjdjX-PLuKln5Bxh>W(+-V!js4$n~p`6rk=<0UFXuc7TuyfU-'
+        'p^kp4p1&dXGRX6kP%>a(u&FB=auE3m9Rlq20Xn@FD;3)de}uVMk@l0umeZt|S<%{B~MR^76OA$>N'
+        '06g0u?a=Kh91U?tEkGRcXrv9^9vQEuR>S3mJ5n3X#hEgWw(JY)N=bLGLgx1lMdT3@UvxzjZ(WuX?'
+        'DND+%R>p=Z(-XI`e5MTc!830+&-{ww%lepUoyadq%}nwXS|ZJK-DZFtQ47GVB@(nG!Q4clStvxX;'
+        'L;02|E%AJE!kQ1Y`QK@q<M-oj!69P+Mn##uKl&fjcZuvoSOIcV!FABi5xxu^ah{;LR6{9!bV+Pcr'
+        'H#%z4F|bPH!W*<7=nZS?L=FMyAe8(R*lWWaG#b!0GLH;Q76m@qqVUF5SW-F5S`|)9eTun5KCLza}'
+        '+OB0KgwS$QD^FQ@vQEH(w;pe47R{3IP9{dV>rhjHhbNaJp!6Y0r)THG;jOY#^^B8`fD^0s{<G2Ba'
+        'T!1KNI`l!q&mUg;Mb_$p1W*Rq^foYH~VP6s#<H_quTndz4m-8sCG_iD9AoGq>q-Ug=GMLi2hP?5!'
+        '(_h4XoC=CXdN`tDp-?9|F)?u$HKB<j{eXa-?0AUwHw*ZDVw7P_FgSZQptOQhe>@eCIOUmlQHr!fy'
+        't8NJPs;vuUcO)zs9*9$1jEP!*BRjlprG|=*sg$Qtp}y5{TKK<qTzJ(^NqLZLwP^`l}QI#{3=}^k8'
+        'IXy^pz26H){$z8#>i^;tjYnj#uwrzZ?yj8T*s^r2aX(Qva6mdc0WZ!_l{m@6d=8sE^l+i=%zUL1h'
+        'Rk3S<|LgDng(r_{R_e+tH*HVna>vI!P{1IEW2hQu$F%{0#R7~AK1FCY4<@nD0}1J}{Cbjj$2XY4&'
+        '^E-MPG;=Q+(<FNjce@^^m0F3duRbz8s2G;L*wQPV@deZ<=TDpAQ*fXXKlE)=Oz%#4H_*glrm}*ot'
+        'H6z}jtOI?($n+^0&@+bGr(|I%jpg8MRkgDph<9(>Kd%>T(4Sp&`X(C%(eF1ZV$g4_7te$K*JJ0*w'
+        'deKq$1>gL%@zD}@KOehvAJXC%^q9mUA9K)Vz$Z&Ot#1FIWImzH|NAd{dZUv8;tm!T~`C~2=m>mVC'
+        'H+lfWltQfcL*|4EGIHVk*ve!G5b=xU}@C0l!|T#A0z#OpF~7dtN_^|Ia2-O(5feu|qG8Czi>v124'
+        'RA;NYRdG$_7wc(OP;SscfY_})?PSOM_Oqf``(+C8&(hN8mlol(31O0%%;&&`SGE%C5fxcXteaK(;'
+        'G_KA}Hhm!qD$^LT5ey(H#eXeYc;q#(>#TIpF!mEpi`+naTy!wSnTYEx(fAlH-k!2W$VHk#C7=~dO'
+        'hG7_nVHk#C7=~dOhG7_nVHk#C7=~dOhG7_nVHk#C7=~dOhG7_nVHk#C7=~dOhG7_nVHk#C7=~dOh'
+        'G7_nVHk#C7=~dOhG7`yY4aZr#hZ@'
+    ),
+}
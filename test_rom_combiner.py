@@ -0,0 +1,557 @@
+"""Tests for the headless core of rom_combiner.py, run on small synthetic ROMs and saves.
+
+Run with `python -m pytest` from this folder. Nothing here needs tkinter or a display.
+"""
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import pytest
+
+import rom_combiner as rc
+
+PROFILE = rc.DEFAULT_PROFILE
+MB = rc.ROM_SIZE_1MB
+
+
+def make_rom(path, size, title, seed):
+    """Writes a ROM of pseudo-random bytes with a valid header and checksums, and returns its path."""
+    rom = bytearray(random.Random(seed).randbytes(size))
+    rom[rc.HEADER_TITLE:rc.HEADER_CGB_FLAG] = title.encode("ascii").ljust(15, b"\x00")
+    rom[rc.HEADER_CGB_FLAG] = 0x80
+    rom[rc.HEADER_ROM_SIZE] = (size // rc.ROM_SIZE_32KB).bit_length() - 1
+    rc.check_rom_checksums(rom, fix=True)
+    path.write_bytes(rom)
+    return str(path)
+
+@pytest.fixture
+def games(tmp_path):
+    sizes = [rc.ROM_SIZE_1MB, 512 * 1024, 256 * 1024, 128 * 1024, 64 * 1024]
+    return [make_rom(tmp_path / f"game{i}.gbc", size, f"GAME{i}", seed=i) for i, size in enumerate(sizes)]
+
+@pytest.fixture
+def menu():
+    return rc.resolve_menu("Gameboy Colour", 4)
+
+def read(path):
+    with open(path, "rb") as f_in:
+        return f_in.read()
+
+def legacy_build(menu, game_paths, rom_count):
+    """The original create_rom: every region copied into one zero-filled 8MB bytearray."""
+    image = bytearray(rc.TOTAL_ROM_SIZE_8MB)
+    image[:len(menu)] = menu
+    for slot, path in zip(rc.get_game_slots(rom_count), game_paths):
+        if path:
+            image[slot["start"]:slot["start"] + os.path.getsize(path)] = read(path)
+    return bytes(image)
+
+# --- Building ---
+
+@pytest.mark.parametrize("rom_count, slot_games", [(4, [0, 1, 2, 3]), (4, [0, None, 2]), (3, [1, 2, 3])])
+def test_build_matches_legacy_output(tmp_path, games, rom_count, slot_games):
+    menu = rc.resolve_menu("Gameboy Colour", rom_count)
+    game_paths = [games[i] if i is not None else None for i in slot_games]
+    output = tmp_path / "cart.gbc"
+    rc.build_rom(menu, game_paths, rom_count, str(output))
+    assert read(output) == legacy_build(menu, game_paths, rom_count)
+
+def test_build_manifest_resolves_paths_next_to_it(tmp_path, games):
+    manifest = tmp_path / "carts.json"
+    manifest.write_text(json.dumps({"builds": [{"mode": 3, "games": ["game1.gbc", None, "game3.gbc"], "output": "out/cart.gbc"}]}))
+    [build] = rc.load_build_manifest(str(manifest))
+    assert build == {"device": "Gameboy Colour", "mode": 3, "menu": None,
+                     "games": [games[1], None, games[3]], "output": str(tmp_path / "out" / "cart.gbc")}
+    assert rc.run_build(build)["error"] is None
+    assert read(tmp_path / "out" / "cart.gbc") == legacy_build(rc.resolve_menu("Gameboy Colour", 3), build["games"], 3)
+
+def test_run_build_reports_errors_instead_of_raising(tmp_path):
+    result = rc.run_build({"device": "Gameboy Colour", "mode": 4, "menu": None, "games": [str(tmp_path / "missing.gbc")],
+                           "output": str(tmp_path / "cart.gbc")})
+    assert result["error"] and "missing.gbc" in result["error"]
+    assert not (tmp_path / "cart.gbc").exists()
+
+# --- In-place slot updates ---
+
+@pytest.mark.parametrize("slot_index, new_game", [(1, 4), (3, 4), (2, None), (0, 3)])
+def test_update_slot_matches_full_rebuild(tmp_path, games, menu, slot_index, new_game):
+    image = tmp_path / "cart.gbc"
+    rc.build_rom(menu, games[:4], 4, str(image))
+    new_path = games[new_game] if new_game is not None else None
+    rc.update_rom_slot(str(image), 4, slot_index, new_path, menu=menu)
+
+    expected = list(games[:4])
+    expected[slot_index] = new_path
+    rc.build_rom(menu, expected, 4, str(tmp_path / "rebuilt.gbc"))
+    assert read(image) == read(tmp_path / "rebuilt.gbc")
+
+def test_update_slot_rejects_a_game_too_large_for_the_slot(tmp_path, games, menu):
+    image = tmp_path / "cart.gbc"
+    rc.build_rom(menu, games[:4], 4, str(image))
+    before = read(image)
+    with pytest.raises(ValueError):
+        rc.update_rom_slot(str(image), 4, 0, make_rom(tmp_path / "big.gbc", 2 * rc.ROM_SIZE_1MB, "BIG", seed=7))
+    assert read(image) == before
+
+# --- ROM header index ---
+
+def test_rom_index_only_rereads_changed_files(tmp_path, games):
+    index_path = str(tmp_path / "index.json")
+    index = rc.RomIndex(index_path)
+    assert index.update([str(tmp_path)]) == (5, 5, 0)
+    index.save()
+
+    index = rc.RomIndex(index_path)
+    assert index.update([str(tmp_path)]) == (5, 0, 0)
+    os.replace(make_rom(tmp_path / "new.gbc", 64 * 1024, "CHANGED", seed=9), games[4])
+    os.remove(games[3])
+    assert index.update([str(tmp_path)]) == (4, 1, 1)
+    assert index.get_header(games[4])["title"] == "CHANGED"
+    assert index.get_header(games[0])["title"] == "GAME0"
+
+def test_compatibility_warnings_flag_colour_only_games_and_bad_headers(tmp_path, games):
+    rom = bytearray(read(games[1]))
+    rom[rc.HEADER_CGB_FLAG] = rc.CGB_ONLY
+    rc.check_rom_checksums(rom, fix=True)
+    (tmp_path / "colour.gbc").write_bytes(rom)
+    rom[rc.HEADER_CHECKSUM] ^= 0xFF
+    (tmp_path / "broken.gbc").write_bytes(rom)
+
+    assert rc.rom_compatibility_warnings(games[:4], "Gameboy", 4) == []
+    warnings = rc.rom_compatibility_warnings([games[0], str(tmp_path / "colour.gbc"), str(tmp_path / "broken.gbc")], "Gameboy", 4,
+                                             index=rc.RomIndex())
+    assert any("colour.gbc" in warning and "only runs on a Gameboy Colour" in warning for warning in warnings)
+    assert any("broken.gbc" in warning and "bad header checksum" in warning for warning in warnings)
+    assert rc.rom_compatibility_warnings([games[0], str(tmp_path / "colour.gbc")], "Gameboy Colour", 4) == []
+
+# --- Save split and combine ---
+
+def make_save(path, seed):
+    data = random.Random(seed).randbytes(PROFILE.save_size)
+    path.write_bytes(data)
+    return data
+
+def test_split_batch_splits_every_save_and_flags_wrong_sizes(tmp_path):
+    saves = {name: make_save(tmp_path / f"{name}.sav", seed) for seed, name in enumerate(["alpha", "beta"])}
+    (tmp_path / "short.sav").write_bytes(b"not a save")
+
+    results, _ = rc.split_saves_batch(rc.find_save_files([str(tmp_path)]), save_count=4)
+    assert {os.path.basename(result["input"]): bool(result["error"]) for result in results} == {"alpha.sav": False, "beta.sav": False, "short.sav": True}
+    for name, data in saves.items():
+        banks = [read(tmp_path / "split" / f"{name}_save{n}.sav") for n in range(1, 5)]
+        assert b"".join(banks) == data
+    assert rc.find_save_files([str(tmp_path)]) == [str(tmp_path / name) for name in ("alpha.sav", "beta.sav", "short.sav")]
+
+def test_split_command_skips_its_own_outputs_and_rejects_unknown_modes(tmp_path, capsys):
+    make_save(tmp_path / "cart.sav", 1)
+    template = str(tmp_path / "{stem}_{n}.sav")
+    assert rc.main(["split", str(tmp_path), "--template", template]) == 0
+    assert rc.main(["split", str(tmp_path), "--template", template]) == 0
+    assert capsys.readouterr().out.count("Splitting 1 save(s)") == 2
+    assert sorted(os.listdir(tmp_path)) == ["cart.sav"] + [f"cart_{n}.sav" for n in range(1, 5)]
+    assert rc.main(["split", str(tmp_path), "--mode", "5"]) == 2
+
+@pytest.mark.parametrize("save_count", [4, 3])
+def test_split_then_combine_round_trips(tmp_path, save_count):
+    first_bank = PROFILE.first_bank(save_count)
+    data = bytearray(make_save(tmp_path / "full.sav", 1))
+    data[:first_bank * PROFILE.sram_bank_size] = bytes(first_bank * PROFILE.sram_bank_size)  # Banks a 3-save split skips
+    (tmp_path / "full.sav").write_bytes(data)
+    outputs = [str(tmp_path / f"save{n}.sav") for n in range(1, PROFILE.sram_bank_count + 1)]
+
+    rc.split_save(str(tmp_path / "full.sav"), outputs, save_count, verify=True)
+    assert rc.combine_saves(outputs[first_bank:], str(tmp_path / "combined.sav"), save_count, verify=True) == 0
+    assert read(tmp_path / "combined.sav") == data
+
+def test_combine_pads_short_saves_with_zeros(tmp_path):
+    saves = []
+    for n, size in enumerate([rc.CHUNK_SIZE_BYTES, 8 * 1024, rc.CHUNK_SIZE_BYTES, 100]):
+        saves.append(tmp_path / f"save{n}.sav")
+        saves[-1].write_bytes(random.Random(n).randbytes(size))
+    assert rc.combine_saves([str(path) for path in saves], str(tmp_path / "combined.sav"), 4) == 2
+    assert read(tmp_path / "combined.sav") == b"".join(read(path).ljust(rc.CHUNK_SIZE_BYTES, b"\x00") for path in saves)
+
+def test_combine_manifest_runs_every_combine(tmp_path):
+    banks = []
+    for n in range(4):
+        banks.append(tmp_path / f"bank{n}.sav")
+        banks[-1].write_bytes(random.Random(n).randbytes(rc.CHUNK_SIZE_BYTES))
+    manifest = tmp_path / "saves.json"
+    manifest.write_text(json.dumps({"combines": [
+        {"mode": 4, "saves": [path.name for path in banks], "output": "out/four.sav"},
+        {"mode": 3, "saves": [path.name for path in banks[1:]], "output": "out/three.sav"},
+        {"mode": 4, "saves": ["missing.sav"] * 4, "output": "out/broken.sav"},
+    ]}))
+    results, _ = rc.combine_saves_batch(rc.load_combine_manifest(str(manifest)))
+    assert sorted((os.path.basename(result["output"]), bool(result["error"])) for result in results) == \
+        [("broken.sav", True), ("four.sav", False), ("three.sav", False)]
+    assert read(tmp_path / "out" / "four.sav") == b"".join(read(path) for path in banks)
+    assert read(tmp_path / "out" / "three.sav") == bytes(rc.CHUNK_SIZE_BYTES) + b"".join(read(path) for path in banks[1:])
+    assert not (tmp_path / "out" / "broken.sav").exists()
+
+# --- Save archive ---
+
+def test_archive_restores_every_backup_and_stores_each_block_once(tmp_path):
+    store = rc.SaveStore(tmp_path / "archive", block_size=1024)
+    save = tmp_path / "cart.sav"
+    data = bytearray(make_save(save, 3))
+    versions = {}
+    for version in range(5):
+        data[version * 5000:version * 5000 + 10] = bytes([version + 1]) * 10
+        save.write_bytes(data)
+        versions[store.backup(str(save))] = bytes(data)
+    assert store.backup(str(save)) == list(versions)[-1]  # Unchanged saves record no new backup
+    assert sum(len(files) for _, _, files in os.walk(tmp_path / "archive" / "blocks")) == PROFILE.save_size // 1024 + 4
+
+    name = rc.save_archive_name(str(save))
+    assert store.history(name) == list(versions)
+    for backup_id, expected in versions.items():
+        store.restore(name, backup_id, str(tmp_path / "restored.sav"))
+        assert read(tmp_path / "restored.sav") == expected
+
+def test_archive_keeps_same_named_saves_apart(tmp_path):
+    saves = {}
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        saves[folder] = tmp_path / folder / "cart.sav"
+        make_save(saves[folder], folder)
+    archive = str(tmp_path / "archive")
+    assert rc.main(["archive", "backup", str(saves["a"]), str(saves["b"]), "--archive", archive]) == 0
+    assert len(rc.SaveStore(archive).names()) == 2
+    assert rc.main(["archive", "restore", str(saves["a"]), str(tmp_path / "restored.sav"), "--archive", archive]) == 0
+    assert read(tmp_path / "restored.sav") == read(saves["a"])
+
+# --- Command line start-up ---
+
+def test_command_line_never_imports_tkinter_or_multiprocessing():
+    code = ("import sys, rom_combiner; rom_combiner.main(['profiles']); "
+            "print(sorted(name for name in ('tkinter', 'multiprocessing', 'rom_combiner_gui') if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(rc.__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == "[]"
+
+# --- Cart profiles ---
+
+EXAMPLE_LAYOUT = {"rom_size": "8MB", "layouts": {"2": {"slots": [{"start": "1MB", "max_size": "2MB"}, {"start": "4MB", "max_size": "4MB"}]}}}
+
+def test_bundled_example_profile_loads():
+    profile = rc.load_profile("example-16mb-256kb")
+    assert rc.load_profile("example-16mb-256kb") is profile
+    assert (profile.rom_size, profile.save_size, profile.rom_counts, profile.save_counts) == (16 * MB, 256 * 1024, [8, 4], [8, 4])
+    assert profile.slots(8)[0] == {"start": MB, "max_size": MB, "name": "Game Slot 1 (1MB)"}
+    assert profile.menu_files == {}
+    assert rc.load_profile(None) is rc.DEFAULT_PROFILE
+    assert "example-16mb-256kb" in rc.list_profiles()
+
+@pytest.mark.parametrize("change, message", [
+    ({"rom_size": "4MB"}, "past the end"),
+    ({"layouts": {"2": {"slots": [{"start": "0", "max_size": "1MB"}, {"start": "4MB", "max_size": "1MB"}]}}}, "overlaps the menu"),
+    ({"layouts": {"3": EXAMPLE_LAYOUT["layouts"]["2"]}}, "3-game layout has 2 slots"),
+    ({"fill_byte": "0x100"}, "not a byte value"),
+    ({"rom_size": None}, "Invalid rom_size"),
+    ({"layouts": []}, "unexpected value types"),
+])
+def test_inconsistent_profiles_are_rejected(change, message):
+    with pytest.raises(ValueError, match=message):
+        rc.CartProfile.from_dict({**EXAMPLE_LAYOUT, **change}, name="broken")
+    with pytest.raises(ValueError, match="missing required field"):
+        rc.CartProfile.from_dict({"layouts": EXAMPLE_LAYOUT["layouts"]})
+
+def test_build_and_split_follow_the_profile(tmp_path, games):
+    profile = rc.CartProfile.from_dict({**EXAMPLE_LAYOUT, "fill_byte": "0xFF", "sram": {"bank_size": "8KB", "bank_count": 2}})
+    menu = read(games[4])[:rc.ROM_SIZE_32KB]
+    rc.build_rom(menu, [games[1], games[0]], 2, str(tmp_path / "cart.gbc"), profile=profile, checksums="verify")
+    image = read(tmp_path / "cart.gbc")
+    expected = bytearray(b"\xff" * 8 * MB)
+    expected[:len(menu)] = menu
+    expected[MB:MB + 512 * 1024] = read(games[1])
+    expected[4 * MB:5 * MB] = read(games[0])
+    assert image == expected
+
+    save = tmp_path / "cart.sav"
+    save.write_bytes(random.Random(5).randbytes(16 * 1024))
+    outputs = [str(tmp_path / f"bank{n}.sav") for n in (1, 2)]
+    assert rc.split_save(str(save), outputs, 2, profile=profile) == 2
+    assert [len(read(path)) for path in outputs] == [8 * 1024, 8 * 1024]
+
+# --- Read-back verification ---
+
+def test_verified_build_writes_a_manifest_that_tracks_the_image(tmp_path, games, menu):
+    output = tmp_path / "cart.gbc"
+    manifest_path = rc.build_rom(menu, games[:3], 4, str(output), verify=True)["manifest"]
+    manifest = rc.load_verify_manifest(str(output))
+    assert manifest_path == rc.verify_manifest_path(str(output)) and manifest is not None
+    assert manifest["sha256"] == hashlib.sha256(read(output)).hexdigest()
+    assert [region["name"] for region in manifest["regions"]] == ["Menu"] + [slot["name"] for slot in PROFILE.slots(4)[:3]]
+    assert manifest["regions"][1]["sha256"] == hashlib.sha256(read(games[0])).hexdigest()
+
+    time.sleep(0.05)
+    with open(output, "r+b") as f_out:
+        f_out.write(b"\xff")
+    assert rc.load_verify_manifest(str(output)) is None
+
+def test_verify_reports_outputs_that_read_back_differently(tmp_path, games, menu, monkeypatch):
+    read_back_digests = rc.read_back_digests
+    corrupt_at = {"offset": PROFILE.slots(4)[1]["start"] + 1000}
+
+    def corrupting_read_back(filepath, regions):
+        with open(filepath, "r+b") as f_out:  # As if the disk had returned different data
+            f_out.seek(corrupt_at["offset"])
+            byte = f_out.read(1)[0]
+            f_out.seek(corrupt_at["offset"])
+            f_out.write(bytes([byte ^ 0xFF]))
+        return read_back_digests(filepath, regions)
+
+    monkeypatch.setattr(rc, "read_back_digests", corrupting_read_back)
+    with pytest.raises(rc.VerificationError, match="Game Slot 2"):
+        rc.build_rom(menu, games[:4], 4, str(tmp_path / "cart.gbc"), verify=True)
+
+    corrupt_at["offset"] = 1000
+    make_save(tmp_path / "full.sav", 4)
+    with pytest.raises(rc.VerificationError):
+        rc.split_save(str(tmp_path / "full.sav"), [str(tmp_path / f"save{n}.sav") for n in range(1, 5)], 4, verify=True)
+
+# --- Metrics ---
+
+@pytest.fixture
+def installed_metrics():
+    installed = []
+
+    def install(metrics):
+        installed.append(metrics)
+        rc.set_metrics(metrics)
+        return metrics
+
+    yield install
+    rc.set_metrics(None)
+    for metrics in installed:
+        metrics.close()
+
+def test_json_lines_sink_records_build_spans_and_counters(tmp_path, games, menu, installed_metrics):
+    metrics = installed_metrics(rc.Metrics(rc.open_metrics_sink(str(tmp_path / "metrics.jsonl"))))
+    rc.build_rom(menu, games[:4], 4, str(tmp_path / "cart.gbc"))
+    metrics.flush()
+
+    events = [json.loads(line) for line in read(tmp_path / "metrics.jsonl").decode().splitlines()]
+    spans = {event["name"] for event in events if event["type"] == "span"}
+    assert {"build", "build.validate", "build.write", "build.region"} <= spans
+    written = sum(event["value"] for event in events if event["name"] == "bytes_written")
+    assert written == sum(os.path.getsize(path) for path in games[:4]) + len(menu)
+
+def test_prometheus_sink_aggregates_events_and_flushes_on_interval(tmp_path, installed_metrics):
+    prom = tmp_path / "metrics.prom"
+    metrics = installed_metrics(rc.Metrics(rc.open_metrics_sink(str(prom)), flush_interval=0))
+    with rc.metric_span("split.bank", bank=1):
+        pass
+    assert prom.exists()  # Flushed by the first event, without waiting for close
+    rc.metric_count("bytes_written", 100, op="split")
+    rc.metric_count("bytes_written", 50, op="split")
+    with pytest.raises(ValueError):
+        with rc.metric_span("split.bank", bank=1):
+            raise ValueError()
+
+    lines = read(prom).decode().splitlines()
+    assert "# TYPE rom_combiner_split_bank_seconds summary" in lines
+    assert 'rom_combiner_split_bank_seconds_count{bank="1"} 2' in lines
+    assert 'rom_combiner_bytes_written_total{op="split"} 150' in lines
+
+def test_metrics_are_kept_in_memory_without_a_sink_and_off_by_default(installed_metrics):
+    assert rc.get_metrics() is None
+    assert rc.metric_span("build") is rc.metric_span("split")  # The shared no-op span
+    metrics = installed_metrics(rc.Metrics())
+    rc.metric_count("cache_hits")
+    assert [(event["name"], event["value"]) for event in metrics.drain()] == [("cache_hits", 1)]
+    assert metrics.drain() == []
+
+# --- Extract ---
+
+def test_extract_manifest_repacks_byte_identical_carts(tmp_path, games):
+    images = tmp_path / "carts"
+    images.mkdir()
+    rc.build_rom(rc.resolve_menu("Gameboy Colour", 4), games[:4], 4, str(images / "plain.gbc"))
+    rc.build_rom(rc.resolve_menu("Gameboy", 3), games[1:4], 3, str(images / "fixed.gb"), checksums="fix")
+    originals = {path: read(path) for path in images.iterdir()}
+
+    found, skipped = rc.find_cart_images([str(images)])
+    results, _ = rc.extract_carts_batch(found)
+    assert not any(result["error"] for result in results)
+    manifest = tmp_path / "repack.json"
+    rc.write_extract_manifest(results, str(manifest))
+    for build in rc.load_build_manifest(str(manifest)):
+        assert rc.run_build(build)["error"] is None
+
+    assert {path: read(path) for path in images.iterdir() if path.is_file()} == originals
+    for path, data in originals.items():
+        assert read(images / path.stem / f"{path.stem}_repacked{path.suffix}") == data
+    assert rc.find_cart_images([str(images)]) == (sorted(str(path) for path in originals), [])
+
+# --- Watch ---
+
+def test_watch_rebuilds_and_updates_slots_in_place(tmp_path, games, menu):
+    manifest = tmp_path / "carts.json"
+    manifest.write_text(json.dumps({"builds": [{"mode": 4, "games": games[:4], "output": "cart.gbc"}]}))
+
+    def run_once():
+        log = []
+        rc.CartWatcher([str(manifest)], log=log.append).run(once=True)
+        return log
+
+    assert any("built" in line for line in run_once())
+    assert not any("[ OK ]" in line for line in run_once())  # Inputs unchanged, so nothing is redone
+
+    os.replace(make_rom(tmp_path / "new.gbc", 256 * 1024, "CHANGED", seed=99), games[2])  # Saved the way most editors do
+    assert any("slot 3 updated" in line for line in run_once())
+    rc.build_rom(menu, games[:4], 4, str(tmp_path / "rebuilt.gbc"))
+    assert read(tmp_path / "cart.gbc") == read(tmp_path / "rebuilt.gbc")
+
+# --- Checksums ---
+
+def test_check_rom_checksums_finds_and_repairs_both_checksums(tmp_path):
+    rom = bytearray(read(make_rom(tmp_path / "game.gbc", 64 * 1024, "GAME", seed=1)))
+    good = bytes(rom)
+    rom[rc.HEADER_CHECKSUM] ^= 0xFF
+    rom[rc.HEADER_GLOBAL_CHECKSUM] ^= 0xFF
+
+    report = rc.check_rom_checksums(rom)
+    assert (report["header_ok"], report["global_ok"], report["fixed"]) == (False, False, False)
+    assert report["header_expected"] == good[rc.HEADER_CHECKSUM]
+    assert rc.check_rom_checksums(rom, fix=True)["fixed"]
+    assert rom == good
+
+def test_checksum_verify_leaves_the_stock_menu_alone(tmp_path, games, menu):
+    output = tmp_path / "cart.gbc"
+    report = rc.build_rom(menu, games[:4], 4, str(output), checksums="fix")["checksums"]
+    assert (report["bad"], report["fixed"]) == (0, 0)
+    assert [entry["name"] for entry in report["roms"]] == [slot["name"] for slot in PROFILE.slots(4)]
+    assert read(output)[:len(menu)] == menu
+    assert rc.main(["checksums", str(output), "--mode", "4"]) == 0
+
+def test_checksum_fix_repairs_games_in_the_image_only(tmp_path, games, menu):
+    broken = bytearray(read(games[1]))
+    broken[rc.HEADER_CHECKSUM] ^= 0xFF
+    (tmp_path / "broken.gbc").write_bytes(broken)
+    game_paths = [games[0], str(tmp_path / "broken.gbc"), games[2]]
+    output = tmp_path / "cart.gbc"
+
+    assert rc.build_rom(menu, game_paths, 4, str(output), checksums="verify")["checksums"]["bad"] == 1
+    assert rc.main(["checksums", str(output), "--mode", "4"]) == 1
+    report = rc.verify_rom_image(str(output), 4, fix=True)
+    assert (report["bad"], report["fixed"]) == (1, 1)
+    assert rc.verify_rom_image(str(output), 4)["bad"] == 0
+    assert read(tmp_path / "broken.gbc") == broken
+    assert read(output)[:len(menu)] == menu
+
+# --- Build cache ---
+
+def test_cached_build_matches_fresh_build(tmp_path, games, menu):
+    cache = rc.RomBuildCache(tmp_path / "cache")
+    first = rc.build_rom(menu, games[:4], 4, str(tmp_path / "one.gbc"), cache=cache)
+    second = rc.build_rom(menu, games[:4], 4, str(tmp_path / "two.gbc"), cache=cache, verify=True)
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert read(tmp_path / "one.gbc") == read(tmp_path / "two.gbc")
+
+def test_hardlinked_hits_leave_earlier_outputs_untouched(tmp_path, games, menu):
+    cache = rc.RomBuildCache(tmp_path / "cache", link_mode="hardlink")
+    rc.build_rom(menu, games[:4], 4, str(tmp_path / "h1.gbc"), cache=cache)
+    rc.build_rom(menu, games[:4], 4, str(tmp_path / "h2.gbc"), cache=cache, verify=True)
+    before = os.stat(tmp_path / "h2.gbc")
+    time.sleep(0.05)
+    rc.build_rom(menu, games[:4], 4, str(tmp_path / "h3.gbc"), cache=cache)
+    assert os.stat(tmp_path / "h3.gbc").st_ino == before.st_ino
+    assert os.stat(tmp_path / "h2.gbc").st_mtime_ns == before.st_mtime_ns
+    assert rc.load_verify_manifest(str(tmp_path / "h2.gbc")) is not None
+
+def test_cache_evicts_the_least_recently_used_entry(tmp_path, games, menu):
+    cache = rc.RomBuildCache(tmp_path / "cache", max_bytes=2 * PROFILE.rom_size)
+    builds = {"a": games[:4], "b": games[1:5], "c": [games[4], games[0]]}
+    for name in ("a", "b", "a", "c"):
+        time.sleep(0.05)
+        rc.build_rom(menu, builds[name], 4, str(tmp_path / f"{name}.gbc"), cache=cache)
+    kept = [name for name in builds if os.path.exists(cache.entry_path(cache.build_key(menu, builds[name], PROFILE.slots(4), PROFILE.rom_size)))]
+    assert kept == ["a", "c"]
+    assert sorted(os.path.splitext(name)[1] for _, _, files in os.walk(cache.cache_dir) for name in files) == [".rom", ".rom", ".used", ".used"]
+
+def test_update_slot_leaves_other_hardlinks_alone(tmp_path, games, menu):
+    image = tmp_path / "cart.gbc"
+    rc.build_rom(menu, games[:4], 4, str(image))
+    os.link(image, tmp_path / "linked.gbc")
+    before = read(image)
+    rc.update_rom_slot(str(image), 4, 2, games[4])
+    assert read(tmp_path / "linked.gbc") == before
+    assert read(image) != before
+    assert os.stat(image).st_nlink == 1
+
+# --- Atomic outputs ---
+
+def test_cancelled_build_keeps_the_old_output(tmp_path, games, menu):
+    output = tmp_path / "cart.gbc"
+    output.write_bytes(b"old cart")
+
+    def cancel_at_end(done, total):
+        if done == total:
+            raise rc.OperationCancelled()
+
+    with pytest.raises(rc.OperationCancelled):
+        rc.build_rom(menu, games[:4], 4, str(output), progress=cancel_at_end)
+    assert read(output) == b"old cart"
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(path) for path in games] + ["cart.gbc"])
+
+def test_cancelled_split_keeps_existing_saves(tmp_path):
+    save = tmp_path / "full.sav"
+    save.write_bytes(random.Random(2).randbytes(PROFILE.save_size))
+    outputs = [tmp_path / f"save{n}.sav" for n in range(1, 5)]
+    for path in outputs:
+        path.write_bytes(b"old " + path.name.encode())
+
+    def cancel_after_two(done, total):
+        if done == 2:
+            raise rc.OperationCancelled()
+
+    with pytest.raises(rc.OperationCancelled):
+        rc.split_save(str(save), [str(path) for path in outputs], 4, progress=cancel_after_two)
+    assert [read(path) for path in outputs] == [b"old " + path.name.encode() for path in outputs]
+    assert sorted(os.listdir(tmp_path)) == ["full.sav"] + [path.name for path in outputs]
+
+def test_json_outputs_follow_the_sync_policy(tmp_path):
+    sync = rc.OutputSync("batch")
+    rc.write_json_output(str(tmp_path / "carts.json"), {"builds": []}, sync, indent=2)
+    index = rc.RomIndex(str(tmp_path / "index.json"))
+    index.dirty = True
+    index.save(sync)
+    assert sync.flush() == 2
+    assert json.loads(read(tmp_path / "carts.json")) == {"builds": []}
+    assert rc.RomIndex(str(tmp_path / "index.json")).entries == {}
+    assert sorted(os.listdir(tmp_path)) == ["carts.json", "index.json"]
+
+# --- Slot packing ---
+
+def test_assign_slots_puts_the_largest_games_in_the_largest_slots():
+    games = [("small.gbc", MB // 2), ("big1.gbc", 2 * MB), ("big2.gbc", 2 * MB), ("big3.gbc", 2 * MB)]
+    assert rc.assign_slots(games, 4) == ["small.gbc", "big1.gbc", "big2.gbc", "big3.gbc"]
+    assert rc.assign_slots(games[:2], 4)[0] is None
+    with pytest.raises(ValueError):
+        rc.assign_slots([(f"big{i}.gbc", 2 * MB) for i in range(4)], 4)
+    with pytest.raises(ValueError):
+        rc.assign_slots(games, 3)
+
+def test_plan_carts_packs_every_game_into_valid_carts():
+    games = [(f"game{i}.gbc", size) for i, size in enumerate([2 * MB, 2 * MB, 2 * MB, MB, 2 * MB, MB // 4, 3 * MB])]
+    carts, unplaced = rc.plan_carts(games)
+    assert unplaced == [("game6.gbc", 3 * MB)]
+    assert [cart["mode"] for cart in carts] == [4, 3]
+    sizes = dict(games)
+    placed = []
+    for cart in carts:
+        slots = PROFILE.slots(cart["mode"])
+        assert all(sizes[path] <= slot["max_size"] for slot, path in zip(slots, cart["games"]) if path)
+        placed += [path for path in cart["games"] if path]
+    assert sorted(placed) == sorted(path for path, _ in games[:6])
+
+def test_plan_rejects_unknown_layouts(tmp_path, capsys):
+    assert rc.main(["plan", str(tmp_path), "--modes", "5", "-o", str(tmp_path / "carts.json")]) == 2
+    assert "Unsupported cart layout: 5" in capsys.readouterr().out
+    assert not (tmp_path / "carts.json").exists()